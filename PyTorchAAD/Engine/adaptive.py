@@ -0,0 +1,111 @@
+import math
+import torch
+from Engine.statistics import RunningStatistics
+from Engine.variance_reduction import group_means
+
+def adaptive_price(pricer, tolerance=None, relative_tolerance=None, params=None, greek_tolerances=None,
+                   batch_size=10000, max_paths=10000000, min_batches=4, group_size=1):
+    """
+    Prices with as many paths as needed: batches of `batch_size` paths are simulated
+    until the standard error of the price meets the requested tolerance (and, when
+    `greek_tolerances` is given, so do the standard errors of those Greeks), or until
+    `max_paths` paths have been used. Batches always cover the path ranges
+    [k * batch_size, (k + 1) * batch_size), so a run is reproducible and stopping
+    later only appends paths to an earlier run.
+
+    The price error is estimated from the per-path samples. AAD only returns the
+    gradient of a batch mean, so the error of a Greek is estimated from the spread
+    of its batch estimates, which needs at least `min_batches` batches. Batch
+    gradients are weighted by their numbers of paths (the last batch may be short),
+    so the reported Greek is the gradient of the reported price.
+
+    Args:
+        pricer (callable): `pricer(start, num_paths)` returning the discounted values
+                           (shape: [num_paths]) of the paths [start, start + num_paths),
+                           e.g. through `MonteCarloMethod.simulate_range` or
+                           `LongstaffSchwartzMethod.path_values`. A sequential random
+                           source may ignore `start`.
+        tolerance (float): Target absolute standard error of the price.
+        relative_tolerance (float): Target standard error relative to |price|. With both
+                                    tolerances, meeting either one is enough.
+        params (dict): Optional mapping name -> scalar tensor (requires_grad=True) the
+                       values depend on; the Greeks w.r.t. these are returned.
+        greek_tolerances (dict): Optional mapping name -> target absolute standard error
+                                 of the Greek w.r.t. `params[name]`.
+        batch_size (int): Number of paths per batch (a multiple of `group_size`).
+        max_paths (int): Path budget; the run stops there even if not converged.
+        min_batches (int): Minimum number of batches before a Greek error is trusted.
+        group_size (int): Number of consecutive paths forming one independent sample
+                          (`random_source.group_size`, 2 for antithetic pairs).
+
+    Returns:
+        dict: price, std_error, variance, num_paths, num_batches, converged, greeks and
+              greek_std_errors.
+    """
+    if tolerance is None and relative_tolerance is None:
+        raise ValueError("Give a tolerance or a relative_tolerance on the price.")
+    names = list(params) if params else []
+    greek_tolerances = greek_tolerances or {}
+    if any(name not in names for name in greek_tolerances):
+        raise ValueError("Greek tolerances must refer to entries of params.")
+
+    stats = RunningStatistics()
+    grouped = RunningStatistics()
+    # (number of paths, gradient of the batch mean) of each batch, per Greek
+    greek_batches = {name: [] for name in names}
+
+    def greek(name):
+        # Gradient of the mean over all paths: the batch gradients weighted by their paths
+        return sum(n * grad for n, grad in greek_batches[name]) / stats.count
+
+    def greek_std_error(name):
+        # Spread of the batch gradients around the Greek, weighted by the paths of each batch
+        batches = greek_batches[name]
+        if len(batches) < 2:
+            return float('inf')
+        mean = greek(name)
+        return math.sqrt(sum(n * (grad - mean)**2 for n, grad in batches) / ((len(batches) - 1) * stats.count))
+
+    def converged():
+        targets = []
+        if tolerance is not None:
+            targets.append(tolerance)
+        if relative_tolerance is not None:
+            targets.append(relative_tolerance * abs(stats.mean))
+        if grouped.std_error > max(targets):
+            return False
+        return all(len(greek_batches[name]) >= min_batches and greek_std_error(name) <= target
+                   for name, target in greek_tolerances.items())
+
+    # Without requested Greeks no autograd graph is needed at all
+    with torch.inference_mode(not names):
+        start = 0
+        num_batches = 0
+        while start < max_paths:
+            num_paths = min(batch_size, max_paths - start)
+            values = pricer(start, num_paths)
+            stats.update(values)
+            grouped.update(group_means(values, group_size))
+
+            if names:
+                # Retain the graph shared across batches (e.g. dt = T / num_steps)
+                batch_grads = torch.autograd.grad(values.mean(), [params[name] for name in names],
+                                                  retain_graph=True, allow_unused=True)
+                for name, grad in zip(names, batch_grads):
+                    greek_batches[name].append((num_paths, 0.0 if grad is None else grad.item()))
+
+            start += num_paths
+            num_batches += 1
+            if converged():
+                break
+
+    return {
+        'price': stats.mean,
+        'std_error': grouped.std_error,
+        'variance': stats.variance,
+        'num_paths': stats.count,
+        'num_batches': num_batches,
+        'converged': converged(),
+        'greeks': {name: greek(name) for name in names},
+        'greek_std_errors': {name: greek_std_error(name) for name in names}
+    }
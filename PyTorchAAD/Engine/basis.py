@@ -0,0 +1,205 @@
+import torch
+
+class RegressionBasis:
+    # Affine map of the state onto the natural domain of the basis: 'standard' (mean 0,
+    # variance 1), 'range' (onto [-1, 1]), 'lower' (lowest state 0, variance 1) or None
+    normalise = 'standard'
+
+    def __init__(self, order=2):
+        """
+        Basis of the Longstaff-Schwartz continuation-value regressions. The state of an
+        exercise date is first mapped onto the natural domain of the basis from the
+        statistics of the regressed (in-the-money) paths, then expanded into the design
+        matrix, so that spots near 100 do not produce powers of 10^4 and beyond. The
+        map is affine and fitted once per date, so it leaves the regressed continuation
+        value unchanged in exact arithmetic and only improves the conditioning; it is
+        kept with the coefficients of a frozen exercise strategy.
+
+        Args:
+            order (int): Highest polynomial degree.
+        """
+        self.order = order
+
+    def univariate(self, z, order):
+        """Basis functions of degrees 0 to `order` of a normalised state `z` (list of tensors)."""
+        raise NotImplementedError
+
+    def features(self, z, out=None):
+        """Design matrix of a normalised state z (shape: [*batch, num_paths]), written into `out` when given."""
+        return torch.stack(self.univariate(z, self.order), dim=-1, out=out)
+
+    def normalisation(self, X, mask=None, dim=0):
+        """
+        Affine map (center, scale) of the state X (shape: [num_paths] or [num_paths, num_assets])
+        fitted on the rows selected by `mask`, per asset. With dim=-1, X is a scenario
+        batch [*batch, num_paths] and each scenario gets its own map (shape: [*batch, 1]).
+        Detached, so it is a constant of the tape; with no selected row it falls back to
+        the identity map.
+        """
+        if self.normalise is None:
+            return 0.0, 1.0
+        with torch.no_grad():
+            X = X.detach()
+            weights = torch.ones_like(X) if mask is None else mask.reshape(mask.shape + (1,) * (X.dim() - mask.dim())).to(X.dtype).expand_as(X)
+            # Reduced over the paths; a batch keeps its path axis to broadcast against X
+            keepdim = dim % X.dim() != 0
+            count = weights.sum(dim=dim, keepdim=keepdim)
+            low = torch.where(weights > 0, X, torch.tensor(float('inf'), dtype=X.dtype)).amin(dim=dim, keepdim=keepdim)
+            if self.normalise == 'range':
+                high = torch.where(weights > 0, X, torch.tensor(float('-inf'), dtype=X.dtype)).amax(dim=dim, keepdim=keepdim)
+                center, scale = (high + low) / 2, (high - low) / 2
+            else:
+                mean = (weights * X).sum(dim=dim, keepdim=keepdim) / count.clamp(min=1)
+                scale = ((weights * (X - mean)**2).sum(dim=dim, keepdim=keepdim) / count.clamp(min=1)).sqrt()
+                center = low if self.normalise == 'lower' else mean
+            valid = (count > 0) & (scale > 0) & torch.isfinite(scale)
+            center = torch.where(valid, center, torch.zeros_like(center))
+            scale = torch.where(valid, scale, torch.ones_like(scale))
+        return center, scale
+
+    def design_matrix(self, X, normalisation=None, out=None):
+        """
+        Design matrix of the state X under a fitted `normalisation` (see `normalisation`),
+        written into `out` when given.
+
+        Returns:
+            torch.Tensor: Basis functions of each path (shape: [num_paths, num_functions]).
+        """
+        if normalisation is None:
+            return self.features(X, out=out)
+        center, scale = normalisation
+        return self.features((X - center) / scale, out=out)
+
+    def __repr__(self):
+        return f"{type(self).__name__}(order={self.order})"
+
+class MonomialBasis(RegressionBasis):
+    def univariate(self, z, order):
+        powers = [torch.ones_like(z), z]
+        for _ in range(2, order + 1):
+            powers.append(powers[-1] * z)
+        return powers[:order + 1]
+
+class HermiteBasis(RegressionBasis):
+    def univariate(self, z, order):
+        # Physicists' Hermite polynomials: H0 = 1, H1 = 2z, Hn = 2z H(n-1) - 2(n-1) H(n-2)
+        H = [torch.ones_like(z), 2 * z]
+        for n in range(2, order + 1):
+            H.append(2 * z * H[n - 1] - 2 * (n - 1) * H[n - 2])
+        return H[:order + 1]
+
+class LaguerreBasis(RegressionBasis):
+    # Laguerre polynomials live on [0, inf), where their roots spread over a few units
+    normalise = 'lower'
+
+    def univariate(self, z, order):
+        # L0 = 1, L1 = 1 - z, n Ln = (2n - 1 - z) L(n-1) - (n-1) L(n-2)
+        L = [torch.ones_like(z), 1 - z]
+        for n in range(2, order + 1):
+            L.append(((2 * n - 1 - z) * L[n - 1] - (n - 1) * L[n - 2]) / n)
+        return L[:order + 1]
+
+class ChebyshevBasis(RegressionBasis):
+    # Chebyshev polynomials are bounded by one on [-1, 1], the image of the range of the state
+    normalise = 'range'
+
+    def univariate(self, z, order):
+        # T0 = 1, T1 = z, Tn = 2z T(n-1) - T(n-2)
+        T = [torch.ones_like(z), z]
+        for n in range(2, order + 1):
+            T.append(2 * z * T[n - 1] - T[n - 2])
+        return T[:order + 1]
+
+class CallableBasis(RegressionBasis):
+    def __init__(self, function, normalise='standard'):
+        """
+        User-defined basis.
+
+        Args:
+            function (callable): `function(z)` returning the design matrix (shape:
+                                 [num_paths, num_functions]) of a normalised state z.
+            normalise: Normalisation of the state before `function` ('standard', 'range',
+                       'lower' or None to pass the raw state).
+        """
+        super().__init__(order=None)
+        self.function = function
+        self.normalise = normalise
+
+    def features(self, z, out=None):
+        A = self.function(z)
+        if out is None:
+            return A
+        return out.copy_(A)
+
+    def __repr__(self):
+        return f"CallableBasis({getattr(self.function, '__name__', self.function)!r})"
+
+class TensorProductBasis(RegressionBasis):
+    def __init__(self, basis, order=None, interaction=None):
+        """
+        Multi-asset basis: products of univariate basis functions of each asset, of total
+        degree at most `order`, each asset normalised on its own. With `interaction`, only
+        the products of at most that many distinct assets are kept, which makes the size
+        polynomial in the number of assets for a fixed interaction degree.
+
+        Args:
+            basis: Univariate basis (a RegressionBasis or a registered name).
+            order (int): Highest total degree, defaults to the order of `basis`.
+            interaction (int): Highest number of assets in a product, None for no limit.
+        """
+        self.basis = get_basis(basis)
+        super().__init__(order if order is not None else self.basis.order)
+        self.interaction = interaction
+        self.normalise = self.basis.normalise
+
+    def degrees(self, num_assets):
+        """Multi-indices of the basis functions, by increasing total degree."""
+        interaction = num_assets if self.interaction is None else self.interaction
+
+        def compositions(num_assets, total, interaction):
+            # Degrees of num_assets assets summing to total, with at most `interaction` nonzero
+            if num_assets == 0:
+                return [()] if total == 0 else []
+            return [(k,) + rest for k in range(total, -1, -1) if k == 0 or interaction > 0
+                    for rest in compositions(num_assets - 1, total - k, interaction - (k > 0))]
+
+        return [d for total in range(self.order + 1) for d in compositions(num_assets, total, interaction)]
+
+    def features(self, z, out=None):
+        # z has shape [num_paths, num_assets]; the univariate functions are computed once per asset
+        univariate = [self.basis.univariate(z[:, i], self.order) for i in range(z.shape[1])]
+        columns = []
+        for d in self.degrees(z.shape[1]):
+            column = None
+            for i, k in enumerate(d):
+                if k > 0:
+                    column = univariate[i][k] if column is None else column * univariate[i][k]
+            columns.append(torch.ones_like(z[:, 0]) if column is None else column)
+        return torch.stack(columns, dim=1, out=out)
+
+    def __repr__(self):
+        return f"TensorProductBasis({self.basis!r}, order={self.order}, interaction={self.interaction})"
+
+_bases = {'monomial': MonomialBasis, 'hermite': HermiteBasis, 'laguerre': LaguerreBasis, 'chebyshev': ChebyshevBasis}
+
+def register_basis(name, basis_class):
+    """Registers a RegressionBasis subclass under `name` for `get_basis`."""
+    _bases[name] = basis_class
+
+def get_basis(basis=None, order=2):
+    """
+    Resolves a basis argument: a RegressionBasis, a registered name ('monomial',
+    'hermite', 'laguerre', 'chebyshev'), a callable (see CallableBasis) or None for
+    the Hermite polynomials of degree `order`.
+    """
+    if basis is None:
+        return HermiteBasis(order)
+    if isinstance(basis, RegressionBasis):
+        return basis
+    if isinstance(basis, str):
+        if basis not in _bases:
+            raise ValueError(f"Unknown basis '{basis}'. Choose one of {', '.join(sorted(_bases))}.")
+        return _bases[basis](order)
+    if callable(basis):
+        return CallableBasis(basis)
+    raise TypeError(f"Cannot make a regression basis out of {basis!r}.")
@@ -0,0 +1,98 @@
+import torch
+import torch.multiprocessing as mp
+from Engine.statistics import RunningStatistics
+from Engine.precision import get_precision
+
+def _batch_statistics(pricer, params, start, num_paths, dtype):
+    """
+    Runs one batch and returns its sufficient statistics:
+    [count, mean, M2 (sum of squared deviations), gradient sums...] in float64.
+    """
+    num_threads = torch.get_num_threads()
+    # One intra-op thread, so a batch gives the same bits in a worker and in the parent
+    torch.set_num_threads(1)
+    try:
+        leaves = {name: torch.tensor(value, dtype=dtype, requires_grad=True) for name, value in params.items()}
+        values = pricer(leaves, start, num_paths)
+
+        stats = RunningStatistics()
+        stats.update(values)
+        row = [stats.count, stats.mean, stats.m2]
+
+        if leaves:
+            grads = torch.autograd.grad(values.sum(), list(leaves.values()), allow_unused=True)
+            row += [grad.item() if grad is not None else 0.0 for grad in grads]
+    finally:
+        torch.set_num_threads(num_threads)
+    return torch.tensor(row, dtype=torch.float64)
+
+def _worker(pricer, params, batches, results, worker, num_workers, dtype):
+    # Static round-robin assignment: batch b always goes to worker b % num_workers
+    for b in range(worker, len(batches), num_workers):
+        start, num_paths = batches[b]
+        results[b] = _batch_statistics(pricer, params, start, num_paths, dtype)
+
+def parallel_price(pricer, params, num_paths, batch_size, num_workers=None, start_method="spawn", precision=None):
+    """
+    Prices by sharding the path range across a pool of processes, in the spirit of
+    `mcParallelSimul` in CompFinance/mcBase.h. Each worker writes the sufficient
+    statistics of its batches (count, mean, M2, gradient sums) into a shared-memory
+    tensor, and the parent merges them in batch order. The batching, not the number
+    of workers, defines the result: any `num_workers` (including 0, which runs the
+    batches in this process) gives the same price and Greeks.
+
+    Args:
+        pricer (callable): Picklable callable `pricer(params, start, num_paths)` returning the
+                           discounted values (shape: [num_paths]) of the paths [start, start + num_paths).
+                           It must position its random source with `skip_to(start)`, e.g. through
+                           `MonteCarloMethod.simulate_range` or `LongstaffSchwartzMethod.path_values`.
+        params (dict): Mapping name -> float. Passed to `pricer` as leaf tensors (requires_grad=True);
+                       the gradient of the price w.r.t. each is returned under 'greeks'.
+        num_paths (int): Total number of paths.
+        batch_size (int): Number of paths per batch.
+        num_workers (int): Number of worker processes (defaults to the number of CPUs, 0 runs serially).
+        start_method (str): Multiprocessing start method.
+        precision: Precision policy (see Engine.precision) whose path dtype the leaf tensors take.
+                   Resolved in this process, so the workers do not depend on their own default.
+
+    Returns:
+        dict: price, std_error, variance, num_paths and greeks.
+    """
+    dtype = get_precision(precision).path_dtype
+    batches = [(start, min(batch_size, num_paths - start)) for start in range(0, num_paths, batch_size)]
+    results = torch.zeros(len(batches), 3 + len(params), dtype=torch.float64)
+
+    if num_workers is None:
+        num_workers = mp.cpu_count()
+    num_workers = min(num_workers, len(batches))
+
+    if num_workers == 0:
+        _worker(pricer, params, batches, results, 0, 1, dtype)
+    else:
+        results.share_memory_()
+        context = mp.get_context(start_method)
+        processes = [context.Process(target=_worker, args=(pricer, params, batches, results, worker, num_workers, dtype))
+                     for worker in range(num_workers)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        if any(process.exitcode != 0 for process in processes):
+            raise RuntimeError("A Monte Carlo worker process failed.")
+
+    # Deterministic merge in batch order
+    stats = RunningStatistics()
+    for row in results.tolist():
+        batch = RunningStatistics()
+        batch.count, batch.mean, batch.m2 = int(row[0]), row[1], row[2]
+        batch.total = batch.count * batch.mean
+        stats.merge(batch)
+    grad_sums = results[:, 3:].sum(dim=0).tolist()
+
+    return {
+        'price': stats.mean,
+        'std_error': stats.std_error,
+        'variance': stats.variance,
+        'num_paths': stats.count,
+        'greeks': {name: grad_sum / stats.count for name, grad_sum in zip(params, grad_sums)}
+    }
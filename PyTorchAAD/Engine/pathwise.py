@@ -0,0 +1,79 @@
+import torch
+from Engine.random_sources import PseudoRandomSource
+from Engine.statistics import RunningStatistics
+from Engine.precision import get_precision
+
+def pathwise_greeks(process, S0, dt, num_steps, num_paths, payoff, params=(), chunk_size=10000,
+                    random_source=None, precision=None):
+    """
+    Pathwise Greeks with hand-coded step derivatives (`process.step_derivatives`),
+    in the spirit of Tutorials/Archive/GBM_CVT.py but without the autograd tape.
+
+    For a one-dimensional state the adjoint recursion
+        S_bar(n) = S_bar(n + 1) dS(n + 1)/dS(n),  theta_bar += S_bar(n + 1) dS(n + 1)/dtheta
+    only ever multiplies S_bar by the step derivatives, so it factors through the
+    terminal adjoint payoff'(S_N): the products of step derivatives are carried
+    forward alongside the state and multiplied by payoff'(S_N) at maturity. Paths
+    are processed chunk by chunk and each step overwrites the previous one, so the
+    memory is O(chunk_size * len(params)) whatever `num_steps` (quasi-random sources,
+    which must draw a whole path at once, keep the draws of one chunk).
+
+    Args:
+        process: A process implementing `step_derivatives`.
+        S0: Initial value (float).
+        dt: Time step.
+        num_steps: Number of time steps (maturity num_steps * dt).
+        num_paths: Number of simulated paths.
+        payoff (callable): Discounted payoff of the terminal values, `payoff(S_T)` (shape: [chunk]).
+                           Only its derivative w.r.t. S_T is taken with autograd.
+        params: Names of the process parameters to differentiate (e.g. ('sigma',)); the
+                Greek w.r.t. S0 is always returned.
+        chunk_size (int): Number of paths per chunk.
+        random_source: A RandomSource. Defaults to `torch.randn`.
+        precision: Precision policy of the paths (see Engine.precision).
+
+    Returns:
+        dict: price, std_error, num_paths, greeks and greek_std_errors (dicts keyed by 'S0'
+              and the parameter names).
+    """
+    dtype = get_precision(precision).path_dtype
+    random_source = random_source if random_source is not None else PseudoRandomSource()
+    random_source.reset()
+
+    names = ['S0'] + list(params)
+    price = RunningStatistics()
+    greeks = {name: RunningStatistics() for name in names}
+
+    for start in range(0, num_paths, chunk_size):
+        n = min(chunk_size, num_paths - start)
+        S = torch.full((n,), S0, dtype=dtype)
+        # Tangents dS/dS0 and dS/dtheta, propagated forward with the step derivatives
+        tangents = {name: torch.ones_like(S) if name == 'S0' else torch.zeros_like(S) for name in names}
+        dW_all = None if random_source.stepwise else random_source.brownian_increments(n, num_steps, dtype=dtype) * dt**0.5
+
+        with torch.no_grad():
+            for t in range(num_steps):
+                if dW_all is None:
+                    dW = random_source.normals(n, 1, dtype=dtype)[:, 0] * dt**0.5
+                else:
+                    dW = dW_all[:, t]
+                S, dS, dtheta = process.step_derivatives(t * dt, S, dt, dW)
+                for name in names:
+                    tangents[name] = dS * tangents[name] + (dtheta[name] if name != 'S0' else 0.0)
+
+        # Terminal adjoint payoff'(S_N), the only use of autograd
+        S_T = S.requires_grad_()
+        values = payoff(S_T)
+        S_bar, = torch.autograd.grad(values.sum(), S_T)
+
+        price.update(values)
+        for name in names:
+            greeks[name].update(S_bar * tangents[name])
+
+    return {
+        'price': price.mean,
+        'std_error': price.std_error,
+        'num_paths': price.count,
+        'greeks': {name: stats.mean for name, stats in greeks.items()},
+        'greek_std_errors': {name: stats.std_error for name, stats in greeks.items()}
+    }
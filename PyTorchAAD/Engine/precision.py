@@ -0,0 +1,75 @@
+import contextlib
+import functools
+import torch
+
+class Precision:
+    def __init__(self, name, path_dtype, accumulator_dtype):
+        """
+        Precision policy of the pricing engines.
+
+        Args:
+            name (str): Name of the policy.
+            path_dtype: Dtype of the simulated paths and random draws.
+            accumulator_dtype: Dtype of the reductions (means, gradient sums), regressions
+                               and lattice roll-backs.
+        """
+        self.name = name
+        self.path_dtype = path_dtype
+        self.accumulator_dtype = accumulator_dtype
+
+    def accumulate(self, x: torch.Tensor) -> torch.Tensor:
+        """Casts a tensor to the accumulator dtype (differentiable)."""
+        return x.to(self.accumulator_dtype)
+
+    def mean(self, x: torch.Tensor) -> torch.Tensor:
+        """Mean carried out in the accumulator dtype."""
+        return self.accumulate(x).mean()
+
+    def __repr__(self):
+        return f"Precision('{self.name}')"
+
+FLOAT32 = Precision("float32", torch.float32, torch.float32)
+FLOAT64 = Precision("float64", torch.float64, torch.float64)
+# float32 paths, float64 means, gradient sums and regressions
+MIXED = Precision("mixed", torch.float32, torch.float64)
+
+_policies = {policy.name: policy for policy in (FLOAT32, FLOAT64, MIXED)}
+_default = FLOAT32
+
+def get_precision(precision=None) -> Precision:
+    """
+    Resolves a precision argument: a Precision, one of 'float32', 'float64' or
+    'mixed', or None for the engine-wide default.
+    """
+    if precision is None:
+        return _default
+    if isinstance(precision, Precision):
+        return precision
+    if precision not in _policies:
+        raise ValueError(f"Unknown precision '{precision}'. Choose 'float32', 'float64' or 'mixed'.")
+    return _policies[precision]
+
+def common_dtype(*xs):
+    """
+    Floating-point dtype of the tensors among the arguments promoted together, so that
+    numbers follow the tensors they are combined with; the path dtype of the engine-wide
+    default policy when no argument is a floating-point tensor.
+    """
+    dtypes = [x.dtype for x in xs if isinstance(x, torch.Tensor) and x.is_floating_point()]
+    return functools.reduce(torch.promote_types, dtypes) if dtypes else _default.path_dtype
+
+def set_default_precision(precision):
+    """Sets the engine-wide default precision policy."""
+    global _default
+    _default = get_precision(precision)
+
+@contextlib.contextmanager
+def default_precision(precision):
+    """Context manager that sets the engine-wide default precision policy temporarily."""
+    global _default
+    previous = _default
+    set_default_precision(precision)
+    try:
+        yield _default
+    finally:
+        _default = previous
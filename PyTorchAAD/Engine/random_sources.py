@@ -0,0 +1,442 @@
+import math
+from collections import OrderedDict
+import torch
+
+def _uniforms_to_normals(U: torch.Tensor, dtype) -> torch.Tensor:
+    # Keep the uniforms strictly inside (0, 1) so that the inverse CDF stays finite
+    eps = torch.finfo(U.dtype).eps
+    # In place: no second float64 buffer of the size of the draws
+    return torch.special.ndtri(U.clamp_(min=eps / 2, max=1 - eps / 2), out=U).to(dtype)
+
+class BrownianBridge:
+    def __init__(self, num_steps: int):
+        """
+        Brownian-bridge path construction on a uniform grid of `num_steps` steps.
+        The first normal fixes the terminal point, the next ones the mid-points of
+        ever finer intervals, so the leading (best distributed) quasi-random
+        dimensions drive the coarse structure of the path.
+
+        Args:
+            num_steps (int): Number of time steps.
+        """
+        self.num_steps = num_steps
+        n = num_steps
+        t = [float(i + 1) for i in range(n)]
+
+        self.bridge_index = [0] * n
+        self.left_index = [0] * n
+        self.right_index = [0] * n
+        self.left_weight = [0.0] * n
+        self.right_weight = [0.0] * n
+        self.std_dev = [0.0] * n
+
+        if n == 0:
+            return
+
+        filled = [False] * n
+        filled[n - 1] = True
+        self.bridge_index[0] = n - 1
+        self.std_dev[0] = math.sqrt(t[n - 1])
+
+        j = 0
+        for i in range(1, n):
+            while filled[j]:
+                j += 1
+            k = j
+            while not filled[k]:
+                k += 1
+            # Points j-1 (or the origin) and k are known, fill the middle one
+            l = j + ((k - 1 - j) >> 1)
+            filled[l] = True
+            self.bridge_index[i] = l
+            self.left_index[i] = j
+            self.right_index[i] = k
+            t_left = t[j - 1] if j != 0 else 0.0
+            self.left_weight[i] = (t[k] - t[l]) / (t[k] - t_left)
+            self.right_weight[i] = (t[l] - t_left) / (t[k] - t_left)
+            self.std_dev[i] = math.sqrt((t[l] - t_left) * (t[k] - t[l]) / (t[k] - t_left))
+            j = k + 1
+            if j >= n:
+                j = 0
+
+    def __call__(self, Z: torch.Tensor) -> torch.Tensor:
+        """
+        Maps independent normals to Brownian increments.
+
+        Args:
+            Z (torch.Tensor): Standard normals (shape: [num_paths, num_steps]), ordered by importance.
+
+        Returns:
+            torch.Tensor: Standardised Brownian increments (shape: [num_paths, num_steps]),
+                          i.i.d. N(0, 1) in law and ordered in time.
+        """
+        W = torch.empty_like(Z)
+        if self.num_steps == 0:
+            return W
+        W[:, -1] = self.std_dev[0] * Z[:, 0]
+        for i in range(1, self.num_steps):
+            j, k, l = self.left_index[i], self.right_index[i], self.bridge_index[i]
+            W[:, l] = self.right_weight[i] * W[:, k] + self.std_dev[i] * Z[:, i]
+            if j != 0:
+                W[:, l] += self.left_weight[i] * W[:, j - 1]
+        return torch.diff(W, dim=1, prepend=torch.zeros_like(W[:, :1]))
+
+class RandomSource:
+    """Base class for sources of standard normal draws used by the Monte Carlo engines."""
+
+    # Draws are i.i.d. across dimensions, so a path may be generated one step at a time
+    stepwise = False
+    # Number of consecutive paths forming one independent sample (2 for antithetic pairs)
+    group_size = 1
+
+    def normals(self, num_paths: int, num_dims: int, dtype=torch.float32) -> torch.Tensor:
+        """
+        Draws the next block of standard normals.
+
+        Args:
+            num_paths (int): Number of paths (rows).
+            num_dims (int): Number of draws per path (columns).
+            dtype: Output dtype.
+
+        Returns:
+            torch.Tensor: Standard normals (shape: [num_paths, num_dims]).
+        """
+        raise NotImplementedError("The normals method must be implemented in a subclass.")
+
+    def brownian_increments(self, num_paths: int, num_steps: int, dtype=torch.float32) -> torch.Tensor:
+        """
+        Draws standardised Brownian increments for paths of `num_steps` steps
+        (multiply by sqrt(dt) to get dW). Defaults to independent normals.
+        """
+        return self.normals(num_paths, num_steps, dtype)
+
+    def factor_increments(self, num_paths: int, num_steps: int, num_factors: int, dtype=torch.float32) -> torch.Tensor:
+        """
+        Draws independent standardised Brownian increments of `num_factors` factors
+        (shape: [num_paths, num_steps, num_factors]). Draw j of a path feeds step
+        j // num_factors of factor j % num_factors.
+        """
+        return self.normals(num_paths, num_steps * num_factors, dtype).reshape(num_paths, num_steps, num_factors)
+
+    def reset(self):
+        """Restarts the stream, so that the next draws reproduce the previous run."""
+        pass
+
+    def skip_to(self, path_index: int):
+        """
+        Positions the stream so that the next draw is the one of path `path_index`.
+        Lets a worker simulating a sub-range of paths reproduce a single-process run.
+        """
+        raise NotImplementedError("Skip-ahead is not supported by this random source.")
+
+class PseudoRandomSource(RandomSource):
+    stepwise = True
+
+    def __init__(self, seed=None):
+        """
+        Pseudo-random normals.
+
+        Args:
+            seed: Without a seed the global `torch.randn` state is used. With a seed,
+                  draws come from a private generator through the inverse CDF on
+                  uniforms, which consumes the generator element by element so the
+                  draws do not depend on how the path range is chunked.
+        """
+        self.seed = seed
+        self.generator = None
+        self.reset()
+
+    def reset(self):
+        if self.seed is not None:
+            self.generator = torch.Generator().manual_seed(self.seed)
+
+    def normals(self, num_paths, num_dims, dtype=torch.float32):
+        if self.generator is None:
+            return torch.randn(num_paths, num_dims, dtype=dtype)
+        U = torch.rand(num_paths, num_dims, dtype=torch.float64, generator=self.generator)
+        return _uniforms_to_normals(U, dtype)
+
+class SobolSource(RandomSource):
+    def __init__(self, scramble=True, seed=None, brownian_bridge=True):
+        """
+        Scrambled Sobol quasi-random normals (uniforms mapped through the inverse CDF).
+
+        Args:
+            scramble (bool): Owen-scramble the sequence (recommended, avoids the origin point).
+            seed: Seed of the scrambling.
+            brownian_bridge (bool): Build Brownian increments with a Brownian bridge so
+                                    the first Sobol dimensions drive the coarse time points.
+        """
+        self.scramble = scramble
+        self.seed = seed
+        self.brownian_bridge = brownian_bridge
+        self.engine = None
+        self.bridge = None
+        self.skip = None
+
+    def _engine(self, num_dims):
+        if self.engine is None or self.engine.dimension != num_dims:
+            self.engine = torch.quasirandom.SobolEngine(num_dims, scramble=self.scramble, seed=self.seed)
+        if self.skip is not None:
+            self.engine.reset()
+            self.engine.fast_forward(self.skip)
+            self.skip = None
+        return self.engine
+
+    def reset(self):
+        self.skip = None
+        if self.engine is not None:
+            self.engine.reset()
+
+    def skip_to(self, path_index):
+        # Applied at the next draw, once the dimension is known
+        self.skip = path_index
+
+    def normals(self, num_paths, num_dims, dtype=torch.float32):
+        U = self._engine(num_dims).draw(num_paths, dtype=torch.float64)
+        return _uniforms_to_normals(U, dtype)
+
+    def brownian_increments(self, num_paths, num_steps, dtype=torch.float32):
+        Z = self.normals(num_paths, num_steps, dtype)
+        if not self.brownian_bridge:
+            return Z
+        if self.bridge is None or self.bridge.num_steps != num_steps:
+            self.bridge = BrownianBridge(num_steps)
+        return self.bridge(Z)
+
+    def factor_increments(self, num_paths, num_steps, num_factors, dtype=torch.float32):
+        Z = self.normals(num_paths, num_steps * num_factors, dtype).reshape(num_paths, num_steps, num_factors)
+        if not self.brownian_bridge:
+            return Z
+        if self.bridge is None or self.bridge.num_steps != num_steps:
+            self.bridge = BrownianBridge(num_steps)
+        # Bridge every factor, the leading dimensions fix the terminal points of all factors
+        W = self.bridge(Z.transpose(1, 2).reshape(-1, num_steps))
+        return W.reshape(num_paths, num_factors, num_steps).transpose(1, 2)
+
+class NormalCache:
+    def __init__(self, max_bytes=2**30):
+        """
+        Least-recently-used store of normal draws, shared by the CachedSource
+        wrappers of several engines (e.g. one per revaluation of a risk run).
+
+        Args:
+            max_bytes (int): Memory cap; the least recently used draws are evicted
+                             beyond it and blocks larger than the cap are not kept.
+        """
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        draws = self.entries.get(key)
+        if draws is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return draws
+
+    def put(self, key, draws: torch.Tensor):
+        size = draws.numel() * draws.element_size()
+        if size > self.max_bytes:
+            return
+        if key in self.entries:
+            self.nbytes -= self.entries[key].numel() * self.entries[key].element_size()
+        self.entries[key] = draws
+        self.entries.move_to_end(key)
+        self.nbytes += size
+        while self.nbytes > self.max_bytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.nbytes -= evicted.numel() * evicted.element_size()
+
+    def clear(self):
+        self.entries.clear()
+        self.nbytes = 0
+
+def _source_key(source):
+    # Seeds and settings (ints, floats, strings...) identify the stream of a source;
+    # wrapped sources (e.g. AntitheticSource(source)) are keyed recursively
+    items = []
+    for name, value in sorted(vars(source).items()):
+        if isinstance(value, RandomSource):
+            items.append((name, _source_key(value)))
+        elif value is None or isinstance(value, (bool, int, float, str)):
+            items.append((name, value))
+    return (type(source).__name__, tuple(items))
+
+class CachedSource(RandomSource):
+    def __init__(self, source, cache=None, key=None):
+        """
+        Common random numbers for bump-and-revalue: the draws of `source` are kept in
+        a NormalCache keyed by the stream (source type and seeds), the position in the
+        stream (skip-ahead and number of draws since the last reset), the shape and
+        the dtype. Engines built on the same source and cache, e.g. one per bumped
+        parameter, reuse the draws instead of regenerating them, so the Monte Carlo
+        noise cancels in finite differences.
+
+        A miss after hits first brings `source` to the right position, replaying the
+        earlier draws of the run if needed, so the draws never depend on what was
+        cached. Draws are returned as copies, which callers may modify in place.
+
+        Args:
+            source (RandomSource): Source of the underlying draws (seeded, for the
+                                   cache to be reproducible across runs).
+            cache (NormalCache): Shared cache, a private one of 1 GB by default.
+            key: Identifier of the stream, defaults to the type and seeds of `source`.
+        """
+        self.source = source
+        self.cache = cache if cache is not None else NormalCache()
+        self.key = key if key is not None else _source_key(source)
+        self.stepwise = source.stepwise
+        self.group_size = source.group_size
+        # Stream position: first path of the last skip-ahead (None after a reset) and draws since
+        self.start = None
+        self.calls = []
+        # Position of the wrapped source, which falls behind while draws come from the cache
+        self.source_start = None
+        self.source_calls = 0
+
+    def _sync(self, num_calls):
+        if self.source_start != self.start or self.source_calls > num_calls:
+            if self.start is None:
+                self.source.reset()
+            else:
+                self.source.skip_to(self.start)
+            self.source_start, self.source_calls = self.start, 0
+        for method, args in self.calls[self.source_calls:num_calls]:
+            getattr(self.source, method)(*args)
+            self.source_calls += 1
+
+    def _draw(self, method, *args):
+        key = (self.key, self.start, len(self.calls), method) + args
+        self.calls.append((method, args))
+        draws = self.cache.get(key)
+        if draws is None:
+            self._sync(len(self.calls) - 1)
+            draws = getattr(self.source, method)(*args)
+            self.source_calls += 1
+            self.cache.put(key, draws)
+        return draws.clone()
+
+    def normals(self, num_paths, num_dims, dtype=torch.float32):
+        return self._draw('normals', num_paths, num_dims, dtype)
+
+    def brownian_increments(self, num_paths, num_steps, dtype=torch.float32):
+        return self._draw('brownian_increments', num_paths, num_steps, dtype)
+
+    def factor_increments(self, num_paths, num_steps, num_factors, dtype=torch.float32):
+        return self._draw('factor_increments', num_paths, num_steps, num_factors, dtype)
+
+    def reset(self):
+        self.start, self.calls = None, []
+
+    def skip_to(self, path_index):
+        self.start, self.calls = path_index, []
+
+# MRG32k3a constants (L'Ecuyer, 1999), as in CompFinance/mrg32k3a.h
+_M1 = 4294967087
+_M2 = 4294944443
+_A12 = 1403580
+_A13 = 810728
+_A21 = 527612
+_A23 = 1370589
+
+# Transition matrices of the two components acting on (x[n-3], x[n-2], x[n-1])
+_MRG_A1 = [[0, 1, 0], [0, 0, 1], [_M1 - _A13, _A12, 0]]
+_MRG_A2 = [[0, 1, 0], [0, 0, 1], [_M2 - _A23, 0, _A21]]
+
+def _mat_mul_mod(A, B, m):
+    return [[sum(A[i][k] * B[k][j] for k in range(3)) % m for j in range(3)] for i in range(3)]
+
+def _mat_pow_mod(A, e, m):
+    result = [[int(i == j) for j in range(3)] for i in range(3)]
+    while e > 0:
+        if e & 1:
+            result = _mat_mul_mod(result, A, m)
+        A = _mat_mul_mod(A, A, m)
+        e >>= 1
+    return result
+
+def _mat_vec_mod(A, S, m):
+    # A has entries below 2^32, so each product is split in 16-bit halves to stay within int64
+    S_hi, S_lo = S >> 16, S & 0xFFFF
+    columns = []
+    for i in range(3):
+        acc = torch.zeros_like(S[:, 0])
+        for j in range(3):
+            term = torch.remainder(A[i][j] * S_hi[:, j], m)
+            acc += torch.remainder(term * 65536 + A[i][j] * S_lo[:, j], m)
+        columns.append(torch.remainder(acc, m))
+    return torch.stack(columns, dim=1)
+
+class MRG32k3aSource(RandomSource):
+    def __init__(self, a=12345, b=12346, max_dims=None):
+        """
+        MRG32k3a combined multiple-recursive generator with O(log n) skip-ahead.
+        Draws are laid out path by path: path i uses the numbers at positions
+        [i * max_dims, i * max_dims + num_dims) of the sequence, so it gets the same
+        normals however the path range is split across chunks, threads or processes.
+        Blocks are generated vectorized over paths, each path starting from its
+        own jumped-ahead state. Without max_dims the stride is fixed by the first
+        draw; a draw of more dimensions than the stride would overlap other paths
+        and raises a ValueError.
+
+        Args:
+            a: Seed of the first component (all three state values).
+            b: Seed of the second component (all three state values).
+            max_dims (int, optional): Numbers reserved per path.
+        """
+        self.a = a
+        self.b = b
+        self.max_dims = max_dims
+        self.stride = max_dims
+        self.next_path = 0
+
+    def reset(self):
+        self.next_path = 0
+        self.stride = self.max_dims
+
+    def skip_to(self, path_index):
+        self.next_path = path_index
+
+    def _path_states(self, first_path, num_paths, stride, A, seed, m):
+        # State of the first path, then doubling: states[k] = (A^stride)^k state[0]
+        jump = _mat_pow_mod(A, first_path * stride, m)
+        states = _mat_vec_mod(jump, torch.full((1, 3), seed, dtype=torch.int64), m)
+        step = _mat_pow_mod(A, stride, m)
+        while states.shape[0] < num_paths:
+            states = torch.cat([states, _mat_vec_mod(step, states, m)])
+            step = _mat_mul_mod(step, step, m)
+        return states[:num_paths]
+
+    def uniforms(self, num_paths, num_dims):
+        """
+        Draws the next block of uniforms in (0, 1) (shape: [num_paths, num_dims], float64).
+        """
+        if self.stride is None:
+            self.stride = num_dims
+        elif num_dims > self.stride:
+            raise ValueError(f"MRG32k3aSource reserves {self.stride} dimensions per path, got {num_dims}; "
+                             "set max_dims or call reset() before drawing more.")
+        x = self._path_states(self.next_path, num_paths, self.stride, _MRG_A1, self.a, _M1)
+        y = self._path_states(self.next_path, num_paths, self.stride, _MRG_A2, self.b, _M2)
+        x0, x1, x2 = x.unbind(dim=1)
+        y0, y1, y2 = y.unbind(dim=1)
+
+        U = torch.empty(num_paths, num_dims, dtype=torch.float64)
+        for j in range(num_dims):
+            x_new = torch.remainder(_A12 * x1 - _A13 * x0, _M1)
+            y_new = torch.remainder(_A21 * y2 - _A23 * y0, _M2)
+            x0, x1, x2 = x1, x2, x_new
+            y0, y1, y2 = y1, y2, y_new
+            U[:, j] = torch.remainder(x_new - y_new, _M1).to(torch.float64)
+        # x == y maps to m1 rather than 0, as in the reference implementation
+        U[U == 0] = _M1
+        self.next_path += num_paths
+        return U / (_M1 + 1)
+
+    def normals(self, num_paths, num_dims, dtype=torch.float32):
+        return _uniforms_to_normals(self.uniforms(num_paths, num_dims), dtype)
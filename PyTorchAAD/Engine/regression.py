@@ -0,0 +1,99 @@
+import torch
+
+# Floor of the Gram diagonal, so that a basis function vanishing on every selected
+# path (e.g. no path in the money) gives a zero coefficient with finite gradients
+_DIAGONAL_FLOOR = 1e-100
+
+class RegressionWorkspace:
+    def __init__(self):
+        """
+        Buffers of the regressions of one backward induction: the design matrix, the
+        weighted design, the Gram matrix and the right-hand side keep their shapes from
+        one exercise date to the next, so they are allocated on the first date and
+        written in place (`out=`) on the others. Writing into a buffer is not
+        differentiable, so a workspace is only used when no graph is recorded.
+        """
+        self.buffers = {}
+
+    def buffer(self, name, shape, dtype, device):
+        """Buffer `name` of the given shape, dtype and device, allocated on first use."""
+        key = (name, tuple(shape), dtype, device)
+        if key not in self.buffers:
+            self.buffers[key] = torch.empty(shape, dtype=dtype, device=device)
+        return self.buffers[key]
+
+    def design_matrix(self, basis, X, normalisation=None):
+        """`basis.design_matrix(X, normalisation)`, written into the design buffer of the shape of X."""
+        key = ('design', tuple(X.shape), X.dtype, X.device)
+        A = basis.design_matrix(X, normalisation, out=self.buffers.get(key))
+        self.buffers[key] = A
+        return A
+
+def masked_regression(A, Y, mask, ridge=1e-12, workspace=None):
+    """
+    Least-squares coefficients of Y on the columns of A over the rows selected by
+    `mask` (e.g. the in-the-money paths of a Longstaff-Schwartz step), computed on
+    the full fixed-shape tensors: the rows are weighted by the mask and the small
+    normal equations A' W A c = A' W Y are solved by Cholesky. No gather, scatter or
+    data-dependent shape is involved, so the kernel is differentiable, reuses the
+    caller's buffers and can be compiled.
+
+    The normal equations square the condition number of A, so they are formed in
+    float64 and equilibrated (unit diagonal) before the factorisation; the relative
+    `ridge` keeps them positive definite when fewer rows than basis functions are
+    selected. Leading batch dimensions (e.g. [*batch, num_paths, num_basis] for a
+    scenario batch) give one independent regression per batch entry.
+
+    Args:
+        A (torch.Tensor): Design matrix (shape: [num_paths, num_basis]).
+        Y (torch.Tensor): Regressands (shape: [num_paths]).
+        mask (torch.Tensor): Boolean selection of the rows (shape: [num_paths]).
+        ridge (float): Tikhonov regularisation of the equilibrated normal equations.
+        workspace (RegressionWorkspace): Buffers of the normal equations, None to allocate them.
+
+    Returns:
+        torch.Tensor: Coefficients (shape: [num_basis], dtype of A).
+    """
+    return solve_normal_equations(*normal_equations(A, Y, mask, workspace), ridge=ridge).to(A.dtype)
+
+def normal_equations(A, Y, mask, workspace=None):
+    """
+    Masked normal equations A' W A and A' W Y in float64. They are sums over the rows,
+    so the equations of a large path set can be accumulated chunk by chunk.
+
+    Args:
+        A (torch.Tensor): Design matrix (shape: [num_paths, num_basis]).
+        Y (torch.Tensor): Regressands (shape: [num_paths]).
+        mask (torch.Tensor): Boolean selection of the rows (shape: [num_paths]).
+        workspace (RegressionWorkspace): Buffers of the result, None to allocate them.
+
+    Returns:
+        tuple: Gram matrix (shape: [num_basis, num_basis]) and right-hand side (shape: [num_basis]).
+    """
+    A64 = A.to(torch.float64)
+    weights = mask.to(torch.float64).unsqueeze(-1)
+    if workspace is None:
+        weighted = A64 * weights
+        return weighted.mT @ A64, (weighted.mT @ Y.to(torch.float64).unsqueeze(-1)).squeeze(-1)
+
+    def buffer(name, shape):
+        return workspace.buffer(name, shape, torch.float64, A.device)
+
+    num_basis = A.shape[-1]
+    weighted = torch.mul(A64, weights, out=buffer('weighted', A.shape))
+    gram = torch.matmul(weighted.mT, A64, out=buffer('gram', A.shape[:-2] + (num_basis, num_basis)))
+    rhs = torch.matmul(weighted.mT, Y.to(torch.float64).unsqueeze(-1), out=buffer('rhs', A.shape[:-2] + (num_basis, 1)))
+    return gram, rhs.squeeze(-1)
+
+def solve_normal_equations(gram, rhs, ridge=1e-12):
+    """
+    Coefficients of the normal equations `gram` c = `rhs` (see `normal_equations`),
+    equilibrated and regularised as in `masked_regression`.
+
+    Returns:
+        torch.Tensor: Coefficients (shape: [num_basis], float64).
+    """
+    scale = torch.rsqrt(torch.clamp(torch.diagonal(gram, dim1=-2, dim2=-1), min=_DIAGONAL_FLOOR))
+    gram = gram * scale.unsqueeze(-1) * scale.unsqueeze(-2) + ridge * torch.eye(gram.shape[-1], dtype=gram.dtype, device=gram.device)
+    L = torch.linalg.cholesky(gram)
+    return scale * torch.cholesky_solve((scale * rhs).unsqueeze(-1), L).squeeze(-1)
@@ -1,5 +1,108 @@
+import copy
+import numbers
 import torch
-def simulate_process(process, S0, T, steps, n_paths):
+from torch.utils.checkpoint import checkpoint
+from Engine.random_sources import PseudoRandomSource
+from Engine.precision import get_precision
+
+# Compiled time-loop kernels, keyed by (process type, state shape, dtype, steps per block)
+_loop_kernels = {}
+# Steps run by one compiled kernel: compile time grows with the unrolled steps, so long
+# loops run a cached block kernel repeatedly rather than one kernel of num_steps steps
+_COMPILED_BLOCK_STEPS = 32
+# Rough number of path-sized tensors autograd saves per time step and factor
+_SAVED_TENSORS_PER_STEP = 8
+
+def _step_block(process, S, first_step, dt, dW):
+    # Advances S over the columns of dW (shape: [num_paths, block_steps]), returning every
+    # state steps-major (shape: [block_steps, num_paths]) so that each step writes a contiguous row
+    states = []
+    for j in range(dW.shape[1]):
+        S = type(process).step(process, (first_step + j) * dt, S, dt, dW[:, j])
+        states.append(S)
+    return torch.stack(states)
+
+def _tensor_parameters(process, dtype):
+    # Copy of the process with its float parameters as 0-dim tensors: compiled kernels take
+    # tensors as inputs, where Python floats would be baked in and recompiled for each value
+    process = copy.copy(process)
+    for name, value in vars(process).items():
+        if isinstance(value, numbers.Real) and not isinstance(value, bool):
+            setattr(process, name, torch.tensor(float(value), dtype=dtype))
+    return process
+
+def _initial_states(S0, num_paths, dtype):
+    # Single-factor S0 repeated over the paths (shape: [*batch, num_paths] with the batch shape of S0)
+    S0 = torch.as_tensor(S0, dtype=dtype)
+    return S0.unsqueeze(-1).expand(*S0.shape, num_paths)
+
+def compiled_loop(process, shape, dtype=torch.float32, block_steps=_COMPILED_BLOCK_STEPS, backend="inductor"):
+    """
+    Returns the time loop of `block_steps` steps of `type(process).step`, compiled with
+    `torch.compile` into fused kernels (each path runs all the steps of the block in
+    registers). Kernels are cached per process type, state shape, block length and backend;
+    call them as `kernel(process, S, first_step, dt, dW)` with tensors for the process
+    parameters, first_step and dt (see `compiled_paths`).
+
+    Args:
+        process: An instance of a subclass of StochasticProcess.
+        shape: Shape of the state tensor (e.g. (num_paths,)).
+        dtype: Dtype of the state tensor.
+        block_steps (int): Number of steps of the kernel.
+        backend: `torch.compile` backend, a name or a callable `backend(graph_module, example_inputs)`
+                 (called once per compiled graph).
+
+    Returns:
+        callable: The compiled loop.
+    """
+    key = (type(process), tuple(shape), dtype, block_steps, backend)
+    if key not in _loop_kernels:
+        _loop_kernels[key] = torch.compile(_step_block, dynamic=False, backend=backend)
+    return _loop_kernels[key]
+
+def compiled_paths(process, S0, dt, dW, block_steps=_COMPILED_BLOCK_STEPS, backend="inductor"):
+    """
+    Paths of a stepped process with the whole time loop in compiled kernels: the loop
+    runs as ceil(num_steps / block_steps) calls of one cached `compiled_loop` kernel
+    (the last block starts block_steps before the end and recomputes the steps it
+    overlaps). Process parameters, times and dt are passed as tensors, so new parameter
+    values (e.g. a bumped sigma) reuse the compiled kernel, and autograd Greeks flow
+    through it.
+
+    Args:
+        process: An instance of a subclass of StochasticProcess.
+        S0: Initial value (scalar or tensor with a leading scenario batch shape).
+        dt: Time step.
+        dW (torch.Tensor): Brownian increments (shape: [num_paths, num_steps - 1]).
+        block_steps (int): Number of steps per compiled kernel.
+        backend: `torch.compile` backend (see `compiled_loop`).
+
+    Returns:
+        torch.Tensor: Simulated paths (shape: [*batch, num_paths, num_steps]), first column is S0,
+                      as a view of steps-major storage.
+    """
+    num_paths, num_steps = dW.shape
+    dtype = dW.dtype
+    S0 = torch.as_tensor(S0, dtype=dtype)
+    block_steps = min(block_steps, num_steps)
+    kernel = compiled_loop(process, (*S0.shape, num_paths), dtype, block_steps, backend)
+    process = _tensor_parameters(process, dtype)
+    dt = torch.as_tensor(dt, dtype=dtype)
+
+    S = [_initial_states(S0, num_paths, dtype).unsqueeze(0)]
+    done = 0
+    while done < num_steps:
+        start = min(done, num_steps - block_steps)
+        # State at step `start`: the last one computed, or an earlier one when the last block overlaps
+        state = S[-1][start - done - 1]
+        states = kernel(process, state, torch.tensor(float(start), dtype=dtype), dt, dW[:, start:start + block_steps])
+        S.append(states[done - start:])
+        done = start + block_steps
+    # Parameters of a scenario batch broadcast the states from the first step on
+    S[0] = S[0].expand(1, *S[-1].shape[1:])
+    return torch.cat(S).movedim(0, -1)
+
+def simulate_process(process, S0, T, steps, n_paths, random_source=None, precision=None):
     """
     Simulates paths for a given stochastic process.
 
@@ -9,18 +112,175 @@ def simulate_process(process, S0, T, steps, n_paths):
         T: Total time (float).
         steps: Number of time steps (int).
         n_paths: Number of simulated paths (int).
+        random_source: A RandomSource (e.g. SobolSource). Defaults to `torch.randn`.
+        precision: Precision policy of the paths (see Engine.precision).
 
     Returns:
         A tensor of shape (steps, n_paths) containing simulated paths.
     """
     dt = T / steps
-    S = torch.full((steps, n_paths), S0, dtype=torch.float32, device=process.device)
-    
+
     # Generate Brownian increments
-    dW = torch.randn(steps - 1, n_paths, dtype=torch.float32, device=process.device) * torch.sqrt(torch.tensor(dt, device=process.device))
+    dtype = get_precision(precision).path_dtype
+    random_source = random_source if random_source is not None else PseudoRandomSource()
+    dW = random_source.brownian_increments(n_paths, steps - 1, dtype=dtype).T.to(process.device) * dt**0.5
+
+    if process.supports_vectorized_simulation:
+        return process.simulate_paths(S0, dt, dW.T)
+
+    S = torch.full((steps, n_paths), S0, dtype=dtype, device=process.device)
     
     # Simulate paths iteratively
     for t in range(1, steps):
-        S[t] = process.evolve(S[t - 1], dt, dW[t - 1])
+        S[t] = process.step((t - 1) * dt, S[t - 1], dt, dW[t - 1])
     
-    return S.T
\ No newline at end of file
+    return S.T
+
+def segment_steps(memory_budget, num_paths, num_factors=1, dtype=torch.float32):
+    """
+    Number of time steps per checkpointed segment such that the tensors autograd
+    saves while recomputing one segment stay within `memory_budget` bytes.
+
+    Args:
+        memory_budget: Memory budget of one segment, in bytes.
+        num_paths: Number of simulated paths.
+        num_factors: Number of factors of the state.
+        dtype: Dtype of the paths.
+
+    Returns:
+        int: Number of steps per segment (at least 1).
+    """
+    step_bytes = _SAVED_TENSORS_PER_STEP * num_paths * num_factors * torch.finfo(dtype).bits // 8
+    return max(1, int(memory_budget // step_bytes))
+
+def checkpointed_paths(segment, S0, Z, num_segment_steps):
+    """
+    Builds paths segment by segment under `torch.utils.checkpoint`. Only the
+    segment boundaries, the draws and the paths themselves are kept for the
+    backward pass; the intermediates of each segment are recomputed when its
+    gradients are needed, so the autograd memory is bounded by one segment
+    instead of growing with the number of steps.
+
+    Args:
+        segment (callable): `segment(S_start, Z_segment, first_step)` returning the values at
+                            the grid points following `S_start` (shape: [num_paths, m, ...]).
+        S0 (torch.Tensor): State at the first grid point (shape: [num_paths, ...]).
+        Z (torch.Tensor): Draws of all steps (shape: [num_paths, num_steps, ...]).
+        num_segment_steps (int): Number of steps per segment (see `segment_steps`).
+
+    Returns:
+        torch.Tensor: Paths (shape: [num_paths, num_steps + 1, ...]), first column is S0.
+    """
+    S = [S0.unsqueeze(1)]
+    for start in range(0, Z.shape[1], num_segment_steps):
+        S.append(checkpoint(segment, S[-1][:, -1], Z[:, start:start + num_segment_steps], start, use_reentrant=False))
+    return torch.cat(S, dim=1)
+
+def _multi_factor_paths(process, S0, dt, dW, first_step=0):
+    # Paths from S0 (shape: [num_factors] or [num_paths, num_factors]) and correlated increments
+    if process.supports_vectorized_simulation:
+        S0 = torch.as_tensor(S0, dtype=dW.dtype)
+        return process.simulate_paths(S0.unsqueeze(-2) if S0.dim() == 2 else S0, dt, dW)
+
+    S = [torch.as_tensor(S0, dtype=dW.dtype).expand(dW.shape[0], process.num_factors)]
+    for t in range(dW.shape[1]):
+        S.append(process.step((first_step + t) * dt, S[-1], dt, dW[:, t]))
+    return torch.stack(S, dim=1)
+
+def simulate_multi_factor(process, S0, dt, num_steps, num_paths, random_source=None, precision=None,
+                          memory_budget=None):
+    """
+    Simulates a multi-factor process (e.g. CorrelatedLogNormalProcess) on a uniform grid.
+    Independent draws of all factors are correlated in one matrix product with the
+    process' Cholesky factor, then all factors are built in one vectorized pass
+    (or stepped with `process.step` when the process has no vectorized construction).
+
+    Args:
+        process: A process with `num_factors` and `cholesky` attributes.
+        S0: Initial values (shape: [num_factors]).
+        dt: Time step (float or tensor).
+        num_steps: Number of time steps.
+        num_paths: Number of simulated paths.
+        random_source: A RandomSource. Defaults to `torch.randn`.
+        precision: Precision policy of the paths (see Engine.precision).
+        memory_budget: Optional autograd memory budget in bytes. When set, the time loop of a
+                       stepped process is split into checkpointed segments (see `checkpointed_paths`);
+                       vectorized constructions only save path-sized tensors and ignore it.
+
+    Returns:
+        torch.Tensor: Simulated paths (shape: [num_paths, num_steps + 1, num_factors]).
+    """
+    dtype = get_precision(precision).path_dtype
+    random_source = random_source if random_source is not None else PseudoRandomSource()
+    Z = random_source.factor_increments(num_paths, num_steps, process.num_factors, dtype=dtype)
+
+    if memory_budget is not None and not process.supports_vectorized_simulation:
+        def segment(S_start, Z_segment, first_step):
+            dW = Z_segment @ process.cholesky.to(dtype).T * dt**0.5
+            return _multi_factor_paths(process, S_start, dt, dW, first_step)[:, 1:]
+
+        S0 = torch.as_tensor(S0, dtype=dtype).expand(num_paths, process.num_factors)
+        return checkpointed_paths(segment, S0, Z, segment_steps(memory_budget, num_paths, process.num_factors, dtype))
+
+    dW = Z @ process.cholesky.to(dtype).T * dt**0.5
+    return _multi_factor_paths(process, S0, dt, dW)
+
+def simulate_dates(process, S0, dates, num_paths, random_source=None, precision=None, max_dt=None):
+    """
+    Simulates a process directly on arbitrary dates, e.g. exercise or exposure
+    dates, keeping only the values on those dates. Processes with an exact
+    transition law (`supports_exact_transition`) and vectorized multi-factor GBMs
+    (e.g. CorrelatedLogNormalProcess) jump from date to date, with one normal per
+    path, date and factor whatever the distance between dates; other processes are
+    stepped with `process.step` on sub-steps of at most `max_dt` between dates.
+
+    Args:
+        process: An instance of a subclass of StochasticProcess.
+        S0: Initial value at time 0 (scalar or tensor, shape [num_factors] for multi-factor processes).
+            Single-factor processes also take a leading scenario batch shape on S0 and their parameters.
+        dates: Increasing dates after time 0 (floats or scalar tensors, e.g. a maturity tracked for theta).
+        num_paths: Number of simulated paths.
+        random_source: A RandomSource. Defaults to `torch.randn`.
+        precision: Precision policy of the paths (see Engine.precision).
+        max_dt: Longest sub-step of the processes simulated by stepping.
+
+    Returns:
+        torch.Tensor: Simulated values (shape: [*batch, num_paths, len(dates) + 1], or
+                      [num_paths, len(dates) + 1, num_factors]), first column is S0.
+    """
+    dtype = get_precision(precision).path_dtype
+    random_source = random_source if random_source is not None else PseudoRandomSource()
+    num_factors = getattr(process, 'num_factors', 1)
+    gaps = [date - previous for previous, date in zip([0.0] + list(dates[:-1]), dates)]
+
+    if num_factors == 1 and process.supports_exact_transition:
+        Z = random_source.normals(num_paths, len(dates), dtype=dtype)
+        S = [_initial_states(S0, num_paths, dtype)]
+        for j, gap in enumerate(gaps):
+            S.append(process.transition(S[-1], gap, Z[:, j]))
+        return torch.stack(torch.broadcast_tensors(*S), dim=-1)
+
+    if hasattr(process, 'cholesky') and process.supports_vectorized_simulation:
+        # GBM log-increments are exact over any gap: a vectorized pass with one dt per date
+        Z = random_source.normals(num_paths, len(dates) * num_factors, dtype=dtype).reshape(num_paths, len(dates), num_factors)
+        dt = torch.stack([torch.as_tensor(gap, dtype=dtype) for gap in gaps]).unsqueeze(-1)
+        return _multi_factor_paths(process, S0, dt, Z @ process.cholesky.to(dtype).T * dt**0.5)
+
+    if max_dt is None:
+        raise ValueError("Simulation on arbitrary dates needs an exact transition or a max_dt for sub-stepping.")
+    substeps = [max(1, int(-(-float(gap) // max_dt))) for gap in gaps]
+    Z = random_source.normals(num_paths, sum(substeps) * num_factors, dtype=dtype)
+    Z = Z.reshape(num_paths, sum(substeps), num_factors) if num_factors > 1 else Z
+    cholesky = process.cholesky.to(dtype).T if num_factors > 1 else None
+
+    S = [torch.as_tensor(S0, dtype=dtype).expand(num_paths, num_factors) if num_factors > 1
+         else _initial_states(S0, num_paths, dtype)]
+    X, t, k = S[0], 0.0, 0
+    for gap, n in zip(gaps, substeps):
+        dt = gap / n
+        for _ in range(n):
+            dW = (Z[:, k] @ cholesky if num_factors > 1 else Z[:, k]) * dt**0.5
+            X = process.step(t, X, dt, dW)
+            t, k = t + dt, k + 1
+        S.append(X)
+    return torch.stack(S, dim=1) if num_factors > 1 else torch.stack(torch.broadcast_tensors(*S), dim=-1)
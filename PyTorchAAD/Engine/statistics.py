@@ -0,0 +1,122 @@
+import math
+import torch
+
+def _check_one_scenario(samples):
+    # Samples of a scenario batch ([*batch, num_paths]) pooled together would give one
+    # meaningless estimate: the aggregators take the samples of one scenario at a time
+    if samples.dim() > 1:
+        raise ValueError(f"Expected a one-dimensional block of samples of one scenario, got shape {tuple(samples.shape)}.")
+
+class RunningStatistics:
+    def __init__(self):
+        """
+        Online mean/variance aggregator (Welford, batched with Chan's update).
+        Samples are folded in block by block so memory does not depend on the
+        total number of samples. Accumulation is carried out in float64.
+        """
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.total = 0.0
+
+    def update(self, samples: torch.Tensor):
+        """
+        Folds a block of samples into the running statistics.
+
+        Args:
+            samples (torch.Tensor): One-dimensional block of samples.
+        """
+        _check_one_scenario(samples)
+        samples = samples.detach().reshape(-1).to(torch.float64)
+        n = samples.numel()
+        if n == 0:
+            return
+        block_mean = samples.mean().item()
+        block_m2 = ((samples - block_mean) ** 2).sum().item()
+        self._merge(n, block_mean, block_m2, samples.sum().item())
+
+    def merge(self, other: "RunningStatistics"):
+        """
+        Merges the statistics gathered by another aggregator into this one.
+
+        Args:
+            other (RunningStatistics): Aggregator to merge.
+        """
+        if other.count > 0:
+            self._merge(other.count, other.mean, other.m2, other.total)
+
+    def _merge(self, n, mean, m2, total):
+        count = self.count + n
+        delta = mean - self.mean
+        self.mean += delta * n / count
+        self.m2 += m2 + delta**2 * self.count * n / count
+        self.total += total
+        self.count = count
+
+    @property
+    def variance(self):
+        """Unbiased sample variance."""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std_error(self):
+        """Standard error of the mean."""
+        return math.sqrt(self.variance / self.count) if self.count > 0 else 0.0
+
+class ControlVariateStatistics:
+    def __init__(self):
+        """
+        Online aggregator of (value, control) pairs for the control-variate estimator
+        mean(Y) - beta * (mean(C) - E[C]). The optimal beta = Cov(Y, C) / Var(C) is
+        re-estimated from the running co-moments as blocks are folded in.
+        """
+        self.values = RunningStatistics()
+        self.controls = RunningStatistics()
+        self.c2 = 0.0  # Sum of cross deviations (Y - mean Y)(C - mean C)
+
+    def update(self, values: torch.Tensor, controls: torch.Tensor):
+        """
+        Folds a block of samples into the running statistics.
+
+        Args:
+            values (torch.Tensor): One-dimensional block of samples Y.
+            controls (torch.Tensor): Control samples C on the same paths.
+        """
+        _check_one_scenario(values)
+        _check_one_scenario(controls)
+        values = values.detach().reshape(-1).to(torch.float64)
+        controls = controls.detach().reshape(-1).to(torch.float64)
+        n = values.numel()
+        if n == 0:
+            return
+        delta_y = values.mean().item() - self.values.mean
+        delta_c = controls.mean().item() - self.controls.mean
+        block_c2 = ((values - values.mean()) * (controls - controls.mean())).sum().item()
+        self.c2 += block_c2 + delta_y * delta_c * self.values.count * n / (self.values.count + n)
+        self.values.update(values)
+        self.controls.update(controls)
+
+    @property
+    def count(self):
+        return self.values.count
+
+    @property
+    def beta(self):
+        """Optimal control coefficient Cov(Y, C) / Var(C)."""
+        return self.c2 / self.controls.m2 if self.controls.m2 > 0 else 0.0
+
+    def mean(self, expectation):
+        """Control-variate estimate of E[Y], given the known expectation of the control."""
+        return self.values.mean - self.beta * (self.controls.mean - expectation)
+
+    @property
+    def variance(self):
+        """Sample variance of the controlled samples Y - beta * C."""
+        if self.count < 2:
+            return 0.0
+        return max(self.values.m2 - self.beta * self.c2, 0.0) / (self.count - 1)
+
+    @property
+    def std_error(self):
+        """Standard error of the control-variate estimate."""
+        return math.sqrt(self.variance / self.count) if self.count > 0 else 0.0
@@ -1,6 +1,14 @@
 import torch
+from Engine.precision import common_dtype
 
 class StochasticProcess:
+    # Processes whose log (or arithmetic) increments are i.i.d. across steps can
+    # build the whole path matrix in one pass through `simulate_paths`.
+    supports_vectorized_simulation = False
+    # Processes with a closed-form transition law can jump directly between
+    # arbitrary dates through `transition`.
+    supports_exact_transition = False
+
     def __init__(self, mu: float, sigma: float, device="cpu"):
         """
         Base class for stochastic processes.
@@ -28,7 +36,86 @@ class StochasticProcess:
         """
         raise NotImplementedError("The evolve method must be implemented in a subclass.")
 
+    def step(self, t, S: torch.Tensor, dt, dW: torch.Tensor) -> torch.Tensor:
+        """
+        Stepping protocol used by the simulation engines: advances the state from
+        time `t` to `t + dt`. Defaults to the time-homogeneous `evolve(S, dt, dW)`;
+        time-dependent processes override it. Single-factor processes (except the exact CIR
+        scheme) also step a scenario batch: S of shape [*batch, num_paths], with parameters of
+        shape [*batch] (see `broadcast_scenarios`) and increments dW [num_paths] shared by all scenarios.
+
+        Args:
+            t: Current time.
+            S (torch.Tensor): Current value of the process.
+            dt: Time step.
+            dW (torch.Tensor): Brownian motion increment.
+
+        Returns:
+            torch.Tensor: Value of the process at `t + dt`.
+        """
+        return self.evolve(S, dt, dW)
+
+    def simulate_paths(self, S0, dt, dW: torch.Tensor) -> torch.Tensor:
+        """
+        Builds all paths at once from the Brownian increments.
+        Only available when `supports_vectorized_simulation` is True.
+
+        Args:
+            S0: Initial value of the process (scalar or tensor).
+            dt: Time step.
+            dW (torch.Tensor): Brownian increments (shape: [num_paths, num_steps - 1]).
+
+        Returns:
+            torch.Tensor: Simulated paths (shape: [num_paths, num_steps]), first column is S0.
+        """
+        raise NotImplementedError("Vectorized simulation is not supported by this process.")
+
+    def step_derivatives(self, t, S: torch.Tensor, dt, dW: torch.Tensor):
+        """
+        Hand-coded derivatives of one `step`, used by the pathwise Greeks engine
+        (Engine.pathwise) instead of the autograd tape.
+
+        Args:
+            t: Current time.
+            S (torch.Tensor): Current value of the process.
+            dt: Time step.
+            dW (torch.Tensor): Brownian motion increment.
+
+        Returns:
+            tuple: The value at `t + dt`, its derivative w.r.t. S, and a dict mapping
+                   parameter names to its derivatives w.r.t. those parameters.
+        """
+        raise NotImplementedError("Pathwise step derivatives are not implemented for this process.")
+
+    def transition(self, S: torch.Tensor, dt, Z: torch.Tensor) -> torch.Tensor:
+        """
+        Samples the process `dt` ahead from its exact transition law.
+        Only available when `supports_exact_transition` is True.
+
+        Args:
+            S (torch.Tensor): Current value of the process.
+            dt: Time to jump ahead (any length, not only one grid step).
+            Z (torch.Tensor): Standard normal draws, one per path.
+
+        Returns:
+            torch.Tensor: Value of the process after `dt`.
+        """
+        raise NotImplementedError("Exact transitions are not supported by this process.")
+
+def broadcast_scenarios(x, num_dims):
+    """
+    Reshapes a scenario parameter with a leading batch shape (e.g. 10 volatilities)
+    so that it broadcasts against `num_dims` trailing path (and step) dimensions, and
+    all scenarios share the same draws. Scalars are returned unchanged.
+    """
+    if torch.is_tensor(x) and x.dim() > 0:
+        return x.reshape(x.shape + (1,) * num_dims)
+    return x
+
 class NormalProcess(StochasticProcess):
+    supports_vectorized_simulation = True
+    supports_exact_transition = True
+
     def evolve(self, S: torch.Tensor, dt: float, dW: torch.Tensor) -> torch.Tensor:
         """
         Evolves the process using Arithmetic Brownian Motion (ABM) dynamics.
@@ -41,9 +128,40 @@ class NormalProcess(StochasticProcess):
         Returns:
             torch.Tensor: Evolved process value.
         """
-        return S + self.mu * dt + self.sigma * dW
+        return S + broadcast_scenarios(self.mu, 1) * dt + broadcast_scenarios(self.sigma, 1) * dW
+
+    def simulate_paths(self, S0, dt, dW: torch.Tensor) -> torch.Tensor:
+        """
+        Builds ABM paths with a cumulative sum of the increments.
+
+        Args:
+            S0: Initial value of the process (scalar or tensor with a leading scenario batch shape).
+            dt: Time step.
+            dW (torch.Tensor): Brownian increments (shape: [num_paths, num_steps - 1]).
+
+        Returns:
+            torch.Tensor: Simulated paths (shape: [*batch, num_paths, num_steps]), where `batch` is
+                          the broadcast batch shape of S0, mu and sigma (empty for scalars).
+        """
+        mu, sigma = broadcast_scenarios(self.mu, 2), broadcast_scenarios(self.sigma, 2)
+        increments = torch.cumsum(mu * dt + sigma * dW, dim=-1)
+        increments = torch.cat([torch.zeros_like(increments[..., :1]), increments], dim=-1)
+        return broadcast_scenarios(S0, 2) + increments
+
+    def transition(self, S: torch.Tensor, dt, Z: torch.Tensor) -> torch.Tensor:
+        """
+        Exact ABM transition over an arbitrary horizon `dt`.
+        """
+        return S + broadcast_scenarios(self.mu, 1) * dt + broadcast_scenarios(self.sigma, 1) * dt**0.5 * Z
+
+    def step_derivatives(self, t, S: torch.Tensor, dt, dW: torch.Tensor):
+        S_next = self.evolve(S, dt, dW)
+        return S_next, torch.ones_like(S_next), {'mu': dt * torch.ones_like(S_next), 'sigma': dW}
 
 class LogNormalProcess(StochasticProcess):
+    supports_vectorized_simulation = True
+    supports_exact_transition = True
+
     def evolve(self, S: torch.Tensor, dt: float, dW: torch.Tensor, current_time: float) -> torch.Tensor:
         """
         Evolves the stochastic process using the given S, time step dt, and Brownian motion dW.
@@ -58,10 +176,145 @@ class LogNormalProcess(StochasticProcess):
         Returns:
             torch.Tensor: Evolved process value.
         """
+        mu, sigma = broadcast_scenarios(self.mu, 1), broadcast_scenarios(self.sigma, 1)
+        return S * torch.exp((mu - 0.5 * sigma**2) * dt + sigma * dW)
+
+    def step(self, t, S: torch.Tensor, dt, dW: torch.Tensor) -> torch.Tensor:
+        return self.evolve(S, dt, dW, t)
+
+    def simulate_paths(self, S0, dt, dW: torch.Tensor) -> torch.Tensor:
+        """
+        Builds exact GBM paths in one pass: cumulative sum of the log-increments
+        followed by a single exponential. Differentiable w.r.t. S0, mu, sigma and dt.
+
+        Args:
+            S0: Initial value of the process (scalar or tensor with a leading scenario batch shape).
+            dt: Time step.
+            dW (torch.Tensor): Brownian increments (shape: [num_paths, num_steps - 1]).
+
+        Returns:
+            torch.Tensor: Simulated paths (shape: [*batch, num_paths, num_steps]), where `batch` is
+                          the broadcast batch shape of S0, mu and sigma (empty for scalars).
+        """
+        mu, sigma = broadcast_scenarios(self.mu, 2), broadcast_scenarios(self.sigma, 2)
+        log_increments = (mu - 0.5 * sigma**2) * dt + sigma * dW
+        log_paths = torch.cumsum(log_increments, dim=-1)
+        log_paths = torch.cat([torch.zeros_like(log_paths[..., :1]), log_paths], dim=-1)
+        # Work in log-space so that S0 stays in the graph of dS/dS0 (higher-order Greeks)
+        log_S0 = torch.log(torch.as_tensor(S0, dtype=dW.dtype, device=dW.device))
+        return torch.exp(broadcast_scenarios(log_S0, 2) + log_paths)
+
+    def transition(self, S: torch.Tensor, dt, Z: torch.Tensor) -> torch.Tensor:
+        """
+        Exact GBM transition over an arbitrary horizon `dt`, computed in log-space.
+        """
+        mu, sigma = broadcast_scenarios(self.mu, 1), broadcast_scenarios(self.sigma, 1)
+        log_S = torch.log(torch.as_tensor(S, dtype=Z.dtype, device=Z.device))
+        return torch.exp(log_S + (mu - 0.5 * sigma**2) * dt + sigma * dt**0.5 * Z)
+
+    def step_derivatives(self, t, S: torch.Tensor, dt, dW: torch.Tensor):
+        growth = torch.exp((self.mu - 0.5 * self.sigma**2) * dt + self.sigma * dW)
+        S_next = S * growth
+        return S_next, growth, {'mu': S_next * dt, 'sigma': S_next * (dW - self.sigma * dt)}
+
+class CorrelatedLogNormalProcess(StochasticProcess):
+    supports_vectorized_simulation = True
+
+    def __init__(self, mu, sigmas, correlation=None, device="cpu"):
+        """
+        N correlated geometric Brownian motions sharing the drift `mu`.
+        The correlation matrix is factorised once (Cholesky, as CompFinance/choldc.h);
+        the engine correlates the independent draws with it.
+
+        Args:
+            mu: Drift coefficient (scalar).
+            sigmas: Volatilities of the assets (shape: [num_factors]).
+            correlation: Correlation matrix (shape: [num_factors, num_factors]), identity if None.
+            device (str): Device to perform computations ('cpu' or 'cuda').
+        """
+        # Numbers follow the dtype of the tensor arguments (see Engine.precision.common_dtype)
+        dtype = common_dtype(mu, sigmas, correlation)
+        sigmas = torch.as_tensor(sigmas, dtype=dtype)
+        super().__init__(mu, sigmas, device)
+        self.num_factors = sigmas.shape[0]
+        if correlation is None:
+            correlation = torch.eye(self.num_factors)
+        self.correlation = torch.as_tensor(correlation, dtype=dtype)
+        self.cholesky = torch.linalg.cholesky(self.correlation)
+
+    def evolve(self, S: torch.Tensor, dt: float, dW: torch.Tensor) -> torch.Tensor:
+        """
+        Evolves all assets over one step.
+
+        Args:
+            S (torch.Tensor): Current values (shape: [num_paths, num_factors]).
+            dt (float): Time step.
+            dW (torch.Tensor): Correlated Brownian increments (shape: [num_paths, num_factors]).
+
+        Returns:
+            torch.Tensor: Evolved values.
+        """
         return S * torch.exp((self.mu - 0.5 * self.sigma**2) * dt + self.sigma * dW)
 
+    def simulate_paths(self, S0, dt, dW: torch.Tensor) -> torch.Tensor:
+        """
+        Builds the paths of all assets in one pass, in log-space.
+
+        Args:
+            S0: Initial values (shape: [num_factors]).
+            dt: Time step.
+            dW (torch.Tensor): Correlated Brownian increments (shape: [num_paths, num_steps - 1, num_factors]).
+
+        Returns:
+            torch.Tensor: Simulated paths (shape: [num_paths, num_steps, num_factors]).
+        """
+        log_increments = (self.mu - 0.5 * self.sigma**2) * dt + self.sigma * dW
+        log_paths = torch.cumsum(log_increments, dim=1)
+        log_paths = torch.cat([torch.zeros_like(log_paths[:, :1]), log_paths], dim=1)
+        log_S0 = torch.log(torch.as_tensor(S0, dtype=dW.dtype, device=dW.device))
+        return torch.exp(log_S0 + log_paths)
+
+def _cir_transition(x, dt, Z, k, mu, nu, generator=None):
+    """
+    Exact CIR transition dx = k (mu - x) dt + nu sqrt(x) dW over an arbitrary horizon:
+    x(t + dt) = c * chi2'_d(lambda), a scaled noncentral chi-square with
+    c = nu^2 (1 - e^{-k dt}) / (4k), d = 4 k mu / nu^2 and lambda = x e^{-k dt} / c.
+
+    For d > 1 the noncentral chi-square is (Z + sqrt(lambda))^2 + chi2_{d-1}, with the
+    central part drawn from a reparameterised gamma: the sample is differentiable in
+    x, k, mu and nu. For d <= 1 it is a Poisson mixture of central chi-squares, and the
+    derivative in lambda is taken from the conditional mean, c (d + lambda).
+    """
+    dt = torch.as_tensor(dt, dtype=Z.dtype)
+    e = torch.exp(-k * dt)
+    c = nu**2 * (1 - e) / (4 * k)
+    d = 4 * k * mu / nu**2
+    noncentrality = torch.clamp(x, min=0) * e / c
+
+    if d > 1:
+        chi2 = 2 * torch._standard_gamma((d - 1) / 2 + torch.zeros_like(Z), generator=generator)
+        return c * ((Z + torch.sqrt(noncentrality))**2 + chi2)
+
+    N = torch.poisson(noncentrality.detach().expand_as(Z) / 2, generator=generator)
+    chi2 = 2 * torch._standard_gamma(d / 2 + N, generator=generator)
+    return c * (chi2 + noncentrality - noncentrality.detach())
+
+def _cir_euler_derivatives(S, dt, dW, k, mu, nu):
+    # Derivatives of the Euler step S + k (mu - S) dt + nu sqrt(S) sqrt(dt) dW
+    root_S = torch.sqrt(S)
+    diffusion = root_S * dt**0.5 * dW
+    S_next = S + k * (mu - S) * dt + nu * diffusion
+    dS = 1 - k * dt + 0.5 * nu * dt**0.5 * dW / root_S
+    return S_next, dS, {'mu': k * dt * torch.ones_like(S_next), 'k': (mu - S) * dt, 'nu': diffusion}
+
 class IntensityProcess(StochasticProcess):
-    def __init__(self, mu: float, sigma: float, k: float, nu: float, device="cpu"):
+    @property
+    def supports_exact_transition(self):
+        # The CIR transition law is a scaled noncentral chi-square, used when the scheme is exact;
+        # an Euler process keeps the Euler law, also for terminal and date-to-date simulation
+        return self.scheme == "exact"
+
+    def __init__(self, mu: float, sigma: float, k: float, nu: float, device="cpu", scheme="euler", seed=None):
         """
         Mean-Reverting Stochastic Process.
         
@@ -71,10 +324,16 @@ class IntensityProcess(StochasticProcess):
             k (float): Speed of mean reversion.
             nu (float): Volatility scaling factor.
             device (str): Device to perform computations ('cpu' or 'cuda').
+            scheme (str): "euler" steps with `evolve`, "exact" with the noncentral chi-square `transition`.
+            seed: Seed of the generator of the chi-square draws of `transition` (global RNG if None).
         """
         super().__init__(mu, sigma, device)
+        if scheme not in ("euler", "exact"):
+            raise ValueError("Invalid scheme. Choose 'euler' or 'exact'.")
         self.k = k
         self.nu = nu
+        self.scheme = scheme
+        self.generator = torch.Generator().manual_seed(seed) if seed is not None else None
 
     def evolve(self, S: torch.Tensor, dt: float, dW: torch.Tensor) -> torch.Tensor:
         """
@@ -88,12 +347,35 @@ class IntensityProcess(StochasticProcess):
         Returns:
             torch.Tensor: Evolved process value.
         """
-        drift = self.k * (self.mu - S) * dt
-        diffusion = self.nu * torch.sqrt(S) * torch.sqrt(dt) * dW
+        k, mu, nu = (broadcast_scenarios(x, 1) for x in (self.k, self.mu, self.nu))
+        drift = k * (mu - S) * dt
+        diffusion = nu * torch.sqrt(S) * dt**0.5 * dW
         return S + drift + diffusion
 
+    def step(self, t, S: torch.Tensor, dt, dW: torch.Tensor) -> torch.Tensor:
+        if self.scheme == "exact":
+            return self.transition(S, dt, dW / dt**0.5)
+        return self.evolve(S, dt, dW)
+
+    def transition(self, S: torch.Tensor, dt, Z: torch.Tensor) -> torch.Tensor:
+        """
+        Exact CIR transition over an arbitrary horizon `dt` (always nonnegative).
+        """
+        return _cir_transition(S, dt, Z, self.k, self.mu, self.nu, self.generator)
+
+    def step_derivatives(self, t, S: torch.Tensor, dt, dW: torch.Tensor):
+        if self.scheme != "euler":
+            raise NotImplementedError("Pathwise step derivatives are only hand-coded for the Euler scheme.")
+        return _cir_euler_derivatives(S, dt, dW, self.k, self.mu, self.nu)
+
 class CIRPlusPlusProcess(StochasticProcess):
-    def __init__(self, mu: float, sigma: float, k: float, theta: float, nu: float, phi, device="cpu"):
+    @property
+    def supports_exact_transition(self):
+        # Exact transitions of the CIR part only with the exact scheme (see IntensityProcess)
+        return self.scheme == "exact"
+
+    def __init__(self, mu: float, sigma: float, k: float, theta: float, nu: float, phi, device="cpu",
+                 scheme="euler", seed=None):
         """
         Cox-Ingersoll-Ross (CIR++) Stochastic Process.
         
@@ -105,12 +387,18 @@ class CIRPlusPlusProcess(StochasticProcess):
             nu (float): Volatility scaling factor.
             phi (callable): Deterministic shift function.
             device (str): Device to perform computations ('cpu' or 'cuda').
+            scheme (str): "euler" steps with `evolve`, "exact" with the noncentral chi-square `transition`.
+            seed: Seed of the generator of the chi-square draws of `transition` (global RNG if None).
         """
         super().__init__(mu, sigma, device)
+        if scheme not in ("euler", "exact"):
+            raise ValueError("Invalid scheme. Choose 'euler' or 'exact'.")
         self.k = k
         self.theta = theta
         self.nu = nu
         self.phi = phi
+        self.scheme = scheme
+        self.generator = torch.Generator().manual_seed(seed) if seed is not None else None
 
     def evolve(self, S: torch.Tensor, dt: float, dW: torch.Tensor, t: float) -> torch.Tensor:
         """
@@ -125,11 +413,29 @@ class CIRPlusPlusProcess(StochasticProcess):
         Returns:
             torch.Tensor: Evolved process value.
         """
-        drift = self.k * (self.mu - S) * dt
-        diffusion = self.nu * torch.sqrt(S) * torch.sqrt(dt) * dW
+        k, mu, nu = (broadcast_scenarios(x, 1) for x in (self.k, self.mu, self.nu))
+        drift = k * (mu - S) * dt
+        diffusion = nu * torch.sqrt(S) * dt**0.5 * dW
         shift = self.theta * dt + self.phi(t) * dt
         return S + drift + diffusion #+ shift
 
+    def step(self, t, S: torch.Tensor, dt, dW: torch.Tensor) -> torch.Tensor:
+        if self.scheme == "exact":
+            return self.transition(S, dt, dW / dt**0.5)
+        return self.evolve(S, dt, dW, t)
+
+    def transition(self, S: torch.Tensor, dt, Z: torch.Tensor) -> torch.Tensor:
+        """
+        Exact transition of the CIR part over an arbitrary horizon `dt`; like `evolve`,
+        the deterministic shift is left to the caller.
+        """
+        return _cir_transition(S, dt, Z, self.k, self.mu, self.nu, self.generator)
+
+    def step_derivatives(self, t, S: torch.Tensor, dt, dW: torch.Tensor):
+        if self.scheme != "euler":
+            raise NotImplementedError("Pathwise step derivatives are only hand-coded for the Euler scheme.")
+        return _cir_euler_derivatives(S, dt, dW, self.k, self.mu, self.nu)
+
 
 # def simulate_cir_plus_plus(T, n_simulations, n_steps, k, mu, nu, x0, theta, phi):
 #     dt = T / n_steps
@@ -0,0 +1,167 @@
+import math
+import torch
+from Engine.random_sources import RandomSource
+from Engine.statistics import RunningStatistics, ControlVariateStatistics
+from Engine.precision import get_precision
+
+class AntitheticSource(RandomSource):
+    def __init__(self, source):
+        """
+        Antithetic pairing: each draw of the wrapped source is used twice, as Z and -Z.
+        Paths 2k and 2k + 1 form a pair, so the number of paths (and the first path
+        of a skip-ahead) must be even.
+
+        Args:
+            source (RandomSource): Source of the underlying draws.
+        """
+        self.source = source
+        self.group_size = 2 * source.group_size
+
+    def _pair(self, Z):
+        return torch.stack([Z, -Z], dim=1).reshape(-1, *Z.shape[1:])
+
+    def _half(self, num_paths):
+        if num_paths % 2 != 0:
+            raise ValueError("Antithetic sampling needs an even number of paths.")
+        return num_paths // 2
+
+    def normals(self, num_paths, num_dims, dtype=torch.float32):
+        return self._pair(self.source.normals(self._half(num_paths), num_dims, dtype))
+
+    def brownian_increments(self, num_paths, num_steps, dtype=torch.float32):
+        # The Brownian bridge is linear, so negating its output negates its input
+        return self._pair(self.source.brownian_increments(self._half(num_paths), num_steps, dtype))
+
+    def factor_increments(self, num_paths, num_steps, num_factors, dtype=torch.float32):
+        return self._pair(self.source.factor_increments(self._half(num_paths), num_steps, num_factors, dtype))
+
+    def reset(self):
+        self.source.reset()
+
+    def skip_to(self, path_index):
+        self.source.skip_to(self._half(path_index))
+
+class MomentMatchingSource(RandomSource):
+    def __init__(self, source):
+        """
+        Moment matching: every block of draws is shifted and scaled column by column
+        so that its sample mean is exactly 0 and its sample variance exactly 1.
+        Paths of a block are no longer independent, which the single-run variance
+        estimates ignore: the reported variance reduction is a lower bound.
+
+        Args:
+            source (RandomSource): Source of the underlying draws.
+        """
+        self.source = source
+        self.group_size = source.group_size
+
+    def _match(self, Z):
+        if Z.shape[0] < 2:
+            return Z
+        return (Z - Z.mean(dim=0)) / Z.std(dim=0)
+
+    def normals(self, num_paths, num_dims, dtype=torch.float32):
+        return self._match(self.source.normals(num_paths, num_dims, dtype))
+
+    def brownian_increments(self, num_paths, num_steps, dtype=torch.float32):
+        return self._match(self.source.brownian_increments(num_paths, num_steps, dtype))
+
+    def factor_increments(self, num_paths, num_steps, num_factors, dtype=torch.float32):
+        return self._match(self.source.factor_increments(num_paths, num_steps, num_factors, dtype))
+
+    def reset(self):
+        self.source.reset()
+
+    def skip_to(self, path_index):
+        self.source.skip_to(path_index)
+
+def with_variance_reduction(source, antithetic=False, moment_matching=False):
+    """
+    Wraps a random source with the requested variance-reduction layers.
+
+    Args:
+        source (RandomSource): Source of the underlying draws.
+        antithetic (bool): Pair each draw with its negative.
+        moment_matching (bool): Match the first two sample moments of every block.
+
+    Returns:
+        RandomSource: The wrapped source.
+    """
+    if antithetic:
+        source = AntitheticSource(source)
+    if moment_matching:
+        source = MomentMatchingSource(source)
+    return source
+
+def group_means(samples: torch.Tensor, group_size: int) -> torch.Tensor:
+    """Averages consecutive groups of paths (e.g. antithetic pairs) into independent samples."""
+    return samples.reshape(-1, group_size).mean(dim=1) if group_size > 1 else samples
+
+def variance_reduction_factor(plain: RunningStatistics, std_error: float) -> float:
+    """
+    Ratio of the variance of the plain Monte Carlo estimator on the same number of
+    paths, Var(Y) / n, to the variance achieved, std_error ** 2.
+    """
+    plain_variance = plain.variance / plain.count if plain.count > 0 else 0.0
+    return plain_variance / std_error**2 if std_error > 0 else math.inf
+
+def monte_carlo_estimate(values, controls=None, expectation=None, group_size=1, precision=None):
+    """
+    Monte Carlo estimate of E[Y] from per-path samples, with an optional control
+    variate whose optimal beta is estimated on the same paths. The returned price
+    stays differentiable (beta is held constant), so AAD Greeks of the controlled
+    estimator follow from `price.backward()`.
+
+    With a scenario batch, values of shape [*batch, num_paths], each scenario gets its
+    own estimate and every entry of the result has the batch shape.
+
+    Args:
+        values (torch.Tensor): Discounted values Y of each path (shape: [num_paths]).
+        controls (torch.Tensor): Control samples C on the same paths (shape: [num_paths]).
+        expectation: Known expectation E[C] (float or tensor, e.g. a closed-form price).
+        group_size (int): Number of consecutive paths forming one independent sample
+                          (`random_source.group_size`, 2 for antithetic pairs).
+        precision: Precision policy; the means are taken in its accumulator dtype.
+
+    Returns:
+        dict: price (tensor), std_error, variance, beta and variance_reduction_factor.
+    """
+    precision = get_precision(precision)
+    if values.dim() > 1:
+        return _scenario_estimates(values, controls, expectation, group_size, precision)
+
+    plain = RunningStatistics()
+    plain.update(values)
+
+    if controls is None:
+        grouped = RunningStatistics()
+        grouped.update(group_means(values, group_size))
+        price, beta = precision.mean(values), 0.0
+    else:
+        grouped = ControlVariateStatistics()
+        grouped.update(group_means(values, group_size), group_means(controls, group_size))
+        beta = grouped.beta
+        price = precision.mean(values) - beta * (precision.mean(controls) - expectation)
+
+    return {
+        'price': price,
+        'std_error': grouped.std_error,
+        'variance': plain.variance,
+        'beta': beta,
+        'variance_reduction_factor': variance_reduction_factor(plain, grouped.std_error)
+    }
+
+def _scenario_estimates(values, controls, expectation, group_size, precision):
+    # One estimate per scenario of the leading batch shape, stacked back into that shape
+    batch = values.shape[:-1]
+    values = values.reshape(-1, values.shape[-1])
+    if controls is not None:
+        controls = controls.expand(*batch, values.shape[-1]).reshape(values.shape)
+        expectation = torch.as_tensor(expectation).expand(batch).reshape(-1)
+    estimates = [monte_carlo_estimate(values[i], None if controls is None else controls[i],
+                                      None if controls is None else expectation[i], group_size, precision)
+                 for i in range(values.shape[0])]
+    result = {'price': torch.stack([estimate['price'] for estimate in estimates]).reshape(batch)}
+    for name in ('std_error', 'variance', 'beta', 'variance_reduction_factor'):
+        result[name] = torch.tensor([estimate[name] for estimate in estimates], dtype=torch.float64).reshape(batch)
+    return result
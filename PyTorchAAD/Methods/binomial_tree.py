@@ -1,10 +1,13 @@
 import torch
 from Methods.base import PricingMethod
+from Engine.precision import get_precision
 
 class BinomialTreeMethod(PricingMethod):
-    def __init__(self, num_steps, exercise_times=None):
+    def __init__(self, num_steps, exercise_times=None, precision=None):
         self.num_steps = num_steps
         self.exercise_times = exercise_times if exercise_times is not None else []
+        # The roll-back is an accumulation: it runs in precision.accumulator_dtype
+        self.precision = get_precision(precision)
 
     def price(self, instrument, S0=None, T=None, r=None, sigma=None):
         S0 = S0 if S0 is not None else instrument.S0
@@ -12,28 +15,33 @@ class BinomialTreeMethod(PricingMethod):
         T = T if T is not None else instrument.maturity
         r = r if r is not None else instrument.rate
         sigma = sigma if sigma is not None else instrument.volatility
-        dt = T / torch.tensor(self.num_steps, dtype=torch.float32)  # Ensure dt is a tensor        
+        dtype = self.precision.accumulator_dtype
+        # S0, r and sigma may carry a leading scenario batch shape: the node axis is the last one
+        S0, r, sigma = (torch.as_tensor(x, dtype=dtype).unsqueeze(-1) for x in (S0, r, sigma))
+        dt = T / torch.tensor(self.num_steps, dtype=dtype)  # Ensure dt is a tensor        
         u = torch.exp(sigma * torch.sqrt(dt))
         d = 1 / u
         q = (torch.exp(r * dt) - d) / (u - d)
 
         # Initialize asset prices at maturity
-        asset_prices = S0 * d**torch.arange(self.num_steps, -1, -1) * u**torch.arange(0, self.num_steps + 1)
+        asset_prices = S0 * d**torch.arange(self.num_steps, -1, -1, dtype=dtype) * u**torch.arange(0, self.num_steps + 1, dtype=dtype)
         option_values = torch.maximum(torch.zeros_like(asset_prices), K - asset_prices)
 
         # Step back through the tree
         for step in range(self.num_steps - 1, -1, -1):
-            option_values = torch.exp(-r * dt) * (q * option_values[1:] + (1 - q) * option_values[:-1])
+            option_values = torch.exp(-r * dt) * (q * option_values[..., 1:] + (1 - q) * option_values[..., :-1])
             if (step + 1) * dt.item() in self.exercise_times:
-                option_values = torch.maximum(option_values, K - asset_prices[:step + 1])
+                option_values = torch.maximum(option_values, K - asset_prices[..., :step + 1])
 
-        return option_values[0]
+        return option_values[..., 0]
 
     def calculate_greeks(self, instrument):
-        S0 = torch.tensor(instrument.S0, dtype=torch.float32, requires_grad=True)
-        T = torch.tensor(instrument.maturity, dtype=torch.float32, requires_grad=True)
-        r = torch.tensor(instrument.rate, dtype=torch.float32, requires_grad=True)
-        sigma = torch.tensor(instrument.volatility, dtype=torch.float32, requires_grad=True)
+        # Leaves in the dtype of the roll-back
+        dtype = self.precision.accumulator_dtype
+        S0 = torch.tensor(instrument.S0, dtype=dtype, requires_grad=True)
+        T = torch.tensor(instrument.maturity, dtype=dtype, requires_grad=True)
+        r = torch.tensor(instrument.rate, dtype=dtype, requires_grad=True)
+        sigma = torch.tensor(instrument.volatility, dtype=dtype, requires_grad=True)
 
         price = self.price(instrument, S0=S0, T=T, r=r, sigma=sigma)
         price.backward()
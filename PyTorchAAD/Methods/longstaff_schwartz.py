@@ -1,25 +1,78 @@
+import math
 import torch
 from .base import PricingMethod
-from Engine.stochastic_process import IntensityProcess
+from Engine.stochastic_process import IntensityProcess, LogNormalProcess, broadcast_scenarios
+from Engine.random_sources import PseudoRandomSource
+from Engine.variance_reduction import monte_carlo_estimate
+from Engine.precision import get_precision
+from Engine.simulator import checkpointed_paths, segment_steps, simulate_dates
+from Engine.regression import RegressionWorkspace, masked_regression
+from Engine.basis import HermiteBasis, get_basis
+from Models.black_scholes import black_scholes_price
+from Models.survival import survival_probability
 
 # Function to compute Hermite polynomial basis functions up to order 2 (3 basis functions: H0, H1, H2)
 def hermite_basis(X, order=2):
     """
     Compute the Hermite polynomial basis functions up to a given order.
     """
-    H = [torch.ones_like(X), 2 * X]  # H_0(x) = 1, H_1(x) = 2x
+    return HermiteBasis(order).features(X)  # Raw, unnormalised X
 
-    for n in range(2, order + 1):
-        Hn = 2 * X * H[n - 1] - 2 * (n - 1) * H[n - 2]  # Recurrence relation
-        H.append(Hn)
+def exercise_schedule(exercise_dates, T):
+    """Exercise dates strictly between 0 and the maturity `T`, which is always the last date."""
+    return [date for date in exercise_dates if 0.0 < date < float(torch.as_tensor(T).detach())]
+
+class ExerciseStrategy:
+    def __init__(self, coefficients, exercise_times, normalisations=None, basis=None):
+        """
+        Frozen Longstaff-Schwartz exercise rule: the coefficients of the continuation
+        value, regressed on a basis (Engine.basis) of the normalised state, on each exercise
+        date. Fitted once (`LongstaffSchwartzMethod.fit_strategy`), it prices other path
+        sets, e.g. after intraday spot moves, and their AAD Greeks only differentiate the
+        payoffs along the frozen rule: no regression is recorded on the tape.
+
+        Args:
+            coefficients (list): Regression coefficients of each exercise date, in date order.
+            exercise_times (list): Exercise times (floats) of the coefficients.
+            normalisations (list): Normalisation (center, scale) of the state on each date,
+                                   None for the raw state.
+            basis: Regression basis of the coefficients, defaults to the Hermite polynomials
+                   H0, H1, H2.
+        """
+        self.coefficients = [coeffs.detach() for coeffs in coefficients]
+        self.exercise_times = list(exercise_times)
+        self.normalisations = list(normalisations) if normalisations is not None else [None] * len(self.coefficients)
+        self.basis = get_basis(basis)
+
+    def continuation_value(self, X, date_index):
+        """Continuation value of the states X on an exercise date, one matrix-vector product (no tape)."""
+        with torch.no_grad():
+            A = self.basis.design_matrix(X, self.normalisations[date_index])
+            return (A @ self.coefficients[date_index].to(A.dtype).unsqueeze(-1)).squeeze(-1)
+
+    def check(self, exercise_times):
+        """Raises a ValueError unless the strategy was fitted on `exercise_times`."""
+        if len(exercise_times) != len(self.exercise_times) or any(
+                abs(float(a) - float(b)) > 1e-9 for a, b in zip(exercise_times, self.exercise_times)):
+            raise ValueError("The exercise strategy was fitted on other exercise dates.")
 
-    return torch.stack(H, dim=1)  # Stack as feature matrix
 class LongstaffSchwartzMethod(PricingMethod):
-    def __init__(self, num_paths=500000, num_steps=1000):
+    def __init__(self, num_paths=500000, num_steps=1000, random_source=None, precision=None, memory_budget=None,
+                 exercise_dates=None, basis=None):
         self.num_paths = num_paths
         self.num_steps = num_steps
+        self.random_source = random_source if random_source is not None else PseudoRandomSource()
+        # Paths in precision.path_dtype, regressions and cash flows in precision.accumulator_dtype
+        self.precision = get_precision(precision)
+        # Autograd memory budget (bytes) of the checkpointed path simulation, None to keep the whole graph
+        self.memory_budget = memory_budget
+        # Explicit exercise times before maturity. When set, the paths are simulated exactly from
+        # date to date and only stored on the dates (num_steps and M are then unused)
+        self.exercise_dates = exercise_dates
+        # Regression basis of the continuation values (Engine.basis), Hermite H0, H1, H2 by default
+        self.basis = get_basis(basis)
 
-    def price(self, S0, K, sigma, T, r, M=3, use_cir=False, cir_params=None):
+    def price(self, S0, K, sigma, T, r, M=3, use_cir=False, cir_params=None, control_variate=False, strategy=None):
         """
         Longstaff-Schwartz algorithm implemented in PyTorch.
 
@@ -32,86 +85,351 @@ class LongstaffSchwartzMethod(PricingMethod):
             M: Exercise frequency.
             use_cir: Whether to use the CIR intensity model.
             cir_params: Parameters for the CIR model (mu, k, nu).
+            control_variate: Use the European put as a control variate (see `estimate`).
+            strategy: Frozen ExerciseStrategy (see `fit_strategy`), None to regress on the priced paths.
 
         Returns:
             V: Option value.
         """
 
         print(f"Running Longstaff-Schwartz algorithm with {self.num_paths} paths, {self.num_steps} steps and M={M}")
-        Np = self.num_paths
+
+        if use_cir and cir_params:
+            mu, k, nu = cir_params
+            lambda_0 = 1.0
+            lambda_t = torch.tensor(lambda_0, requires_grad=True)
+            intensity_process = IntensityProcess(mu=mu, sigma=0.0, k=k, nu=nu)
+            # The intensity is independent of the asset (no wrong-way risk): closed-form survival
+            survival_probs = survival_probability(intensity_process, lambda_t, T)
+        else:
+            survival_probs = torch.tensor(1.0)
+
+        # Final option value
+        result = self.estimate(S0, K, sigma, T, r, M, control_variate, strategy)
+        V = result['price'] * survival_probs
+        if V.dim() == 0:
+            print(f"Option value: {V.item()} (variance reduction factor: {result['variance_reduction_factor']:.2f})")
+        else:
+            print(f"Option values of {V.numel()} scenarios (shape: {tuple(V.shape)})")
+        return V
+
+    def estimate(self, S0, K, sigma, T, r, M=3, control_variate=False, strategy=None):
+        """
+        Longstaff-Schwartz price with its Monte Carlo statistics. Antithetic or
+        moment-matched draws come from wrapping the random source
+        (Engine.variance_reduction.with_variance_reduction). S0, sigma and r may carry
+        a leading scenario batch shape (e.g. the bumps of a finite-difference ladder):
+        all scenarios run on the same draws, with one regression per scenario and date,
+        and every entry of the result has the batch shape.
+
+        Args:
+            S0: Initial asset price.
+            K: Strike price.
+            sigma: Volatility.
+            T: Time to maturity.
+            r: Risk-free rate.
+            M: Exercise frequency.
+            control_variate: Use the European put on the same paths, priced in closed form,
+                             as a control variate (optimal beta estimated on the paths).
+            strategy: Frozen ExerciseStrategy (see `fit_strategy`), None to regress on the priced paths.
+
+        Returns:
+            dict: price (differentiable tensor), std_error, variance, beta and variance_reduction_factor.
+        """
+        Sp = self.simulate_paths(S0, sigma, T, r)
+        values = self.cash_flows(Sp, K, T, r, M, strategy)
+
+        controls, expectation = None, None
+        if control_variate:
+            # The last grid point sits at (num_steps - 1) * dt, the last date of a schedule at T
+            horizon = T
+            if self.exercise_dates is None:
+                horizon = T / torch.tensor(self.num_steps, dtype=self.precision.path_dtype) * (self.num_steps - 1)
+            discount = torch.exp(torch.as_tensor(-broadcast_scenarios(r, 1) * horizon))
+            controls = discount * torch.maximum(K - Sp[..., -1], torch.tensor(0.0))
+            expectation = black_scholes_price(S0, K, horizon, r, sigma, option_type="put")
+
+        return monte_carlo_estimate(values, controls, expectation, self.random_source.group_size, self.precision)
+
+    def path_values(self, S0, K, sigma, T, r, M=3, start=None, num_paths=None, strategy=None):
+        """
+        Discounted Longstaff-Schwartz cash flows of the paths [start, start + num_paths).
+        The exercise regressions are run on these paths only, unless a frozen `strategy` is given.
+
+        Args:
+            S0: Initial asset price.
+            K: Strike price.
+            sigma: Volatility.
+            T: Time to maturity.
+            r: Risk-free rate.
+            M: Exercise frequency.
+            start: Index of the first path. When given, the random source skips ahead to it.
+            num_paths: Number of paths, defaults to `self.num_paths`.
+
+        Returns:
+            torch.Tensor: Discounted cash flow of each path (shape: [num_paths]).
+        """
+        Sp = self.simulate_paths(S0, sigma, T, r, start, num_paths)
+        return self.cash_flows(Sp, K, T, r, M, strategy)
+
+    def simulate_paths(self, S0, sigma, T, r, start=None, num_paths=None):
+        """
+        Simulates GBM paths on the grid of `num_steps` points, or with an exercise
+        schedule exactly on the exercise dates and the maturity only. S0, sigma and r
+        may carry a leading scenario batch shape, simulated on the same draws.
+
+        Returns:
+            torch.Tensor: Asset paths (shape: [*batch, num_paths, num_steps], or
+                          [*batch, num_paths, len(dates) + 2] from S0 to the maturity with a schedule).
+        """
+        Np = num_paths if num_paths is not None else self.num_paths
         NT = self.num_steps
-        dt = T / torch.tensor(NT, dtype=torch.float32)  # Ensure dt is a tensor
-        sqrt_dt = torch.sqrt(dt)
+        dtype = self.precision.path_dtype
 
         # Simulate paths
-        Z = torch.randn(Np, NT)
-        Sp = torch.zeros(Np, NT, dtype=torch.float32)
-        Sp[:, 0] = S0
+        if start is not None:
+            self.random_source.skip_to(start)
+        if self.exercise_dates is not None:
+            dates = exercise_schedule(self.exercise_dates, T) + [T]
+            return simulate_dates(LogNormalProcess(r, sigma), S0, dates, Np, self.random_source, self.precision)
+
+        batch = torch.broadcast_shapes(*(torch.as_tensor(x).shape for x in (S0, sigma, r)))
+        if batch and self.memory_budget is not None:
+            raise ValueError("The checkpointed simulation (memory_budget) prices one scenario at a time.")
+
+        dt = T / torch.tensor(NT, dtype=dtype)  # Ensure dt is a tensor
+        sqrt_dt = torch.sqrt(dt)
+        Z = self.random_source.brownian_increments(Np, NT - 1, dtype=dtype)
+
+        if self.memory_budget is not None:
+            def segment(S_start, Z_segment, first_step):
+                S = [S_start]
+                for t in range(Z_segment.shape[1]):
+                    S.append(S[-1] * torch.exp((r - 0.5 * sigma**2) * dt + sigma * sqrt_dt * Z_segment[:, t]))
+                return torch.stack(S[1:], dim=1)
+
+            S0 = torch.as_tensor(S0, dtype=dtype).expand(Np)
+            return checkpointed_paths(segment, S0, Z, segment_steps(self.memory_budget, Np, dtype=dtype))
+
+        Sp = torch.zeros(*batch, Np, NT, dtype=dtype)
+        Sp[..., 0] = broadcast_scenarios(S0, 1)
+        # Scenario parameters broadcast against the paths
+        r, sigma = broadcast_scenarios(r, 1), broadcast_scenarios(sigma, 1)
 
         for t in range(1, NT):
-            previous_step = Sp[:, t - 1].clone()  # Avoid modifying previous step
-            Sp[:, t] = previous_step * torch.exp((r - 0.5 * sigma**2) * dt + sigma * sqrt_dt * Z[:, t])
+            previous_step = Sp[..., t - 1].clone()  # Avoid modifying previous step
+            Sp[..., t] = previous_step * torch.exp((r - 0.5 * sigma**2) * dt + sigma * sqrt_dt * Z[:, t - 1])
 
-        if use_cir and cir_params:
-            mu, k, nu = cir_params
-            lambda_0 = 1.0
-            lambda_t = torch.tensor(lambda_0, requires_grad=True)
-            intensity_process = Process(mu=mu, sigma=0.0, k=k, nu=nu)
-            mc = MonteCarloMethod(intensity_process, lambda_t, T, Np, NT)
-            lambdas_paths = mc.simulate()
+        return Sp
+
+    def cash_flows(self, Sp, K, T, r, M=3, strategy=None):
+        """
+        Backward induction: discounted cash flow of each path under the regressed exercise rule,
+        or under the frozen rule of `strategy` (an ExerciseStrategy), without any regression.
 
-            dt_step = T / NT
-            integrated_intensity = torch.sum(lambdas_paths.T[:, :-1] * dt_step, dim=1)
-            survival_probs = torch.exp(-integrated_intensity).mean()
+        Returns:
+            torch.Tensor: Discounted cash flow of each path (shape: [*batch, num_paths]).
+        """
+        return self._backward_induction(Sp, K, T, r, M, strategy)[0]
+
+    def fit_strategy(self, S0, K, sigma, T, r, M=3, num_paths=None):
+        """
+        First pass of the two-pass Longstaff-Schwartz method: estimates the exercise
+        regressions on a path set of its own and freezes them. The draws come from the
+        engine's random source, whose stream moves on, so a following pricing pass runs
+        on independent paths (no foresight bias) and contains no regression.
+
+        Args:
+            S0: Initial asset price.
+            K: Strike price.
+            sigma: Volatility.
+            T: Time to maturity.
+            r: Risk-free rate.
+            M: Exercise frequency.
+            num_paths: Number of paths of the first pass, defaults to `self.num_paths`.
+
+        Returns:
+            ExerciseStrategy: The frozen exercise rule.
+        """
+        with torch.no_grad():
+            Sp = self.simulate_paths(S0, sigma, T, r, num_paths=num_paths)
+            return self._backward_induction(Sp, K, T, r, M)[1]
+
+    def _continuation_value(self, X, Y, in_the_money, strategy, date_index, coefficients, normalisations, workspace=None):
+        # Regressed on the paths, or read from a frozen strategy (no regression on the tape)
+        if strategy is not None:
+            return strategy.continuation_value(X, date_index)
+        # One regression per scenario of a batch (X of shape [*batch, num_paths])
+        normalisations[date_index] = self.basis.normalisation(X, in_the_money, dim=-1)
+        if workspace is None:
+            A = self.basis.design_matrix(X, normalisations[date_index])
         else:
-            survival_probs = torch.tensor(1.0)
+            A = workspace.design_matrix(self.basis, X, normalisations[date_index])
+        coefficients[date_index] = masked_regression(A, Y, in_the_money, workspace=workspace)
+        return (A @ coefficients[date_index].unsqueeze(-1)).squeeze(-1)
+
+    def _exercise(self, cash_flow, X, K, in_the_money, continuation_value, buffers=None):
+        # Cash flows after the exercise decision of a date. With `buffers` (price-only runs,
+        # no graph), the exercise value and decision are written into them and cash_flow is
+        # updated in its own storage
+        if buffers is None:
+            exercise_value = K - X
+            exercise = in_the_money & (exercise_value > continuation_value)
+            return torch.where(exercise, exercise_value, cash_flow)
+        exercise_value = torch.neg(X, out=buffers['exercise_value']).add_(K)
+        exercise = torch.gt(exercise_value, continuation_value, out=buffers['exercise']).logical_and_(in_the_money)
+        return torch.where(exercise, exercise_value, cash_flow, out=cash_flow)
+
+    def _induction_buffers(self, cash_flow, inplace):
+        # Buffers of the in-place backward induction, allocated once for all the dates
+        if not inplace:
+            return None
+        return {'in_the_money': torch.empty_like(cash_flow, dtype=torch.bool),
+                'exercise': torch.empty_like(cash_flow, dtype=torch.bool),
+                'exercise_value': torch.empty_like(cash_flow)}
+
+    def _backward_induction(self, Sp, K, T, r, M=3, strategy=None, first_point=0, inplace=False):
+        # Discounted cash flows and the exercise strategy (the given one or the regressed one).
+        # On the grid, column j of Sp holds grid point first_point + j (1 when S0 is not stored).
+        # With inplace (no graph recorded), the cash flows are discounted and updated in place
+        if self.exercise_dates is not None:
+            return self._schedule_backward_induction(Sp, K, T, r, strategy, inplace)
+
+        NT = self.num_steps
+        accumulate = self.precision.accumulate
+        dt = T / torch.tensor(NT, dtype=self.precision.accumulator_dtype)
 
         # Initialize cash flows
-        cash_flow = torch.maximum(K - Sp[:, -1], torch.tensor(0.0, dtype=torch.float32))
-        discount_factor = torch.exp(-r * dt)
+        cash_flow = accumulate(torch.maximum(K - Sp[..., -1], torch.tensor(0.0, dtype=Sp.dtype)))
+        r = broadcast_scenarios(r, 1)
 
-        # Backward induction
-        cash_flow = cash_flow.clone()  # Ensure no inplace modification
-        for t in range(NT - 2, 0, -M):  # Adjust the step to M
-            in_the_money = Sp[:, t] < K
-            itm_indices = torch.where(in_the_money)[0]
+        discounts = {}
 
-            if len(itm_indices) > 0:
-                X = Sp[itm_indices, t]
-                Y = cash_flow[itm_indices] * discount_factor.clone()
+        def discount(steps):
+            # Discount factor over `steps` grid steps, computed once per gap length
+            if steps not in discounts:
+                discounts[steps] = torch.exp(-r * dt * steps)
+            return discounts[steps]
 
-                # Regression to approximate continuation value
-                # A = torch.stack([torch.ones_like(X), X, X**2, X**3], dim=1)
-                # coeffs = torch.linalg.lstsq(A, Y).solution
-                # continuation_value = coeffs[0] + coeffs[1] * X + coeffs[2] * X**2 + coeffs[3] * X**3
+        # Exercise dates gathered once: the backward of one index scatters a single
+        # gradient buffer, where one column select per date would each fill a [num_paths, num_steps] one
+        dates = list(range(NT - 2, 0, -M))  # Adjust the step to M
+        columns = accumulate(Sp[..., [t - first_point for t in dates]]).unbind(dim=-1) if dates else ()
+        exercise_times = [t * float(torch.as_tensor(T).detach()) / NT for t in reversed(dates)]
+        if strategy is not None:
+            strategy.check(exercise_times)
+        coefficients, normalisations = [None] * len(dates), [None] * len(dates)
+        # Regression buffers reused from date to date when no graph is recorded
+        workspace = None if torch.is_grad_enabled() else RegressionWorkspace()
 
+        # Backward induction on all paths: the regression is weighted by the in-the-money
+        # mask instead of gathering the in-the-money paths, so every step has the same shapes.
+        # Cash flows are discounted over the gap to the previous date, the last grid point
+        # sitting at (NT - 1) * dt, as over the gaps of an exercise schedule
+        buffers = self._induction_buffers(cash_flow, inplace)
+        previous = NT - 1
+        for k, (t, X) in enumerate(zip(dates, columns)):
+            if inplace:
+                in_the_money = torch.lt(X, K, out=buffers['in_the_money'])
+                cash_flow.mul_(discount(previous - t))
+            else:
+                in_the_money = X < K
+                cash_flow = cash_flow * discount(previous - t)
 
-                # Compute Hermite polynomial basis for regression
-                A = hermite_basis(X, order=2)  # Using 3 basis functions (H0, H1, H2)
-                # Solve Least Squares Regression: A * coeffs ≈ Y
-                coeffs = torch.linalg.lstsq(A, Y).solution
-                # Compute continuation value using Hermite polynomials
-                continuation_value = coeffs[0] + coeffs[1] * (2 * X) + coeffs[2] * (4 * X**2 - 2)  # H0, H1, H2
+            continuation_value = self._continuation_value(X, cash_flow, in_the_money, strategy, len(dates) - 1 - k,
+                                                          coefficients, normalisations, workspace)
+            cash_flow = self._exercise(cash_flow, X, K, in_the_money, continuation_value, buffers)
+            previous = t
 
+        if strategy is None:
+            strategy = ExerciseStrategy(coefficients, exercise_times, normalisations, self.basis)
+        return (cash_flow.mul_(discount(previous)) if inplace else cash_flow * discount(previous)), strategy
 
-                exercise_value = K - X
+    def _schedule_backward_induction(self, Sp, K, T, r, strategy=None, inplace=False):
+        # Backward induction over the columns of exercise-date paths, discounting over each gap
+        accumulate = self.precision.accumulate
+        exercise_times = exercise_schedule(self.exercise_dates, T)
+        times = [0.0] + exercise_times + [T]
+        columns = accumulate(Sp[..., 1:-1]).unbind(dim=-1)
+        if strategy is not None:
+            strategy.check(exercise_times)
+        coefficients, normalisations = [None] * len(columns), [None] * len(columns)
+        workspace = None if torch.is_grad_enabled() else RegressionWorkspace()
+        r = broadcast_scenarios(r, 1)
 
-                exercise = exercise_value > continuation_value
-                exercise_indices = itm_indices[exercise]
+        cash_flow = accumulate(torch.maximum(K - Sp[..., -1], torch.tensor(0.0, dtype=Sp.dtype)))
+        buffers = self._induction_buffers(cash_flow, inplace)
 
-                cash_flow = cash_flow.clone()  # Avoid inplace modification
-                cash_flow[exercise_indices] = exercise_value[exercise]
+        def discount(i):
+            # Discount factor over the gap between times[i] and times[i + 1]
+            return torch.exp(torch.as_tensor(-r * (times[i + 1] - times[i]), dtype=cash_flow.dtype))
 
-            cash_flow = cash_flow * discount_factor.clone()  # Ensure no inplace modification
+        for i in range(len(columns), 0, -1):
+            X = columns[i - 1]
+            if inplace:
+                in_the_money = torch.lt(X, K, out=buffers['in_the_money'])
+                cash_flow.mul_(discount(i))
+            else:
+                in_the_money = X < K
+                cash_flow = cash_flow * discount(i)
 
-        # Final option value
-        V = cash_flow.mean() * torch.exp(-r * dt) * survival_probs
-        print(f"Option value: {V.item()}")
-        return V
+            continuation_value = self._continuation_value(X, cash_flow, in_the_money, strategy, i - 1,
+                                                          coefficients, normalisations, workspace)
+            cash_flow = self._exercise(cash_flow, X, K, in_the_money, continuation_value, buffers)
+
+        cash_flow = cash_flow.mul_(discount(0)) if inplace else cash_flow * discount(0)
+        if strategy is None:
+            strategy = ExerciseStrategy(coefficients, exercise_times, normalisations, self.basis)
+        return cash_flow, strategy
+
+    def price_only(self, S0, K, sigma, T, r, M=3):
+        """
+        Price-only Longstaff-Schwartz run under `torch.inference_mode()`: no autograd
+        graph is recorded. On the grid, paths are built in place in the buffer of the
+        normal draws, without the defensive clones that `price` needs for AAD. On the
+        grid, on an exercise schedule and for scenario batches, the backward induction
+        discounts and updates a single cash-flow buffer in place, with the exercise
+        masks and regression buffers allocated once for all the dates.
+
+        Args:
+            S0: Initial asset price.
+            K: Strike price.
+            sigma: Volatility.
+            T: Time to maturity.
+            r: Risk-free rate.
+            M: Exercise frequency.
 
-    def calculate_greeks(self, S0, K, sigma, T, r, M=12, use_cir=False, cir_params=None):
+        Returns:
+            float: Option value (a tensor of option values for a scenario batch of S0, sigma and r).
+        """
+        if any(torch.as_tensor(x).dim() > 0 for x in (S0, sigma, r)):
+            # A scenario batch, e.g. the bumped inputs of a finite-difference ladder, on common draws
+            with torch.inference_mode():
+                values = self._backward_induction(self.simulate_paths(S0, sigma, T, r), K, T, r, M, inplace=True)[0]
+                return self.precision.accumulate(values).mean(dim=-1)
+
+        S0, K, sigma, T, r = (float(x) for x in (S0, K, sigma, T, r))
+        NT = self.num_steps
+        dt = T / NT
+
+        if self.exercise_dates is not None:
+            # Paths on the exercise dates only are small: no in-place path construction needed
+            with torch.inference_mode():
+                values = self._backward_induction(self.simulate_paths(S0, sigma, T, r), K, T, r, inplace=True)[0]
+                return self.precision.mean(values).item()
+
+        with torch.inference_mode():
+            # S[:, t - 1] holds the asset at grid point t (the first point is S0)
+            S = self.random_source.brownian_increments(self.num_paths, NT - 1, dtype=self.precision.path_dtype)
+            S.mul_(sigma * dt**0.5).add_((r - 0.5 * sigma**2) * dt)
+            S.cumsum_(dim=1).add_(math.log(S0)).exp_()
+            return self.precision.mean(self._backward_induction(S, K, T, r, M, first_point=1, inplace=True)[0]).item()
+
+    def calculate_greeks(self, S0, K, sigma, T, r, M=12, use_cir=False, cir_params=None, strategy=None, two_pass=False):
         """
         Calculate sensitivities (Delta, Vega, Rho, Theta) using automatic differentiation.
+        With a frozen `strategy`, or `two_pass=True` to fit one first on independent paths,
+        the tape holds the payoffs along the exercise rule only, without regressions.
 
         Args:
             S0: Initial asset price.
@@ -122,19 +440,25 @@ class LongstaffSchwartzMethod(PricingMethod):
             M: Exercise frequency.
             use_cir: Whether to use the CIR intensity model.
             cir_params: Parameters for the CIR model (mu, k, nu).
+            strategy: Frozen ExerciseStrategy (see `fit_strategy`).
+            two_pass: Fit the exercise strategy on a first, independent path set.
 
         Returns:
             sensitivities: Dictionary containing Delta, Vega, Rho, Theta.
         """
-        S0_t = torch.tensor(S0, requires_grad=True, dtype=torch.float32)
-        sigma_t = torch.tensor(sigma, requires_grad=True, dtype=torch.float32)
-        r_t = torch.tensor(r, requires_grad=True, dtype=torch.float32)
-        T_t = torch.tensor(T, requires_grad=True, dtype=torch.float32)
+        if two_pass and strategy is None:
+            strategy = self.fit_strategy(S0, K, sigma, T, r, M)
+
+        dtype = self.precision.path_dtype
+        S0_t = torch.tensor(S0, requires_grad=True, dtype=dtype)
+        sigma_t = torch.tensor(sigma, requires_grad=True, dtype=dtype)
+        r_t = torch.tensor(r, requires_grad=True, dtype=dtype)
+        T_t = torch.tensor(T, requires_grad=True, dtype=dtype)
 
         # Enable anomaly detection
         with torch.autograd.set_detect_anomaly(True):
             # Compute option value
-            V = self.price(S0_t, K, sigma_t, T_t, r_t, M, use_cir, cir_params)
+            V = self.price(S0_t, K, sigma_t, T_t, r_t, M, use_cir, cir_params, strategy=strategy)
 
             # Compute gradients
             V.backward()
@@ -0,0 +1,256 @@
+import torch
+from Methods.base import PricingMethod
+from Engine.random_sources import PseudoRandomSource
+from Engine.precision import get_precision
+from Engine.stochastic_process import CorrelatedLogNormalProcess
+from Engine.simulator import simulate_dates
+from Engine.regression import RegressionWorkspace, normal_equations, solve_normal_equations
+from Engine.basis import TensorProductBasis, get_basis
+from Engine.variance_reduction import monte_carlo_estimate
+from Methods.longstaff_schwartz import ExerciseStrategy, exercise_schedule
+
+def _option_sign(option_type):
+    if option_type not in ('put', 'call'):
+        raise ValueError("option_type must be 'put' or 'call'")
+    return 1.0 if option_type == 'call' else -1.0
+
+def worst_of(K, option_type='put'):
+    """Payoff of an option on the lowest asset (the payoff of LongstaffSchwartzMethodBestOf2Assets)."""
+    sign = _option_sign(option_type)
+    return lambda S: torch.clamp(sign * (S.amin(dim=-1) - K), min=0.0)
+
+def best_of(K, option_type='call'):
+    """Payoff of an option on the highest asset."""
+    sign = _option_sign(option_type)
+    return lambda S: torch.clamp(sign * (S.amax(dim=-1) - K), min=0.0)
+
+def basket(K, weights, option_type='call'):
+    """Payoff of an option on the weighted sum of the assets."""
+    sign = _option_sign(option_type)
+    return lambda S: torch.clamp(sign * (S @ torch.as_tensor(weights, dtype=S.dtype) - K), min=0.0)
+
+def spread(K, option_type='call'):
+    """Payoff of an option on the spread S1 - S2 of the first two assets."""
+    sign = _option_sign(option_type)
+    return lambda S: torch.clamp(sign * (S[..., 0] - S[..., 1] - K), min=0.0)
+
+def _vector(x, dtype):
+    # Keeps tensors (and their graph) as they are, so Greeks flow to leaf parameters
+    return x if isinstance(x, torch.Tensor) else torch.stack([torch.as_tensor(v, dtype=dtype) for v in x])
+
+def _correlation(correlation, num_assets, dtype):
+    # None for independent assets, a float for a uniform correlation, or a full matrix
+    if correlation is None or isinstance(correlation, (int, float)):
+        rho = correlation or 0.0
+        identity = torch.eye(num_assets, dtype=dtype)
+        return identity + rho * (1 - identity)
+    return torch.as_tensor(correlation, dtype=dtype)
+
+class LongstaffSchwartzMethodMultiAsset(PricingMethod):
+    def __init__(self, num_paths=500000, num_steps=1000, random_source=None, precision=None, exercise_dates=None,
+                 basis=None, chunk_size=None):
+        """
+        Longstaff-Schwartz for Bermudan options on N correlated GBM assets, with any
+        vectorized payoff of the asset prices (`worst_of`, `best_of`, `basket`, `spread`
+        or a callable mapping [..., num_assets] to [...]). The paths are drawn exactly on
+        the exercise dates by the shared multi-asset simulator (Engine.simulator.simulate_dates
+        with a CorrelatedLogNormalProcess), so only [num_paths, num_dates, num_assets]
+        states are stored whatever the maturity.
+
+        With `chunk_size`, paths are simulated and design matrices built chunk_size paths
+        at a time: the normal equations of each exercise date are summed over the chunks,
+        so the [num_paths, num_basis] design matrix is never formed, e.g. 10+ assets on 1M paths.
+
+        Args:
+            num_paths (int): Number of simulated paths.
+            num_steps (int): Grid of the exercise dates when no `exercise_dates` are given:
+                             every M of the num_steps steps, as in the other LSM engines.
+            random_source: A RandomSource. Defaults to `torch.randn`.
+            precision: Precision policy (see Engine.precision).
+            exercise_dates (list): Explicit exercise times before maturity.
+            basis: Regression basis of the asset prices (Engine.basis), defaults to the
+                   tensor-product Hermite polynomials of total degree 2.
+            chunk_size (int): Number of paths per chunk, None for a single chunk.
+        """
+        self.num_paths = num_paths
+        self.num_steps = num_steps
+        self.random_source = random_source if random_source is not None else PseudoRandomSource()
+        # Paths in precision.path_dtype, regressions and cash flows in precision.accumulator_dtype
+        self.precision = get_precision(precision)
+        self.exercise_dates = exercise_dates
+        self.basis = get_basis(basis) if basis is not None else TensorProductBasis('hermite', order=2)
+        self.chunk_size = chunk_size
+
+    def price(self, S0, payoff, sigmas, T, r, M=12, correlation=None, strategy=None):
+        """
+        Price a multi-asset Bermudan option using the Longstaff-Schwartz algorithm.
+
+        Args:
+            S0: Initial asset prices (shape: [num_assets]).
+            payoff (callable): Exercise value of asset prices [..., num_assets], e.g. `worst_of(K)`.
+            sigmas: Volatilities of the assets (shape: [num_assets]).
+            T: Time to maturity.
+            r: Risk-free rate.
+            M: Exercise frequency on the num_steps grid (unused with exercise_dates).
+            correlation: Correlation matrix, a uniform correlation (float) or None.
+            strategy: Frozen ExerciseStrategy (see `fit_strategy`), None to regress on the priced paths.
+
+        Returns:
+            V: Option value.
+        """
+        return self.estimate(S0, payoff, sigmas, T, r, M, correlation, strategy)['price']
+
+    def estimate(self, S0, payoff, sigmas, T, r, M=12, correlation=None, strategy=None):
+        """
+        Longstaff-Schwartz price with its Monte Carlo statistics (arguments as in `price`).
+
+        Returns:
+            dict: price (differentiable tensor), std_error, variance, beta and variance_reduction_factor.
+        """
+        Sp = self.simulate_paths(S0, sigmas, T, r, M, correlation)
+        values = self.cash_flows(Sp, payoff, T, r, M, strategy)
+        return monte_carlo_estimate(values, group_size=self.random_source.group_size, precision=self.precision)
+
+    def exercise_times(self, T, M=12):
+        """Exercise times before maturity: the schedule, or every M steps of the num_steps grid."""
+        if self.exercise_dates is not None:
+            return exercise_schedule(self.exercise_dates, T)
+        return [T * (t / self.num_steps) for t in reversed(range(self.num_steps - 2, 0, -M))]
+
+    def simulate_paths(self, S0, sigmas, T, r, M=12, correlation=None, num_paths=None):
+        """
+        Simulates the assets on the exercise dates and the maturity, chunk by chunk.
+
+        Returns:
+            torch.Tensor: Asset prices (shape: [num_paths, num_dates + 2, num_assets]) from S0 to the maturity.
+        """
+        Np = num_paths if num_paths is not None else self.num_paths
+        dtype = self.precision.path_dtype
+        S0, sigmas = _vector(S0, dtype), _vector(sigmas, dtype)
+        process = CorrelatedLogNormalProcess(r, sigmas, _correlation(correlation, len(sigmas), dtype))
+        dates = self.exercise_times(T, M) + [T]
+
+        chunk_size = self.chunk_size or Np
+        chunks = [simulate_dates(process, S0, dates, min(chunk_size, Np - start), self.random_source, self.precision)
+                  for start in range(0, Np, chunk_size)]
+        return torch.cat(chunks) if len(chunks) > 1 else chunks[0]
+
+    def cash_flows(self, Sp, payoff, T, r, M=12, strategy=None):
+        """
+        Backward induction: discounted cash flow of each path under the regressed exercise rule,
+        or under the frozen rule of `strategy` (an ExerciseStrategy), without any regression.
+
+        Args:
+            Sp: Asset prices on the exercise dates (see `simulate_paths`).
+
+        Returns:
+            torch.Tensor: Discounted cash flow of each path (shape: [num_paths]).
+        """
+        return self._backward_induction(Sp, payoff, T, r, M, strategy)[0]
+
+    def fit_strategy(self, S0, payoff, sigmas, T, r, M=12, correlation=None, num_paths=None):
+        """
+        First pass of the two-pass method (see LongstaffSchwartzMethod.fit_strategy): the
+        exercise regressions estimated on a path set of their own, frozen.
+
+        Returns:
+            ExerciseStrategy: The frozen exercise rule.
+        """
+        with torch.no_grad():
+            Sp = self.simulate_paths(S0, sigmas, T, r, M, correlation, num_paths)
+            return self._backward_induction(Sp, payoff, T, r, M)[1]
+
+    def _chunks(self, num_paths):
+        chunk_size = self.chunk_size or num_paths
+        return [slice(start, start + chunk_size) for start in range(0, num_paths, chunk_size)]
+
+    def _continuation_value(self, X, Y, in_the_money, strategy, date_index, coefficients, normalisations, workspace):
+        # The continuation value only decides the exercise (a comparison), so neither the
+        # regression nor its evaluation is recorded on the tape, and the chunk design
+        # matrices and normal equations are written into the buffers of `workspace`
+        chunks = self._chunks(X.shape[0])
+        with torch.no_grad():
+            X, Y = X.detach(), Y.detach()
+            if strategy is not None:
+                basis, normalisation = strategy.basis, strategy.normalisations[date_index]
+                coeffs = strategy.coefficients[date_index].to(X.dtype)
+            else:
+                basis = self.basis
+                normalisation = basis.normalisation(X, in_the_money)
+                gram, rhs = 0.0, 0.0
+                for chunk in chunks:
+                    A = workspace.design_matrix(basis, X[chunk], normalisation)
+                    chunk_gram, chunk_rhs = normal_equations(A, Y[chunk], in_the_money[chunk], workspace)
+                    gram, rhs = gram + chunk_gram, rhs + chunk_rhs
+                coeffs = solve_normal_equations(gram, rhs).to(X.dtype)
+                coefficients[date_index], normalisations[date_index] = coeffs, normalisation
+            return torch.cat([workspace.design_matrix(basis, X[chunk], normalisation) @ coeffs for chunk in chunks])
+
+    def _backward_induction(self, Sp, payoff, T, r, M=12, strategy=None):
+        # Discounted cash flows and the exercise strategy (the given one or the regressed one)
+        accumulate = self.precision.accumulate
+        exercise_times = self.exercise_times(T, M)
+        times = [0.0] + exercise_times + [T]
+        fitted_times = [float(torch.as_tensor(t).detach()) for t in exercise_times]
+        if strategy is not None:
+            strategy.check(fitted_times)
+        coefficients, normalisations = [None] * len(exercise_times), [None] * len(exercise_times)
+        workspace = RegressionWorkspace()
+
+        def discount(i):
+            return torch.exp(torch.as_tensor(-r * (times[i + 1] - times[i]), dtype=self.precision.accumulator_dtype))
+
+        states = accumulate(Sp[:, 1:-1]).unbind(dim=1)
+        cash_flow = payoff(accumulate(Sp[:, -1]))
+        for i in range(len(states), 0, -1):
+            X = states[i - 1]
+            cash_flow = cash_flow * discount(i)
+            exercise_value = payoff(X)
+            in_the_money = exercise_value > 0
+
+            continuation_value = self._continuation_value(X, cash_flow, in_the_money, strategy, i - 1,
+                                                          coefficients, normalisations, workspace)
+            exercise = in_the_money & (exercise_value > continuation_value)
+            cash_flow = torch.where(exercise, exercise_value, cash_flow)
+
+        if strategy is None:
+            strategy = ExerciseStrategy(coefficients, fitted_times, normalisations, self.basis)
+        return cash_flow * discount(0), strategy
+
+    def price_only(self, S0, payoff, sigmas, T, r, M=12, correlation=None, strategy=None):
+        """
+        Price-only run of `price` under `torch.inference_mode()` (no autograd graph).
+
+        Returns:
+            float: Option value.
+        """
+        with torch.inference_mode():
+            Sp = self.simulate_paths(S0, sigmas, T, r, M, correlation)
+            return self.precision.mean(self.cash_flows(Sp, payoff, T, r, M, strategy)).item()
+
+    def calculate_greeks(self, S0, payoff, sigmas, T, r, M=12, correlation=None, strategy=None, two_pass=False):
+        """
+        Calculate sensitivities (Delta, Vega, Rho, Theta) using automatic differentiation,
+        optionally along a frozen exercise strategy (see LongstaffSchwartzMethod.calculate_greeks).
+
+        Returns:
+            sensitivities: Dictionary containing Delta and Vega (lists, one entry per asset), Rho and Theta.
+        """
+        if two_pass and strategy is None:
+            strategy = self.fit_strategy(S0, payoff, sigmas, T, r, M, correlation)
+
+        dtype = self.precision.path_dtype
+        S0_t = torch.tensor(S0, requires_grad=True, dtype=dtype)
+        sigmas_t = torch.tensor(sigmas, requires_grad=True, dtype=dtype)
+        r_t = torch.tensor(r, requires_grad=True, dtype=dtype)
+        T_t = torch.tensor(T, requires_grad=True, dtype=dtype)
+
+        V = self.price(S0_t, payoff, sigmas_t, T_t, r_t, M, correlation, strategy)
+        V.backward()
+
+        return {
+            "Delta": S0_t.grad.tolist(),
+            "Vega": sigmas_t.grad.tolist(),
+            "Rho": r_t.grad.item(),
+            "Theta": T_t.grad.item()
+        }
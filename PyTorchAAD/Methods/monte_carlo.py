@@ -1,50 +1,324 @@
 from .base import PricingMethod
+from Engine.statistics import RunningStatistics, ControlVariateStatistics
+from Engine.variance_reduction import group_means, variance_reduction_factor
+from Engine.random_sources import PseudoRandomSource
+from Engine.simulator import compiled_paths, simulate_multi_factor
+from Engine.adaptive import adaptive_price
+from Engine.precision import get_precision
+from Engine.stochastic_process import LogNormalProcess
+import math
 import torch
 
 class MonteCarloMethod(PricingMethod):
-    def __init__(self, process, S0, T, num_paths, num_steps):
+    def __init__(self, process, S0, T, num_paths, num_steps, vectorized=True, seed=None, random_source=None,
+                 compiled=False, precision=None):
         """
         Monte Carlo Simulation for stochastic processes.
 
         Args:
             process: A subclass of StochasticProcess.
-            S0: Initial value of the process.
+            S0: Initial value of the process (initial state, shape [num_factors], for multi-factor processes).
+                Single-factor processes also take a leading scenario batch shape on S0 and the
+                process parameters (e.g. 200 spots x 10 volatilities), priced in one pass on
+                common random numbers.
             T: Total time.
             num_steps: Number of time steps.
             num_paths: Number of Monte Carlo paths.
+            vectorized: Build all paths in one pass when the process supports it.
+            seed: Optional seed. When set, draws come from a private generator and
+                  path i gets the same increments however the paths are chunked.
+            random_source: A RandomSource (e.g. SobolSource). Defaults to pseudo-random draws with `seed`.
+            compiled: Run the time loop of stepped processes in fused `torch.compile` kernels
+                      (see Engine.simulator.compiled_paths).
+            precision: Precision policy ('float32', 'float64', 'mixed' or a Precision),
+                       defaults to the engine-wide policy (Engine.precision).
         """
         self.process = process
         self.S0 = S0
         self.T = T
         self.num_paths = num_paths
         self.num_steps = num_steps
+        self.vectorized = vectorized
+        self.seed = seed
+        self.compiled = compiled
+        self.precision = get_precision(precision)
+        self.random_source = random_source if random_source is not None else PseudoRandomSource(seed)
         if not torch.is_tensor(T):
-            T = torch.tensor(T, dtype=torch.float32)
+            T = torch.tensor(T, dtype=self.precision.path_dtype)
         self.dt = T / num_steps
 
+    def _brownian_increments(self, num_paths):
+        dW = self.random_source.brownian_increments(num_paths, self.num_steps - 1, dtype=self.precision.path_dtype)
+        return dW * torch.sqrt(self.dt)
+
+    def _initial_state(self, num_paths):
+        # S0 repeated over the paths (shape: [*batch, num_paths] with the scenario batch shape of S0)
+        S0 = torch.as_tensor(self.S0, dtype=self.precision.path_dtype)
+        return S0.unsqueeze(-1).expand(*S0.shape, num_paths)
+
+    def _step(self, S_prev, dW, t):
+        # Advances the state from grid point t - 1 to t through the stepping protocol
+        return self.process.step((t - 1) * self.dt, S_prev, self.dt, dW)
+
+    def _simulate_block(self, num_paths):
+        if getattr(self.process, 'num_factors', 1) > 1:
+            # Multi-factor processes (e.g. HestonProcess) run on the N-factor engine
+            return simulate_multi_factor(self.process, self.S0, self.dt, self.num_steps - 1, num_paths,
+                                         self.random_source, self.precision)
+
+        # Generate Brownian motion
+        dW = self._brownian_increments(num_paths)
+
+        if self.vectorized and getattr(self.process, 'supports_vectorized_simulation', False):
+            return self.process.simulate_paths(self.S0, self.dt, dW)
+
+        if self.compiled:
+            return compiled_paths(self.process, self.S0, self.dt, dW)
+
+        # The first column tracks the gradients of S0
+        S = [self._initial_state(num_paths)]
+
+        # Iterate over time steps
+        for t in range(1, self.num_steps):
+            S.append(self._step(S[-1], dW[:, t - 1], t))
+
+        # Parameters of a scenario batch broadcast the states from the first step on
+        return torch.stack(torch.broadcast_tensors(*S), dim=-1)
+
     def simulate(self):
         """
-        Runs Monte Carlo simulation using Euler-Maruyama discretization.
+        Runs Monte Carlo simulation using Euler-Maruyama discretization, or the
+        process' one-pass path construction when it supports vectorized simulation.
 
         Returns:
-            torch.Tensor: Simulated paths (shape: [num_paths, num_steps])
+            torch.Tensor: Simulated paths (shape: [*batch, num_paths, num_steps] with the scenario
+                          batch shape, or [num_paths, num_steps, num_factors] for multi-factor processes)
         """
-        S = torch.zeros((self.num_paths, self.num_steps), dtype=torch.float32)
+        self.random_source.reset()
+        return self._simulate_block(self.num_paths)
 
-        # Fill first column manually
-        S[:, 0] = self.S0  # Ensure the first column tracks gradients
+    def simulate_terminal(self):
+        """
+        Simulates only the value at the last grid point, with the same law as
+        `simulate()[:, -1]`. Processes with an exact transition sample it directly
+        from one normal per path; others are stepped keeping only the running state.
+        Memory is O(num_paths) and autograd Greeks are supported.
 
-        # Generate Brownian motion
-        dW = torch.randn(self.num_paths, self.num_steps + 1, dtype=torch.float32) * torch.sqrt(self.dt)
+        Returns:
+            torch.Tensor: Terminal values (shape: [*batch, num_paths] with the scenario batch shape)
+        """
+        self.random_source.reset()
+        horizon = self.dt * (self.num_steps - 1)
 
-        # Iterate over time steps
+        if getattr(self.process, 'num_factors', 1) > 1:
+            return self._simulate_block(self.num_paths)[:, -1]
+
+        if getattr(self.process, 'supports_exact_transition', False):
+            Z = self.random_source.normals(self.num_paths, 1, dtype=self.precision.path_dtype)[:, 0]
+            return self.process.transition(self._initial_state(self.num_paths), horizon, Z)
+
+        S = self._initial_state(self.num_paths)
+        sqrt_dt = torch.sqrt(self.dt)
+        # Quasi-random dimensions must stay attached to paths: draw them all at once
+        dW_all = None if self.random_source.stepwise else self._brownian_increments(self.num_paths)
         for t in range(1, self.num_steps):
-            S_prev = S[:, t - 1].clone()  # Clone to prevent in-place modification issues
-            current_time = t * self.dt
-            if hasattr(self.process, 'evolve') and self.process.evolve.__code__.co_argcount == 4:
-                S[:, t] = self.process.evolve(S_prev, self.dt, dW[:, t - 1])  # Without current time
+            if dW_all is None:
+                dW = self.random_source.normals(self.num_paths, 1, dtype=self.precision.path_dtype)[:, 0] * sqrt_dt
             else:
-                S[:, t] = torch.relu(S_prev)  # Ensure positivity
-                S[:, t] = self.process.evolve(S_prev, self.dt, dW[:, t - 1], current_time)  # Pass current time
-
+                dW = dW_all[:, t - 1]
+            S = self._step(S, dW, t)
         return S
+
+    def simulate_range(self, start, num_paths):
+        """
+        Simulates the paths [start, start + num_paths) of the full run, using the
+        skip-ahead of the random source (e.g. MRG32k3aSource).
+
+        Returns:
+            torch.Tensor: Simulated paths (shape: [num_paths, num_steps])
+        """
+        self.random_source.skip_to(start)
+        return self._simulate_block(num_paths)
+
+    def simulate_chunks(self, chunk_size):
+        """
+        Streams the simulation as blocks of at most `chunk_size` paths.
+
+        Args:
+            chunk_size (int): Number of paths per block.
+
+        Yields:
+            torch.Tensor: Simulated paths (shape: [chunk, num_steps])
+        """
+        self.random_source.reset()
+        for start in range(0, self.num_paths, chunk_size):
+            yield self._simulate_block(min(chunk_size, self.num_paths - start))
+
+    def price_streaming(self, payoff, chunk_size, params=None, control_variate=None):
+        """
+        Prices by streaming path blocks through `payoff` and folding each block into
+        running aggregators. Peak memory depends on `chunk_size`, not on `num_paths`;
+        with a fixed seed the result matches the one-shot run.
+
+        Args:
+            payoff (callable): Maps paths [chunk, num_steps] to discounted payoffs [chunk]. The running
+                               statistics take one scenario: batched payoffs raise a ValueError.
+            chunk_size (int): Number of paths per block.
+            params (dict): Optional mapping name -> scalar tensor (requires_grad=True).
+                           Gradients of the price w.r.t. these are accumulated chunk by chunk.
+            control_variate (tuple): Optional (control, expectation): `control` maps paths to
+                                     control samples [chunk] with known mean `expectation`
+                                     (e.g. a closed-form price, may depend on `params`).
+                                     The optimal beta is estimated online over the chunks.
+
+        Returns:
+            dict: price, std_error, variance, discounted_payoff_sum, num_paths, greeks,
+                  beta and variance_reduction_factor.
+        """
+        stats = RunningStatistics()
+        grouped = RunningStatistics() if control_variate is None else ControlVariateStatistics()
+        group_size = self.random_source.group_size
+        names = list(params) if params else []
+        grads = {name: 0.0 for name in names}
+        control_grads = {name: 0.0 for name in names}
+
+        # Without requested Greeks no autograd graph is needed at all
+        with torch.inference_mode(not names):
+            for paths in self.simulate_chunks(chunk_size):
+                discounted_payoffs = payoff(paths)
+                stats.update(discounted_payoffs)
+                outputs = [(discounted_payoffs, grads)]
+
+                if control_variate is None:
+                    grouped.update(group_means(discounted_payoffs, group_size))
+                else:
+                    controls = control_variate[0](paths)
+                    grouped.update(group_means(discounted_payoffs, group_size), group_means(controls, group_size))
+                    outputs.append((controls, control_grads))
+
+                if names:
+                    for samples, totals in outputs:
+                        # Retain the graph shared across chunks (e.g. dt = T / num_steps)
+                        chunk_grads = torch.autograd.grad(self.precision.accumulate(samples).sum() / self.num_paths,
+                                                          [params[name] for name in names],
+                                                          retain_graph=True, allow_unused=True)
+                        for name, grad in zip(names, chunk_grads):
+                            if grad is not None:
+                                totals[name] += grad.item()
+
+            price, beta = stats.mean, 0.0
+            if control_variate is not None:
+                # d/dp [mean(Y) - beta * (mean(C) - E[C])] with beta held constant
+                expectation = control_variate[1]
+                beta = grouped.beta
+                price = grouped.mean(torch.as_tensor(expectation).detach().item())
+                expectation_grads = [None] * len(names)
+                if names and torch.is_tensor(expectation) and expectation.requires_grad:
+                    expectation_grads = torch.autograd.grad(expectation, [params[name] for name in names],
+                                                            allow_unused=True)
+                for name, grad in zip(names, expectation_grads):
+                    grads[name] -= beta * (control_grads[name] - (grad.item() if grad is not None else 0.0))
+
+        return {
+            'price': price,
+            'std_error': grouped.std_error,
+            'variance': stats.variance,
+            'discounted_payoff_sum': stats.total,
+            'num_paths': stats.count,
+            'greeks': grads,
+            'beta': beta,
+            'variance_reduction_factor': variance_reduction_factor(stats, grouped.std_error)
+        }
+
+    def price_adaptive(self, payoff, tolerance=None, relative_tolerance=None, params=None, greek_tolerances=None,
+                       batch_size=10000, min_batches=4):
+        """
+        Prices with only as many paths as the requested accuracy needs: blocks of
+        `batch_size` paths are simulated until the standard error of the price (and of
+        the Greeks in `greek_tolerances`) meets the target. `num_paths` is the path budget.
+
+        Args:
+            payoff (callable): Maps paths [batch, num_steps] to discounted payoffs [batch], of one
+                               scenario (batched payoffs raise a ValueError).
+            tolerance (float): Target absolute standard error of the price.
+            relative_tolerance (float): Target standard error relative to |price|.
+            params (dict): Optional mapping name -> scalar tensor (requires_grad=True).
+            greek_tolerances (dict): Optional mapping name -> target standard error of that Greek.
+            batch_size (int): Number of paths per block.
+            min_batches (int): Minimum number of blocks before a Greek error is trusted.
+
+        Returns:
+            dict: price, std_error, variance, num_paths (paths used), num_batches, converged,
+                  greeks and greek_std_errors (see Engine.adaptive.adaptive_price).
+        """
+        self.random_source.reset()
+        return adaptive_price(lambda start, num_paths: payoff(self._simulate_block(num_paths)),
+                              tolerance, relative_tolerance, params, greek_tolerances, batch_size,
+                              max_paths=self.num_paths, min_batches=min_batches,
+                              group_size=self.random_source.group_size)
+
+    def likelihood_ratio_greeks(self, payoff, mode="vibrato", chunk_size=100000):
+        """
+        Delta, gamma and vega of a payoff of the terminal value of a LogNormalProcess
+        with likelihood-ratio weights, so that discontinuous payoffs (digitals, kinks
+        for gamma) get unbiased, finite-variance estimates where pathwise AAD gives
+        zero. One pass over the paths gives the price and all three Greeks.
+
+        Given the log-state before the last LR step, log S_N ~ N(m, s^2) and
+            dE/dm = E[f Z] / s,  dE/ds = E[f (Z^2 - 1)] / s,  d2E/dm2 = E[f (Z^2 - 1)] / s^2.
+        "likelihood_ratio" applies the weights to the whole horizon (m depends on S0
+        and sigma only); "vibrato" (Giles, 2009) differentiates pathwise up to the last
+        step and applies them to the last step only. Odd weights use antithetic payoff
+        differences and even weights subtract the payoff at Z = 0 as a control.
+
+        Args:
+            payoff (callable): Maps terminal values [chunk] to discounted payoffs [chunk].
+            mode (str): "likelihood_ratio" or "vibrato".
+            chunk_size (int): Number of paths per block.
+
+        Returns:
+            dict: price, delta, gamma, vega and their std_errors (dict keyed by the same names).
+        """
+        if not isinstance(self.process, LogNormalProcess):
+            raise ValueError("Likelihood-ratio Greeks are implemented for the LogNormalProcess.")
+        if mode not in ("likelihood_ratio", "vibrato"):
+            raise ValueError("Invalid mode. Choose 'likelihood_ratio' or 'vibrato'.")
+
+        dtype = self.precision.path_dtype
+        S0, mu, sigma = (torch.as_tensor(x).detach().item() for x in (self.S0, self.process.mu, self.process.sigma))
+        horizon = torch.as_tensor(self.dt).detach().item() * (self.num_steps - 1)
+        # Length of the step carrying the likelihood ratio
+        h = horizon if mode == "likelihood_ratio" else torch.as_tensor(self.dt).detach().item()
+        s = sigma * h**0.5
+
+        names = ('price', 'delta', 'gamma', 'vega')
+        stats = {name: RunningStatistics() for name in names}
+        group_size = self.random_source.group_size
+
+        self.random_source.reset()
+        with torch.inference_mode():
+            for start in range(0, self.num_paths, chunk_size):
+                Z = self.random_source.normals(min(chunk_size, self.num_paths - start), 2, dtype=dtype)
+                W = (horizon - h)**0.5 * Z[:, 0]
+                m = math.log(S0) + (mu - 0.5 * sigma**2) * horizon + sigma * W
+                up, down, centre = payoff(torch.exp(m + s * Z[:, 1])), payoff(torch.exp(m - s * Z[:, 1])), payoff(torch.exp(m))
+
+                odd = 0.5 * (up - down)
+                even = 0.5 * (up + down) - centre
+                g_m = odd * Z[:, 1] / s
+                g_s = even * (Z[:, 1]**2 - 1) / s
+                g_mm = even * (Z[:, 1]**2 - 1) / s**2
+
+                samples = {
+                    'price': 0.5 * (up + down),
+                    # dm/dS0 = 1 / S0, d2m/dS0^2 = -1 / S0^2, dm/dsigma = W - sigma * horizon, ds/dsigma = sqrt(h)
+                    'delta': g_m / S0,
+                    'gamma': (g_mm - g_m) / S0**2,
+                    'vega': g_m * (W - sigma * horizon) + g_s * h**0.5
+                }
+                for name in names:
+                    stats[name].update(group_means(samples[name], group_size))
+
+        result = {name: stats[name].mean for name in names}
+        result['std_errors'] = {name: stats[name].std_error for name in names}
+        return result
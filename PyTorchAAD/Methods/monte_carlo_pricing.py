@@ -1,32 +1,122 @@
 import torch
 from Methods.base import PricingMethod
+from Engine.random_sources import PseudoRandomSource
+from Engine.precision import get_precision
+from Engine.stochastic_process import CorrelatedLogNormalProcess
+from Engine.simulator import simulate_multi_factor
+from Engine.variance_reduction import monte_carlo_estimate
+from Models.black_scholes import geometric_basket_price
 
 class MonteCarloPricing(PricingMethod):
-    def __init__(self, num_paths, num_steps):
+    def __init__(self, num_paths, num_steps, random_source=None, precision=None):
         self.num_paths = num_paths
         self.num_steps = num_steps
+        self.random_source = random_source if random_source is not None else PseudoRandomSource()
+        self.precision = get_precision(precision)
 
-    def simulate_asset_paths(self, S0, T, r, sigma):
-        dt = torch.tensor(T / self.num_steps)  # Convert dt to tensor
-        paths = torch.zeros((self.num_steps + 1, self.num_paths))
+    def simulate_asset_paths(self, S0, T, r, sigma, num_paths=None):
+        num_paths = num_paths if num_paths is not None else self.num_paths
+        dtype = self.precision.path_dtype
+        dt = torch.tensor(T / self.num_steps, dtype=dtype)  # Convert dt to tensor
+        paths = torch.zeros((self.num_steps + 1, num_paths), dtype=dtype)
         paths[0] = S0
+        Z = self.random_source.brownian_increments(num_paths, self.num_steps, dtype=dtype)
 
         for t in range(1, self.num_steps + 1):
-            z = torch.randn(self.num_paths)
-            paths[t] = paths[t - 1] * torch.exp((r - 0.5 * sigma ** 2) * dt + sigma * torch.sqrt(dt) * z)
+            paths[t] = paths[t - 1] * torch.exp((r - 0.5 * sigma ** 2) * dt + sigma * torch.sqrt(dt) * Z[:, t - 1])
 
         return paths
 
+    def simulate_asset_path_chunks(self, S0, T, r, sigma, chunk_size):
+        """
+        Streams the asset paths as blocks of at most `chunk_size` paths, so that
+        peak memory depends on the chunk size rather than on `num_paths`.
+
+        Yields:
+            torch.Tensor: Asset paths (shape: [num_steps + 1, chunk])
+        """
+        for start in range(0, self.num_paths, chunk_size):
+            yield self.simulate_asset_paths(S0, T, r, sigma, min(chunk_size, self.num_paths - start))
+
+    def simulate_correlated_asset_paths(self, S0, T, r, sigmas, correlation=None, num_paths=None):
+        """
+        Simulates correlated GBM paths of several assets in one vectorized pass
+        (Engine.simulator.simulate_multi_factor).
+
+        Args:
+            S0: Initial prices (shape: [num_assets]).
+            T: Time to maturity.
+            r: Risk-free rate.
+            sigmas: Volatilities (shape: [num_assets]).
+            correlation: Correlation matrix (shape: [num_assets, num_assets]), identity if None.
+            num_paths: Number of paths, defaults to `self.num_paths`.
+
+        Returns:
+            torch.Tensor: Asset paths (shape: [num_steps + 1, num_paths, num_assets])
+        """
+        num_paths = num_paths if num_paths is not None else self.num_paths
+        process = CorrelatedLogNormalProcess(r, sigmas, correlation)
+        paths = simulate_multi_factor(process, S0, T / self.num_steps, self.num_steps, num_paths,
+                                      self.random_source, self.precision)
+        return paths.transpose(0, 1)
+
+    def price_basket_option(self, S0, weights, K, T, r, sigmas, correlation=None, option_type="call", control_variate=False):
+        """
+        European option on the arithmetic basket sum_i w_i S_i of correlated GBM assets
+        (arguments as in `estimate_basket_option`).
+
+        Returns:
+            torch.Tensor: Option price.
+        """
+        return self.estimate_basket_option(S0, weights, K, T, r, sigmas, correlation, option_type, control_variate)['price']
+
+    def estimate_basket_option(self, S0, weights, K, T, r, sigmas, correlation=None, option_type="call", control_variate=False):
+        """
+        Price of the arithmetic basket option of `price_basket_option` with its Monte Carlo statistics.
+
+        Args:
+            S0: Initial prices (shape: [num_assets]).
+            weights: Weights of the assets in the basket (shape: [num_assets]).
+            K: Strike price.
+            T: Time to maturity.
+            r: Risk-free rate.
+            sigmas: Volatilities (shape: [num_assets]).
+            correlation: Correlation matrix (shape: [num_assets, num_assets]), identity if None.
+            option_type: "call" or "put".
+            control_variate: Use the option on the geometric basket (weights normalised to one),
+                             priced in closed form, as a control variate.
+
+        Returns:
+            dict: price (differentiable tensor), std_error, variance, beta and variance_reduction_factor.
+        """
+        sign = {"call": 1.0, "put": -1.0}[option_type]
+        terminal = self.simulate_correlated_asset_paths(S0, T, r, sigmas, correlation)[-1]
+        discount = torch.exp(-torch.as_tensor(r) * T)
+        values = discount * torch.clamp(sign * ((terminal * weights).sum(dim=1) - K), min=0.0)
+
+        controls, expectation = None, None
+        if control_variate:
+            geometric_weights = weights / weights.sum()
+            geometric = torch.exp((torch.log(terminal) * geometric_weights).sum(dim=1)) * weights.sum()
+            controls = discount * torch.clamp(sign * (geometric - K), min=0.0)
+            expectation = weights.sum() * geometric_basket_price(S0, geometric_weights, sigmas, T, r, K / weights.sum(),
+                                                                 correlation, option_type)
+
+        return monte_carlo_estimate(values, controls, expectation, self.random_source.group_size, self.precision)
+
     def price_best_of_two_assets_bermudan_option(self, S0_1, S0_2, K, T, r, sigma_1, sigma_2, rho, exercise_dates, is_call=True):
         dt = torch.tensor(T / self.num_steps)  # Convert dt to tensor
         discount_factor = torch.exp(-r * dt)
 
-        # Simulate asset paths
-        paths_1 = self.simulate_asset_paths(S0_1, T, r, sigma_1)
-        paths_2 = self.simulate_asset_paths(S0_2, T, r, sigma_2)
+        # Simulate correlated asset paths
+        correlation = torch.eye(2) + rho * (1 - torch.eye(2))
+        S0 = torch.stack([torch.as_tensor(S0_1), torch.as_tensor(S0_2)])
+        sigmas = torch.stack([torch.as_tensor(sigma_1), torch.as_tensor(sigma_2)])
+        paths = self.simulate_correlated_asset_paths(S0, T, r, sigmas, correlation)
+        paths_1, paths_2 = paths[..., 0], paths[..., 1]
 
         # Initialize option values
-        option_values = torch.zeros((self.num_steps + 1, self.num_paths))
+        option_values = torch.zeros((self.num_steps + 1, self.num_paths), dtype=self.precision.accumulator_dtype)
 
         # Calculate payoff at maturity
         if is_call:
@@ -49,5 +139,5 @@ class MonteCarloPricing(PricingMethod):
             else:
                 option_values[t] = discount_factor * option_values[t + 1]
 
-        option_price = option_values[0].mean()
+        option_price = self.precision.mean(option_values[0])
         return option_price
@@ -1,3 +1,7 @@
+import torch
+from torch.distributions.normal import Normal
+from Engine.precision import common_dtype
+
 class BlackScholesModel:
     """Black-Scholes model for pricing."""
     def __init__(self, r, sigma):
@@ -6,3 +10,66 @@ class BlackScholesModel:
 
     def simulate(self, S0, T, num_paths, num_steps):
         return f"Simulating paths with S0={S0}, T={T}"
+
+def black_scholes_price(S0, K, T, r, sigma, option_type="call"):
+    """
+    Closed-form Black-Scholes price of a European option. Differentiable in all
+    tensor inputs, so it can serve as the known mean of a control variate.
+
+    Args:
+        S0: Initial asset price.
+        K: Strike price.
+        T: Time to maturity.
+        r: Risk-free rate.
+        sigma: Volatility.
+        option_type (str): "call" or "put".
+
+    Returns:
+        torch.Tensor: The option price.
+    """
+    dtype = common_dtype(S0, T, r, sigma)
+    S0, T, r, sigma = (torch.as_tensor(x, dtype=dtype) for x in (S0, T, r, sigma))
+    forward = S0 * torch.exp(r * T)
+    return torch.exp(-r * T) * _black_formula(forward, K, sigma**2 * T, option_type)
+
+def geometric_basket_price(S0, weights, sigmas, T, r, K, correlation=None, option_type="call"):
+    """
+    Closed-form price of a European option on the geometric basket prod_i S_i^w_i
+    (weights summing to one) of lognormal assets, which is itself lognormal.
+    The usual control variate for the arithmetic basket of Tutorials/mc_basket_option.py.
+
+    Args:
+        S0 (torch.Tensor): Initial prices of the assets.
+        weights (torch.Tensor): Weights of the assets in the basket.
+        sigmas (torch.Tensor): Volatilities of the assets.
+        T: Time to maturity.
+        r: Risk-free rate.
+        K: Strike price.
+        correlation (torch.Tensor): Correlation matrix of the assets (independent if None).
+        option_type (str): "call" or "put".
+
+    Returns:
+        torch.Tensor: The option price.
+    """
+    dtype = common_dtype(S0, weights, sigmas, T, r)
+    T, r = torch.as_tensor(T, dtype=dtype), torch.as_tensor(r, dtype=dtype)
+    weighted_sigmas = weights * sigmas
+    if correlation is None:
+        variance = torch.sum(weighted_sigmas**2) * T
+    else:
+        variance = weighted_sigmas @ correlation @ weighted_sigmas * T
+    log_mean = torch.sum(weights * (torch.log(S0) + (r - 0.5 * sigmas**2) * T))
+    forward = torch.exp(log_mean + 0.5 * variance)
+    return torch.exp(-r * T) * _black_formula(forward, K, variance, option_type)
+
+def _black_formula(forward, K, variance, option_type):
+    # Undiscounted Black formula for a lognormal forward with total variance `variance`
+    normal = Normal(0.0, 1.0)
+    std = torch.sqrt(variance)
+    d1 = (torch.log(forward / K) + 0.5 * variance) / std
+    d2 = d1 - std
+    if option_type == "call":
+        return forward * normal.cdf(d1) - K * normal.cdf(d2)
+    elif option_type == "put":
+        return K * normal.cdf(-d2) - forward * normal.cdf(-d1)
+    raise ValueError("Invalid option_type. Choose 'call' or 'put'.")
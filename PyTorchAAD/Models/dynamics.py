@@ -1,17 +1,121 @@
 # dynamics.py
 import torch
+from Engine.stochastic_process import StochasticProcess
+from Engine.precision import common_dtype
 
-class HestonProcess:
-    def __init__(self, v0, mu, kappa, theta, sigma, rho, device="cpu"):
+class HestonProcess(StochasticProcess):
+    # Two factors (S, v); the engine passes independent increments and the
+    # spot/variance correlation is applied inside `step`
+    num_factors = 2
+    cholesky = torch.eye(2)
+    # Critical value of psi = s^2 / m^2 switching between the QE branches
+    psi_c = 1.5
+
+    def __init__(self, v0, mu, kappa, theta, sigma, rho, device="cpu", scheme="qe"):
+        """
+        Heston stochastic volatility process, simulated on the state (S, v).
+
+        Args:
+            v0: Initial variance.
+            mu: Drift of the spot.
+            kappa: Mean-reversion speed of the variance.
+            theta: Long-term variance.
+            sigma: Volatility of volatility.
+            rho: Correlation between the spot and variance Brownian motions.
+            device (str): Device to perform computations ('cpu' or 'cuda').
+            scheme (str): "qe" for Andersen's Quadratic-Exponential variance step with the
+                          martingale-corrected log-spot step, "euler" for full truncation Euler.
+        """
+        super().__init__(mu, sigma, device)
+        if scheme not in ("qe", "euler"):
+            raise ValueError("Invalid scheme. Choose 'qe' or 'euler'.")
         self.v0 = v0  # Initial variance
-        self.mu = mu  # Drift
         self.kappa = kappa  # Mean-reversion speed
         self.theta = theta  # Long-term variance
-        self.sigma = sigma  # Volatility of volatility
         self.rho = rho  # Correlation
-        self.device = device
+        self.scheme = scheme
 
     def evolve(self, S, v, dt, dW_S, dW_v):
         v_next = torch.clamp(v + self.kappa * (self.theta - v) * dt + self.sigma * torch.sqrt(v) * dW_v, min=0)
         S_next = S * torch.exp((self.mu - 0.5 * v) * dt + torch.sqrt(v) * dW_S)
         return S_next, v_next
+
+    def initial_state(self, S0):
+        """Initial state (S0, v0) (shape: [2]) for the engine."""
+        dtype = common_dtype(S0, self.v0)
+        return torch.stack([torch.as_tensor(S0, dtype=dtype), torch.as_tensor(self.v0, dtype=dtype)])
+
+    def step(self, t, X, dt, dW):
+        """
+        Advances the state one step.
+
+        Args:
+            t: Current time.
+            X (torch.Tensor): State (S, v) (shape: [num_paths, 2]).
+            dt: Time step.
+            dW (torch.Tensor): Independent Brownian increments of the spot and the
+                               variance (shape: [num_paths, 2]).
+
+        Returns:
+            torch.Tensor: State at `t + dt` (shape: [num_paths, 2]).
+        """
+        S, v = X[:, 0], X[:, 1]
+        dt = torch.as_tensor(dt, dtype=X.dtype)
+        Z_S, Z_v = dW[:, 0] / torch.sqrt(dt), dW[:, 1] / torch.sqrt(dt)
+
+        if self.scheme == "euler":
+            dW_v = Z_v * torch.sqrt(dt)
+            dW_S = (self.rho * Z_v + (1 - self.rho**2) ** 0.5 * Z_S) * torch.sqrt(dt)
+            S_next, v_next = self.evolve(S, v, dt, dW_S, dW_v)
+            return torch.stack([S_next, v_next], dim=1)
+
+        v_next, log_mgf_correction = self._qe_variance(v, dt, Z_v)
+        return torch.stack([S * torch.exp(self._qe_log_increment(v, v_next, dt, Z_S, log_mgf_correction)), v_next], dim=1)
+
+    def _qe_variance(self, v, dt, Z_v):
+        # Andersen (2008): moment-matched quadratic (psi <= psi_c) or exponential (psi > psi_c) variance
+        kappa, theta, sigma = self.kappa, self.theta, self.sigma
+        _, _, K2, _, K4 = self._spot_coefficients(dt)
+        A = K2 + 0.5 * K4
+        e = torch.exp(-kappa * dt)
+        m = theta + (v - theta) * e
+        s2 = v * sigma**2 * e / kappa * (1 - e) + theta * sigma**2 / (2 * kappa) * (1 - e)**2
+        psi = s2 / m**2
+
+        # Each branch only sees the psi values it is valid for, so no NaN reaches the gradients
+        psi_q = torch.clamp(psi, max=self.psi_c)
+        b2 = 2 / psi_q - 1 + torch.sqrt(2 / psi_q) * torch.sqrt(2 / psi_q - 1)
+        a = m / (1 + b2)
+        v_quadratic = a * (torch.sqrt(b2) + Z_v)**2
+
+        psi_e = torch.clamp(psi, min=self.psi_c)
+        p = (psi_e - 1) / (psi_e + 1)
+        beta = (1 - p) / m
+        # Inverse CDF of the mass at zero plus exponential tail; 1 - U computed as ndtr(-Z) for accuracy
+        v_exponential = torch.log(torch.clamp((1 - p) / torch.special.ndtr(-Z_v), min=1.0)) / beta
+
+        quadratic = psi <= self.psi_c
+        v_next = torch.where(quadratic, v_quadratic, v_exponential)
+
+        # log E[exp(A v_next)] given v, for the martingale correction of the spot
+        # (finite for A < 1 / (2a) and A < beta, which holds unless rho is large and positive)
+        log_mgf_quadratic = A * b2 * a / (1 - 2 * A * a) - 0.5 * torch.log(1 - 2 * A * a)
+        log_mgf_exponential = torch.log(p + beta * (1 - p) / (beta - A))
+        return v_next, torch.where(quadratic, log_mgf_quadratic, log_mgf_exponential)
+
+    def _spot_coefficients(self, dt):
+        # K0..K4 of the log-spot step with central discretisation (gamma1 = gamma2 = 1/2)
+        kappa, theta, sigma, rho = self.kappa, self.theta, self.sigma, self.rho
+        K0 = -rho * kappa * theta / sigma * dt
+        K1 = 0.5 * dt * (kappa * rho / sigma - 0.5) - rho / sigma
+        K2 = 0.5 * dt * (kappa * rho / sigma - 0.5) + rho / sigma
+        K3 = 0.5 * dt * (1 - rho**2)
+        K4 = 0.5 * dt * (1 - rho**2)
+        return K0, K1, K2, K3, K4
+
+    def _qe_log_increment(self, v, v_next, dt, Z_S, log_mgf_correction):
+        _, K1, K2, K3, K4 = self._spot_coefficients(dt)
+        # Martingale-corrected K0: E[S(t + dt) / S(t)] = exp(mu dt) exactly
+        K0 = -log_mgf_correction - (K1 + 0.5 * K3) * v
+        diffusion = torch.sqrt(torch.clamp(K3 * v + K4 * v_next, min=1e-30)) * Z_S
+        return self.mu * dt + K0 + K1 * v + K2 * v_next + diffusion
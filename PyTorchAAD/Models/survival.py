@@ -0,0 +1,109 @@
+import torch
+from Engine.precision import get_precision
+
+def _as_tensor(x):
+    # Keeps tensors (and their graph) as they are, so Greeks flow to leaf parameters
+    return x if isinstance(x, torch.Tensor) else torch.tensor(x, dtype=get_precision().path_dtype)
+
+def cir_affine_coefficients(k, mu, nu, T, t=0.0):
+    """
+    Coefficients of the CIR survival probability
+    P(t, T) = E_t[exp(-int_t^T lambda(s) ds)] = A(t, T) exp(-B(t, T) lambda(t))
+    for the intensity d lambda = k (mu - lambda) dt + nu sqrt(lambda) dW.
+
+    Args:
+        k: Speed of mean reversion.
+        mu: Mean-reversion level.
+        nu: Volatility of the intensity.
+        T: Maturities (scalar or tensor, vectorized).
+        t: Valuation time.
+
+    Returns:
+        tuple: A(t, T) and B(t, T), broadcast to the shape of T.
+    """
+    k, mu, nu = _as_tensor(k), _as_tensor(mu), _as_tensor(nu)
+    tau = _as_tensor(T) - t
+    h = torch.sqrt(k**2 + 2 * nu**2)
+    growth = torch.expm1(h * tau)
+    denominator = 2 * h + (k + h) * growth
+    A = (2 * h * torch.exp((k + h) * tau / 2) / denominator)**(2 * k * mu / nu**2)
+    B = 2 * growth / denominator
+    return A, B
+
+def cir_survival_probability(lambda_t, k, mu, nu, T, t=0.0):
+    """
+    Closed-form survival probability of a CIR intensity, differentiable in
+    lambda_t, k, mu and nu.
+
+    Args:
+        lambda_t: Intensity at the valuation time.
+        k: Speed of mean reversion.
+        mu: Mean-reversion level.
+        nu: Volatility of the intensity.
+        T: Maturities (scalar or tensor, vectorized).
+        t: Valuation time.
+
+    Returns:
+        torch.Tensor: Survival probabilities to each maturity.
+    """
+    A, B = cir_affine_coefficients(k, mu, nu, T, t)
+    return A * torch.exp(-B * _as_tensor(lambda_t))
+
+def phi_integral(phi, T, t=0.0, num_points=101):
+    """
+    Integral int_t^T phi(s) ds of a deterministic shift, by the trapezoidal rule
+    on `num_points` points per maturity.
+
+    Args:
+        phi (callable): Shift function, applied to tensors of times.
+        T: Maturities (scalar or tensor, vectorized).
+        t: Valuation time.
+        num_points (int): Number of quadrature points.
+
+    Returns:
+        torch.Tensor: The integrals, with the shape of T.
+    """
+    T = _as_tensor(T)
+    u = torch.linspace(0.0, 1.0, num_points, dtype=T.dtype)
+    times = t + (T - t).unsqueeze(-1) * u
+    return torch.trapezoid(phi(times) * torch.ones_like(times), times, dim=-1)
+
+def cir_plus_plus_survival_probability(x_t, k, mu, nu, phi, T, t=0.0, num_points=101):
+    """
+    Closed-form survival probability of the CIR++ intensity lambda(t) = x(t) + phi(t),
+    where x is a CIR process: the CIR survival probability of x times the discount
+    exp(-int_t^T phi(s) ds) of the shift.
+
+    Args:
+        x_t: CIR part of the intensity at the valuation time.
+        k: Speed of mean reversion.
+        mu: Mean-reversion level.
+        nu: Volatility of the intensity.
+        phi (callable): Deterministic shift function, applied to tensors of times.
+        T: Maturities (scalar or tensor, vectorized).
+        t: Valuation time.
+        num_points (int): Number of quadrature points of the shift integral.
+
+    Returns:
+        torch.Tensor: Survival probabilities to each maturity.
+    """
+    return torch.exp(-phi_integral(phi, T, t, num_points)) * cir_survival_probability(x_t, k, mu, nu, T, t)
+
+def survival_probability(process, lambda_t, T, t=0.0):
+    """
+    Closed-form survival probability of an IntensityProcess or CIRPlusPlusProcess,
+    valid when the intensity is independent of the exposure (no wrong-way risk).
+
+    Args:
+        process: An IntensityProcess or a CIRPlusPlusProcess.
+        lambda_t: Intensity (CIR part for CIR++) at the valuation time.
+        T: Maturities (scalar or tensor, vectorized).
+        t: Valuation time.
+
+    Returns:
+        torch.Tensor: Survival probabilities to each maturity.
+    """
+    phi = getattr(process, 'phi', None)
+    if phi is None:
+        return cir_survival_probability(lambda_t, process.k, process.mu, process.nu, T, t)
+    return cir_plus_plus_survival_probability(lambda_t, process.k, process.mu, process.nu, phi, T, t)
@@ -0,0 +1,31 @@
+"""
+Wall-clock comparison of the eager and compiled time loops of a stepped process
+(MonteCarloMethod(compiled=True), Engine.simulator.compiled_paths). Timings depend
+on the machine and its load, so they are not part of the unit tests. Run from
+PyTorchAAD with:
+
+    OMP_NUM_THREADS=1 python -m Tests.benchmark_compiled_loop
+"""
+import time
+import torch
+from Engine.stochastic_process import IntensityProcess
+from Methods.monte_carlo import MonteCarloMethod
+
+def time_simulation(compiled, num_paths=20000, num_steps=200, repeats=3):
+    """Best of `repeats` timings of the path construction (seconds), on fixed increments."""
+    process = IntensityProcess(mu=1.0, sigma=0.0, k=0.5, nu=0.25)
+    dW = torch.randn(num_paths, num_steps - 1) * 0.07
+    mc = MonteCarloMethod(process, 1.0, 1.0, num_paths=num_paths, num_steps=num_steps, vectorized=False, compiled=compiled)
+    # Same increments for both loops, so that only the path construction is timed
+    mc._brownian_increments = lambda num_paths: dW
+    mc.simulate()  # Compiles the kernel
+    runs = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        mc.simulate()
+        runs.append(time.perf_counter() - start)
+    return min(runs)
+
+if __name__ == '__main__':
+    eager, compiled = time_simulation(False), time_simulation(True)
+    print(f"eager: {eager:.4f}s, compiled: {compiled:.4f}s, speed-up: {eager / compiled:.1f}x")
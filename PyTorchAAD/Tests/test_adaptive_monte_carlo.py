@@ -0,0 +1,89 @@
+import math
+import unittest
+import torch
+from Engine.adaptive import adaptive_price
+from Engine.random_sources import MRG32k3aSource, PseudoRandomSource
+from Engine.stochastic_process import LogNormalProcess
+from Engine.variance_reduction import AntitheticSource
+from Methods.monte_carlo import MonteCarloMethod
+from Methods.longstaff_schwartz import LongstaffSchwartzMethod
+
+def call_payoff(K, r, T):
+    return lambda paths: math.exp(-r * T) * torch.clamp(paths[:, -1] - K, min=0)
+
+class TestAdaptiveMonteCarlo(unittest.TestCase):
+    def test_stops_at_absolute_tolerance(self):
+        mc = MonteCarloMethod(LogNormalProcess(0.01, 0.25), 100.0, 1.0, 10**6, 10, seed=1)
+        result = mc.price_adaptive(call_payoff(100.0, 0.01, 1.0), tolerance=0.1, batch_size=5000)
+
+        self.assertTrue(result['converged'])
+        self.assertLessEqual(result['std_error'], 0.1)
+        self.assertLess(result['num_paths'], 10**6)
+        self.assertEqual(result['num_paths'], 5000 * result['num_batches'])
+
+        # One batch fewer would have missed the target
+        previous = MonteCarloMethod(LogNormalProcess(0.01, 0.25), 100.0, 1.0, result['num_paths'] - 5000, 10, seed=1)
+        self.assertGreater(previous.price_streaming(call_payoff(100.0, 0.01, 1.0), 5000)['std_error'], 0.1)
+
+    def test_harder_trades_use_more_paths(self):
+        easy = MonteCarloMethod(LogNormalProcess(0.01, 0.1), 100.0, 1.0, 10**6, 10, seed=2)
+        hard = MonteCarloMethod(LogNormalProcess(0.01, 0.5), 100.0, 1.0, 10**6, 10, seed=2)
+        easy_result = easy.price_adaptive(call_payoff(100.0, 0.01, 1.0), relative_tolerance=0.01, batch_size=2000)
+        hard_result = hard.price_adaptive(call_payoff(100.0, 0.01, 1.0), relative_tolerance=0.01, batch_size=2000)
+
+        self.assertTrue(easy_result['converged'] and hard_result['converged'])
+        self.assertLessEqual(easy_result['std_error'], 0.01 * easy_result['price'])
+        self.assertGreater(hard_result['num_paths'], easy_result['num_paths'])
+
+    def test_budget_exhausted(self):
+        mc = MonteCarloMethod(LogNormalProcess(0.01, 0.25), 100.0, 1.0, 3000, 10, seed=3)
+        result = mc.price_adaptive(call_payoff(100.0, 0.01, 1.0), tolerance=1e-4, batch_size=2000)
+        self.assertFalse(result['converged'])
+        self.assertEqual(result['num_paths'], 3000)
+        self.assertEqual(result['num_batches'], 2)
+
+    def test_greek_tolerance(self):
+        S0 = torch.tensor(100.0, requires_grad=True)
+        mc = MonteCarloMethod(LogNormalProcess(0.01, 0.25), S0, 1.0, 10**6, 10,
+                              random_source=AntitheticSource(PseudoRandomSource(seed=4)))
+        result = mc.price_adaptive(call_payoff(100.0, 0.01, 1.0), tolerance=1.0, params={'S0': S0},
+                                   greek_tolerances={'S0': 0.005}, batch_size=2000)
+
+        self.assertTrue(result['converged'])
+        self.assertGreaterEqual(result['num_batches'], 4)
+        self.assertLessEqual(result['greek_std_errors']['S0'], 0.005)
+        # Black-Scholes delta at the last grid point (0.9 years)
+        d1 = (0.01 + 0.5 * 0.25**2) * 0.9 / (0.25 * math.sqrt(0.9))
+        self.assertAlmostEqual(result['greeks']['S0'], 0.5 * (1 + math.erf(d1 / math.sqrt(2))), delta=0.02)
+
+    def test_greeks_of_a_short_last_batch(self):
+        S0 = torch.tensor(100.0, requires_grad=True)
+        mc = MonteCarloMethod(LogNormalProcess(0.01, 0.25), S0, 1.0, 5000, 10, random_source=MRG32k3aSource(a=6))
+        payoff = call_payoff(100.0, 0.01, 1.0)
+        # Batches of 2000, 2000 and 1000 paths
+        result = adaptive_price(lambda start, num_paths: payoff(mc.simulate_range(start, num_paths)), tolerance=1e-6,
+                                params={'S0': S0}, batch_size=2000, max_paths=5000)
+        self.assertEqual(result['num_batches'], 3)
+
+        # One backward pass over the whole sample
+        price = payoff(mc.simulate_range(0, 5000)).mean()
+        price.backward()
+        self.assertAlmostEqual(result['price'], price.item(), places=4)
+        self.assertAlmostEqual(result['greeks']['S0'], S0.grad.item(), places=5)
+
+    def test_longstaff_schwartz_pricer(self):
+        def pricer(start, num_paths):
+            method = LongstaffSchwartzMethod(num_paths, 24, random_source=MRG32k3aSource())
+            return method.path_values(1.0, 1.1, 0.2, 1.0, 0.05, 6, start=start, num_paths=num_paths)
+
+        result = adaptive_price(pricer, tolerance=0.002, batch_size=2000)
+        self.assertTrue(result['converged'])
+        self.assertLessEqual(result['std_error'], 0.002)
+        self.assertAlmostEqual(result['price'], 0.12, delta=0.02)
+
+    def test_requires_a_tolerance(self):
+        with self.assertRaises(ValueError):
+            adaptive_price(lambda start, num_paths: torch.zeros(num_paths))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+import unittest
+import torch
+from Engine.stochastic_process import LogNormalProcess, NormalProcess, IntensityProcess
+from Engine.random_sources import PseudoRandomSource
+from Methods.monte_carlo import MonteCarloMethod
+from Methods.binomial_tree import BinomialTreeMethod
+from Methods.longstaff_schwartz import LongstaffSchwartzMethod
+
+class MockInstrument:
+    def __init__(self, S0, strike, maturity, rate, volatility):
+        self.S0 = S0
+        self.strike = strike
+        self.maturity = maturity
+        self.rate = rate
+        self.volatility = volatility
+
+class TestBatchedScenarios(unittest.TestCase):
+    def test_spot_vol_grid_matches_single_scenarios(self):
+        spots = torch.linspace(80.0, 120.0, 200)
+        vols = torch.linspace(0.1, 0.4, 10)
+        K, r, T = 100.0, 0.02, 1.0
+
+        mc = MonteCarloMethod(LogNormalProcess(r, vols[None, :]), spots[:, None], T, 5000, 50, seed=3)
+        S_T = mc.simulate_terminal()
+        self.assertEqual(S_T.shape, (200, 10, 5000))
+        prices = torch.clamp(S_T - K, min=0).mean(dim=-1)
+
+        for i, j in [(0, 0), (57, 3), (199, 9)]:
+            single = MonteCarloMethod(LogNormalProcess(r, vols[j].item()), spots[i].item(), T, 5000, 50, seed=3)
+            expected = torch.clamp(single.simulate_terminal() - K, min=0).mean()
+            self.assertAlmostEqual(prices[i, j].item(), expected.item(), places=3)
+
+    def test_batched_paths_and_per_scenario_greeks(self):
+        spots = torch.tensor([90.0, 100.0, 110.0], requires_grad=True)
+        sigma = torch.tensor(0.2)
+        mc = MonteCarloMethod(LogNormalProcess(0.0, sigma), spots, 1.0, 2000, 20, seed=5)
+        paths = mc.simulate()
+        self.assertEqual(paths.shape, (3, 2000, 20))
+
+        # Scenarios are independent sums, so one backward pass returns every delta
+        torch.clamp(paths[..., -1] - 100.0, min=0).mean(dim=-1).sum().backward()
+        for i in range(3):
+            S0 = torch.tensor(spots[i].item(), requires_grad=True)
+            single = MonteCarloMethod(LogNormalProcess(0.0, sigma), S0, 1.0, 2000, 20, seed=5).simulate()
+            torch.clamp(single[:, -1] - 100.0, min=0).mean().backward()
+            self.assertAlmostEqual(spots.grad[i].item(), S0.grad.item(), places=4)
+
+    def test_normal_process_batched_drift(self):
+        mus = torch.tensor([-0.1, 0.0, 0.1])
+        paths = MonteCarloMethod(NormalProcess(mus, 0.3), 1.0, 1.0, 1000, 10, seed=2).simulate()
+        single = MonteCarloMethod(NormalProcess(0.1, 0.3), 1.0, 1.0, 1000, 10, seed=2).simulate()
+        self.assertEqual(paths.shape, (3, 1000, 10))
+        self.assertTrue(torch.allclose(paths[2], single, atol=1e-5))
+
+    def test_stepped_process_batch(self):
+        spots = torch.tensor([[0.8], [1.0], [1.2]])
+        nus = torch.tensor([0.2, 0.3])
+        for terminal in (False, True):
+            mc = MonteCarloMethod(IntensityProcess(1.0, 0.0, 0.5, nus), spots, 1.0, 1000, 20, seed=4, vectorized=False)
+            values = mc.simulate_terminal() if terminal else mc.simulate()[..., -1]
+            self.assertEqual(values.shape, (3, 2, 1000))
+            for i, j in [(0, 0), (2, 1)]:
+                single = MonteCarloMethod(IntensityProcess(1.0, 0.0, 0.5, nus[j].item()), spots[i, 0].item(), 1.0, 1000, 20, seed=4,
+                                          vectorized=False)
+                expected = single.simulate_terminal() if terminal else single.simulate()[:, -1]
+                self.assertTrue(torch.allclose(values[i, j], expected, atol=1e-6))
+
+    def test_streaming_statistics_reject_batched_payoffs(self):
+        mc = MonteCarloMethod(LogNormalProcess(0.02, torch.tensor([0.1, 0.2])), torch.tensor([[90.0], [110.0]]), 1.0, 2000, 10, seed=1)
+        with self.assertRaises(ValueError):
+            mc.price_streaming(lambda paths: torch.clamp(paths[..., -1] - 100.0, min=0), chunk_size=500)
+
+    def test_longstaff_schwartz_finite_difference_ladder(self):
+        # Spot and volatility bumps of a Bermudan put, priced in one pass on common draws
+        spots = torch.tensor([[1.0], [1.01], [0.99]])
+        vols = torch.tensor([0.2, 0.21])
+        for dates in (None, [0.25, 0.5, 0.75]):
+            method = LongstaffSchwartzMethod(20000, 61, random_source=PseudoRandomSource(seed=1), exercise_dates=dates)
+            prices = method.price_only(spots, 1.1, vols, 1.0, 0.05, M=6)
+            self.assertEqual(prices.shape, (3, 2))
+            for i in range(3):
+                for j in range(2):
+                    single = LongstaffSchwartzMethod(20000, 61, random_source=PseudoRandomSource(seed=1), exercise_dates=dates)
+                    self.assertAlmostEqual(prices[i, j].item(), single.price_only(spots[i, 0].item(), 1.1, vols[j].item(), 1.0, 0.05, M=6),
+                                           places=6)
+            delta = (prices[1, 0] - prices[2, 0]) / 0.02
+            self.assertTrue(-1.0 < delta.item() < 0.0)
+
+        # Statistics per scenario, with the European put as a control variate
+        method = LongstaffSchwartzMethod(20000, 61, random_source=PseudoRandomSource(seed=1))
+        result = method.estimate(spots, 1.1, vols, 1.0, 0.05, M=6, control_variate=True)
+        for name in ('price', 'std_error', 'variance_reduction_factor'):
+            self.assertEqual(result[name].shape, (3, 2))
+        single = LongstaffSchwartzMethod(20000, 61, random_source=PseudoRandomSource(seed=1)).estimate(
+            1.01, 1.1, 0.21, 1.0, 0.05, M=6, control_variate=True)
+        self.assertAlmostEqual(result['price'][1, 1].item(), single['price'].item(), places=5)
+        self.assertAlmostEqual(result['std_error'][1, 1].item(), single['std_error'], places=6)
+
+    def test_binomial_tree_batched_matches_loop(self):
+        instrument = MockInstrument(100.0, 95.0, 0.5, 0.05, 0.25)
+        method = BinomialTreeMethod(50, exercise_times=[0.25, 0.5])
+        spots = torch.linspace(80.0, 120.0, 5)
+        vols = torch.tensor([0.15, 0.25])
+
+        prices = method.price(instrument, S0=spots[:, None], sigma=vols[None, :])
+        self.assertEqual(prices.shape, (5, 2))
+        for i in range(5):
+            for j in range(2):
+                expected = method.price(instrument, S0=spots[i].item(), sigma=vols[j].item())
+                self.assertAlmostEqual(prices[i, j].item(), expected.item(), places=10)
+
+if __name__ == '__main__':
+    unittest.main()
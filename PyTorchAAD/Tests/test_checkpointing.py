@@ -0,0 +1,98 @@
+import unittest
+import torch
+from Engine.random_sources import PseudoRandomSource
+from Engine.simulator import segment_steps, simulate_multi_factor
+from Methods.longstaff_schwartz import LongstaffSchwartzMethod
+from Methods.longstaff_schwartz_best_of_two_assets import LongstaffSchwartzMethodBestOf2Assets
+from Models.dynamics import HestonProcess
+
+def saved_bytes(function):
+    """Bytes of the distinct storages autograd saves for the backward pass of `function()`."""
+    storages = {}
+
+    def pack(x):
+        storages[x.untyped_storage().data_ptr()] = x.untyped_storage().nbytes()
+        return x
+
+    with torch.autograd.graph.saved_tensors_hooks(pack, lambda x: x):
+        function()
+    return sum(storages.values())
+
+class TestCheckpointing(unittest.TestCase):
+    def test_segment_steps(self):
+        self.assertEqual(segment_steps(2**20, 1000, 2), 16)
+        self.assertEqual(segment_steps(1, 1000, 2), 1)
+
+    def test_longstaff_schwartz_greeks_unchanged(self):
+        greeks = [LongstaffSchwartzMethod(num_paths=4000, num_steps=100, random_source=PseudoRandomSource(seed=1),
+                                          memory_budget=budget).calculate_greeks(100.0, 100.0, 0.2, 1.0, 0.05, M=10)
+                  for budget in (None, 2**20)]
+        for name in greeks[0]:
+            self.assertAlmostEqual(greeks[0][name], greeks[1][name], delta=1e-4 * max(1.0, abs(greeks[0][name])))
+
+    def test_stepped_process_gradients_unchanged(self):
+        grads = []
+        for budget in (None, 2**16):
+            S0 = torch.tensor(100.0, requires_grad=True)
+            process = HestonProcess(0.04, 0.03, 1.5, 0.04, 0.5, -0.7)
+            paths = simulate_multi_factor(process, torch.stack([S0, torch.tensor(0.04)]), 1 / 24, 24, 1000,
+                                          PseudoRandomSource(seed=3), memory_budget=budget)
+            paths[:, :, 0].mean().backward()
+            grads.append(S0.grad.item())
+        self.assertAlmostEqual(grads[0], grads[1], places=5)
+
+    def test_saved_memory_is_bounded(self):
+        num_paths, num_steps = 20000, 200
+        paths_bytes = num_paths * (num_steps + 1) * 2 * 4
+
+        def simulate(budget):
+            S0 = torch.tensor(100.0, requires_grad=True)
+            process = HestonProcess(0.04, 0.03, 1.5, 0.04, 0.5, -0.7)
+            return lambda: simulate_multi_factor(process, torch.stack([S0, torch.tensor(0.04)]), 0.01, num_steps,
+                                                 num_paths, PseudoRandomSource(seed=4), memory_budget=budget)
+
+        self.assertGreater(saved_bytes(simulate(None)), 10 * paths_bytes)
+        # The draws, the paths and one segment at a time
+        self.assertLess(saved_bytes(simulate(2**22)), 2.5 * paths_bytes)
+
+    def test_longstaff_schwartz_saved_memory(self):
+        sigma = torch.tensor(0.2, requires_grad=True)
+        saved = [saved_bytes(lambda: LongstaffSchwartzMethod(20000, 201, PseudoRandomSource(seed=5), memory_budget=budget)
+                             .simulate_paths(100.0, sigma, 1.0, 0.05))
+                 for budget in (None, 2**22)]
+        self.assertLess(saved[1], 0.7 * saved[0])
+
+    def test_bermudan_greeks_with_memory_budget(self):
+        # Shape of the Bermudan Greeks tests (360 steps, M=30) on fewer paths
+        num_paths, num_steps = 10000, 360
+        paths_bytes = num_paths * num_steps * 4
+
+        def method(budget):
+            return LongstaffSchwartzMethod(num_paths, num_steps, PseudoRandomSource(seed=8), memory_budget=budget)
+
+        greeks = [method(budget).calculate_greeks(1.0, 0.9, 0.2, 1.0, 0.15, M=30) for budget in (None, 2**21)]
+        for name in greeks[0]:
+            self.assertAlmostEqual(greeks[0][name], greeks[1][name], delta=1e-4 * max(1.0, abs(greeks[0][name])))
+
+        saved = []
+        for budget in (None, 2**21):
+            S0, sigma, T, r = (torch.tensor(x, requires_grad=True) for x in (1.0, 0.2, 1.0, 0.15))
+            saved.append(saved_bytes(lambda: method(budget).price(S0, 0.9, sigma, T, r, M=30)))
+        # The draws, the paths and one segment at a time
+        self.assertLess(saved[1], 3 * paths_bytes)
+        self.assertLess(saved[1], 0.8 * saved[0])
+
+    def test_best_of_two_greeks_saved_memory(self):
+        # Configuration of the best-of-two Greeks test: 50k paths, 365 steps, exercise every 100 steps
+        num_paths, num_steps = 50000, 365
+        grid_bytes = num_paths * num_steps * 2 * 4
+        params = [torch.tensor(x, requires_grad=True) for x in (90.0, 100.0, 0.4, 0.4, 1.0, 0.04)]
+        S0_1, S0_2, sigma1, sigma2, T, r = params
+        method = LongstaffSchwartzMethodBestOf2Assets(num_paths, num_steps, PseudoRandomSource(seed=6))
+        saved = saved_bytes(lambda: method.price(S0_1, S0_2, 100.0, sigma1, sigma2, T, r, M=100))
+        # Only the exercise dates are on the tape, not the 146 MB grid of both assets
+        self.assertLess(saved, 32 * 2**20)
+        self.assertLess(saved, grid_bytes / 10)
+
+if __name__ == '__main__':
+    unittest.main()
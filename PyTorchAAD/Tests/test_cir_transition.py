@@ -0,0 +1,74 @@
+import math
+import unittest
+import torch
+from Engine.random_sources import PseudoRandomSource
+from Engine.simulator import simulate_dates
+from Engine.stochastic_process import IntensityProcess, CIRPlusPlusProcess
+from Methods.monte_carlo import MonteCarloMethod
+
+def cir_survival(lambda_0, k, mu, nu, T):
+    """Closed-form E[exp(-int_0^T lambda dt)] of the CIR intensity."""
+    h = math.sqrt(k**2 + 2 * nu**2)
+    denominator = 2 * h + (k + h) * (math.exp(h * T) - 1)
+    A = (2 * h * math.exp((k + h) * T / 2) / denominator)**(2 * k * mu / nu**2)
+    B = 2 * (math.exp(h * T) - 1) / denominator
+    return A * math.exp(-B * lambda_0), B
+
+class TestCIRTransition(unittest.TestCase):
+    def check_moments(self, k, mu, nu, lambda_0=1.0, T=2.0, num_paths=200000):
+        x0 = torch.tensor(lambda_0, requires_grad=True)
+        process = IntensityProcess(mu=mu, sigma=0.0, k=k, nu=nu, seed=1)
+        Z = PseudoRandomSource(seed=2).normals(num_paths, 1)[:, 0]
+        x_T = process.transition(x0.expand(num_paths), T, Z)
+        x_T.mean().backward()
+
+        e = math.exp(-k * T)
+        mean = lambda_0 * e + mu * (1 - e)
+        variance = lambda_0 * nu**2 / k * (e - e**2) + mu * nu**2 / (2 * k) * (1 - e)**2
+        self.assertTrue(torch.all(x_T >= 0))
+        self.assertAlmostEqual(x_T.mean().item(), mean, delta=4 * math.sqrt(variance / num_paths))
+        self.assertAlmostEqual(x_T.var().item(), variance, delta=0.03 * variance)
+        # d E[x_T] / d lambda_0 = e^{-kT}
+        self.assertAlmostEqual(x0.grad.item(), e, delta=0.01)
+
+    def test_moments_reparameterised(self):
+        # d = 4 k mu / nu^2 = 32
+        self.check_moments(k=0.5, mu=1.0, nu=0.25)
+
+    def test_moments_poisson_mixture(self):
+        # d = 4 k mu / nu^2 < 1, zero is reachable
+        self.check_moments(k=0.5, mu=0.5, nu=1.5)
+
+    def test_survival_on_a_dozen_dates(self):
+        lambda_0, k, mu, nu, T = 1.0, 0.5, 1.0, 0.25, 2.0
+        x0 = torch.tensor(lambda_0, requires_grad=True)
+        process = IntensityProcess(mu=mu, sigma=0.0, k=k, nu=nu, scheme="exact", seed=3)
+        dates = [T * (j + 1) / 12 for j in range(12)]
+        lambdas = simulate_dates(process, x0, dates, 100000, PseudoRandomSource(seed=4))
+        self.assertEqual(lambdas.shape, (100000, 13))
+
+        dt = T / 12
+        integrated_intensity = torch.sum(0.5 * (lambdas[:, 1:] + lambdas[:, :-1]) * dt, dim=1)
+        survival = torch.exp(-integrated_intensity).mean()
+        survival.backward()
+
+        expected, B = cir_survival(lambda_0, k, mu, nu, T)
+        self.assertAlmostEqual(survival.item(), expected, delta=0.002)
+        self.assertAlmostEqual(x0.grad.item(), -B * expected, delta=0.005)
+
+    def test_exact_scheme_in_engine(self):
+        for process in (IntensityProcess(mu=0.5, sigma=0.0, k=0.5, nu=1.5, scheme="exact", seed=5),
+                        CIRPlusPlusProcess(mu=1.0, sigma=0.0, k=0.5, theta=0.0, nu=0.25, phi=lambda t: 0.0,
+                                           scheme="exact", seed=5)):
+            lambda_0 = torch.tensor(1.0, requires_grad=True)
+            paths = MonteCarloMethod(process, lambda_0, 2.0, num_paths=20000, num_steps=13, seed=6).simulate()
+            self.assertTrue(torch.all(paths >= 0))
+            paths[:, -1].mean().backward()
+            self.assertGreater(lambda_0.grad.item(), 0.0)
+
+    def test_invalid_scheme(self):
+        with self.assertRaises(ValueError):
+            IntensityProcess(mu=1.0, sigma=0.0, k=0.5, nu=0.25, scheme="milstein")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -31,9 +31,9 @@ class TestEuropeanOption(unittest.TestCase):
 
         process = LogNormalProcess(r, sigma)
         mc = MonteCarloMethod(process, S0, T, num_paths, num_steps)
-        paths = mc.simulate()
+        S_T = mc.simulate_terminal()  # Only the terminal value is needed
 
-        payoffs = torch.maximum(paths[:, -1] - K, torch.tensor(0.0))  # Max(S_T - K, 0)
+        payoffs = torch.maximum(S_T - K, torch.tensor(0.0))  # Max(S_T - K, 0)
         # Convert r and T to tensors before using them in torch.exp
         discount_factors = torch.exp(-torch.tensor(r, dtype=torch.float32) * T)
         option_price = torch.mean(discount_factors * payoffs)
@@ -0,0 +1,89 @@
+import math
+import unittest
+import torch
+from Engine.random_sources import PseudoRandomSource
+from Engine.simulator import simulate_dates
+from Engine.stochastic_process import CorrelatedLogNormalProcess
+from Models.black_scholes import black_scholes_price
+from Models.dynamics import HestonProcess
+from Methods.longstaff_schwartz import LongstaffSchwartzMethod
+from Methods.longstaff_schwartz_best_of_two_assets import LongstaffSchwartzMethodBestOf2Assets
+
+class TestExerciseSchedule(unittest.TestCase):
+    def test_paths_stored_on_exercise_dates_only(self):
+        dates = [k / 12 for k in range(1, 12)]
+        method = LongstaffSchwartzMethod(1000, random_source=PseudoRandomSource(seed=1), exercise_dates=dates)
+        Sp = method.simulate_paths(1.0, 0.2, 1.0, 0.05)
+        self.assertEqual(Sp.shape, (1000, 13))
+        # 1000-step grid of the default engine
+        self.assertGreater(LongstaffSchwartzMethod(1000).num_steps / Sp.shape[1], 70)
+
+    def test_bermudan_between_european_and_more_exercise_dates(self):
+        european = black_scholes_price(1.0, 1.1, 1.0, 0.05, 0.2, option_type="put").item()
+        prices = []
+        for dates in ([], [0.5], [k / 12 for k in range(1, 12)]):
+            method = LongstaffSchwartzMethod(200000, random_source=PseudoRandomSource(seed=2), exercise_dates=dates)
+            result = method.estimate(1.0, 1.1, 0.2, 1.0, 0.05)
+            prices.append((result['price'].item(), result['std_error']))
+
+        self.assertAlmostEqual(prices[0][0], european, delta=3 * prices[0][1])
+        self.assertGreater(prices[1][0], prices[0][0] + 0.003)
+        self.assertGreater(prices[2][0], prices[1][0] + 0.003)
+        # Below the intrinsic value plus the time value of an American put (about 0.12)
+        self.assertLess(prices[2][0], 0.125)
+
+    def test_grid_matches_schedule_on_the_same_dates(self):
+        # 13-point grid with dt = 0.1: exercise every 3 steps at 0.2, 0.5, 0.8, 1.1, last point at 1.2
+        grid = LongstaffSchwartzMethod(100000, 13, random_source=PseudoRandomSource(seed=6)).estimate(
+            1.0, 1.1, 0.2, 1.3, 0.05, M=3)
+        schedule = LongstaffSchwartzMethod(100000, random_source=PseudoRandomSource(seed=7),
+                                           exercise_dates=[0.2, 0.5, 0.8, 1.1]).estimate(1.0, 1.1, 0.2, 1.2, 0.05)
+        std_error = math.hypot(grid['std_error'], schedule['std_error'])
+        self.assertAlmostEqual(grid['price'].item(), schedule['price'].item(), delta=4 * std_error)
+
+    def test_greeks_and_price_only(self):
+        dates = [0.25, 0.5, 0.75]
+        S0 = torch.tensor(1.0, requires_grad=True)
+        T = torch.tensor(1.0, requires_grad=True)
+        method = LongstaffSchwartzMethod(50000, random_source=PseudoRandomSource(seed=3), exercise_dates=dates)
+        price = method.estimate(S0, 1.1, 0.2, T, 0.05)['price']
+        price.backward()
+
+        reference = LongstaffSchwartzMethod(50000, random_source=PseudoRandomSource(seed=3), exercise_dates=dates)
+        self.assertAlmostEqual(price.item(), reference.price_only(1.0, 1.1, 0.2, 1.0, 0.05), places=5)
+        self.assertLess(S0.grad.item(), -0.4)
+        self.assertGreater(S0.grad.item(), -0.9)
+        self.assertTrue(math.isfinite(T.grad.item()))
+
+    def test_best_of_two_schedule(self):
+        dates = [0.25, 0.5, 0.75]
+        method = LongstaffSchwartzMethodBestOf2Assets(50000, random_source=PseudoRandomSource(seed=4), exercise_dates=dates)
+        price = method.price(1.0, 1.0, 1.0, 0.2, 0.3, 1.0, 0.05, rho=0.5)
+
+        reference = LongstaffSchwartzMethodBestOf2Assets(50000, random_source=PseudoRandomSource(seed=4), exercise_dates=dates)
+        self.assertAlmostEqual(price.item(), reference.price_only(1.0, 1.0, 1.0, 0.2, 0.3, 1.0, 0.05, rho=0.5), places=5)
+        self.assertGreater(price.item(), 0.1)
+
+    def test_correlated_gbm_jumps_between_dates(self):
+        process = CorrelatedLogNormalProcess(0.05, [0.2, 0.3], [[1.0, 0.6], [0.6, 1.0]])
+        S = simulate_dates(process, torch.tensor([1.0, 2.0]), [0.3, 1.0], 200000, PseudoRandomSource(seed=5))
+        self.assertEqual(S.shape, (200000, 3, 2))
+
+        for j, (S0, sigma) in enumerate(((1.0, 0.2), (2.0, 0.3))):
+            self.assertAlmostEqual(S[:, 2, j].mean().item(), S0 * math.exp(0.05), delta=0.01 * S0)
+            self.assertAlmostEqual(torch.log(S[:, 1, j]).std().item(), sigma * math.sqrt(0.3), delta=0.003)
+        returns = torch.log(S[:, 2] / S[:, 1])
+        self.assertAlmostEqual(torch.corrcoef(returns.T)[0, 1].item(), 0.6, delta=0.01)
+
+    def test_sub_stepping_without_exact_transition(self):
+        process = HestonProcess(0.04, 0.03, 1.5, 0.04, 0.3, -0.7)
+        with self.assertRaises(ValueError):
+            simulate_dates(process, process.initial_state(100.0), [0.5, 1.0], 10)
+
+        S = simulate_dates(process, process.initial_state(100.0), [0.5, 1.0], 100000, PseudoRandomSource(seed=6), max_dt=0.02)
+        self.assertEqual(S.shape, (100000, 3, 2))
+        self.assertAlmostEqual(S[:, 2, 0].mean().item(), 100.0 * math.exp(0.03), delta=0.3)
+        self.assertAlmostEqual(S[:, 2, 1].mean().item(), 0.04, delta=0.002)
+
+if __name__ == '__main__':
+    unittest.main()
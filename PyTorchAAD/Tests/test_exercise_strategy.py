@@ -0,0 +1,66 @@
+import unittest
+import torch
+from Engine.random_sources import PseudoRandomSource
+from Methods.longstaff_schwartz import LongstaffSchwartzMethod, ExerciseStrategy
+
+def recorded_float64_bytes(run):
+    # The regressions are the only float64 work of the engine (normal equations)
+    recorded = []
+    def pack(tensor):
+        if tensor.dtype == torch.float64:
+            recorded.append(tensor.numel() * tensor.element_size())
+        return tensor
+    with torch.autograd.graph.saved_tensors_hooks(pack, lambda tensor: tensor):
+        result = run()
+    return result, sum(recorded)
+
+class TestExerciseStrategy(unittest.TestCase):
+    def test_two_pass_price_close_to_one_pass(self):
+        method = LongstaffSchwartzMethod(100000, 61, random_source=PseudoRandomSource(seed=1))
+        strategy = method.fit_strategy(1.0, 1.1, 0.2, 1.0, 0.05, M=3)
+        self.assertIsInstance(strategy, ExerciseStrategy)
+        self.assertEqual(len(strategy.coefficients), len(range(59, 0, -3)))
+
+        two_pass = method.estimate(1.0, 1.1, 0.2, 1.0, 0.05, M=3, strategy=strategy)
+        one_pass = LongstaffSchwartzMethod(100000, 61, random_source=PseudoRandomSource(seed=2)).estimate(1.0, 1.1, 0.2, 1.0, 0.05, M=3)
+        std_error = (two_pass['std_error']**2 + one_pass['std_error']**2)**0.5
+        self.assertAlmostEqual(two_pass['price'].item(), one_pass['price'].item(), delta=4 * std_error)
+
+    def test_no_regression_on_the_tape(self):
+        method = LongstaffSchwartzMethod(20000, 61, random_source=PseudoRandomSource(seed=3))
+        strategy = method.fit_strategy(1.0, 1.1, 0.2, 1.0, 0.05, M=3)
+
+        S0 = torch.tensor(1.0, requires_grad=True)
+        frozen, frozen_bytes = recorded_float64_bytes(lambda: method.estimate(S0, 1.1, 0.2, 1.0, 0.05, M=3, strategy=strategy)['price'])
+        _, regressed_bytes = recorded_float64_bytes(lambda: method.estimate(S0, 1.1, 0.2, 1.0, 0.05, M=3)['price'])
+        self.assertEqual(frozen_bytes, 0)
+        self.assertGreater(regressed_bytes, 20000 * 3 * 8)
+
+        frozen.backward()
+        self.assertLess(S0.grad.item(), -0.4)
+        self.assertGreater(S0.grad.item(), -0.9)
+
+    def test_strategy_reused_across_spot_moves(self):
+        method = LongstaffSchwartzMethod(100000, random_source=PseudoRandomSource(seed=4), exercise_dates=[0.25, 0.5, 0.75])
+        strategy = method.fit_strategy(1.0, 1.1, 0.2, 1.0, 0.05)
+        for S0 in (0.98, 1.02):
+            reused = method.estimate(S0, 1.1, 0.2, 1.0, 0.05, strategy=strategy)
+            fresh = method.estimate(S0, 1.1, 0.2, 1.0, 0.05)
+            self.assertAlmostEqual(reused['price'].item(), fresh['price'].item(), delta=4 * reused['std_error'])
+
+    def test_two_pass_greeks(self):
+        greeks = LongstaffSchwartzMethod(50000, 61, random_source=PseudoRandomSource(seed=5)).calculate_greeks(
+            1.0, 1.1, 0.2, 1.0, 0.05, M=3, two_pass=True)
+        reference = LongstaffSchwartzMethod(50000, 61, random_source=PseudoRandomSource(seed=5)).calculate_greeks(
+            1.0, 1.1, 0.2, 1.0, 0.05, M=3)
+        self.assertAlmostEqual(greeks['Delta'], reference['Delta'], delta=0.05)
+        self.assertAlmostEqual(greeks['Vega'], reference['Vega'], delta=0.05)
+
+    def test_mismatched_exercise_dates(self):
+        method = LongstaffSchwartzMethod(1000, 61, random_source=PseudoRandomSource(seed=6))
+        strategy = method.fit_strategy(1.0, 1.1, 0.2, 1.0, 0.05, M=3)
+        with self.assertRaises(ValueError):
+            method.estimate(1.0, 1.1, 0.2, 1.0, 0.05, M=6, strategy=strategy)
+
+if __name__ == '__main__':
+    unittest.main()
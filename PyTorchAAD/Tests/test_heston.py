@@ -0,0 +1,85 @@
+import cmath
+import math
+import unittest
+import torch
+from Engine.random_sources import PseudoRandomSource
+from Engine.simulator import simulate_multi_factor
+from Methods.monte_carlo import MonteCarloMethod
+from Models.dynamics import HestonProcess
+
+S0, K, T, r = 100.0, 100.0, 1.0, 0.03
+kappa, theta, sigma, rho, v0 = 1.5, 0.04, 0.5, -0.7, 0.04
+
+def heston_call(S0, K, T, r, kappa, theta, sigma, rho, v0, u_max=200.0, n=4000):
+    """Semi-analytic Heston call price (characteristic function in the 'little trap' form)."""
+    x = math.log(S0)
+
+    def probability(j):
+        u_j, b_j = (0.5, kappa - rho * sigma) if j == 1 else (-0.5, kappa)
+        total, du = 0.0, u_max / n
+        for i in range(1, n + 1):
+            u = i * du
+            d = cmath.sqrt((rho * sigma * 1j * u - b_j)**2 - sigma**2 * (2 * u_j * 1j * u - u**2))
+            g = (b_j - rho * sigma * 1j * u - d) / (b_j - rho * sigma * 1j * u + d)
+            C = r * 1j * u * T + kappa * theta / sigma**2 * (
+                (b_j - rho * sigma * 1j * u - d) * T - 2 * cmath.log((1 - g * cmath.exp(-d * T)) / (1 - g)))
+            D = (b_j - rho * sigma * 1j * u - d) / sigma**2 * (1 - cmath.exp(-d * T)) / (1 - g * cmath.exp(-d * T))
+            f = cmath.exp(C + D * v0 + 1j * u * x)
+            integrand = (cmath.exp(-1j * u * math.log(K)) * f / (1j * u)).real
+            total += integrand * (0.5 if i == n else 1.0) * du
+        return 0.5 + total / math.pi
+
+    return S0 * probability(1) - K * math.exp(-r * T) * probability(2)
+
+class TestHeston(unittest.TestCase):
+    def simulate(self, spot, scheme="qe", num_steps=12, num_paths=50000, seed=7):
+        process = HestonProcess(v0, r, kappa, theta, sigma, rho, scheme=scheme)
+        return simulate_multi_factor(process, process.initial_state(spot), T / num_steps, num_steps, num_paths,
+                                     PseudoRandomSource(seed=seed))
+
+    def call_values(self, paths):
+        return torch.clamp(paths[:, -1, 0] - K, min=0) * math.exp(-r * T)
+
+    def test_qe_price_and_delta(self):
+        spot = torch.tensor(S0, requires_grad=True)
+        values = self.call_values(self.simulate(spot))
+        price = values.mean()
+        price.backward()
+
+        reference = heston_call(S0, K, T, r, kappa, theta, sigma, rho, v0)
+        std_error = values.std().item() / math.sqrt(values.numel())
+        self.assertAlmostEqual(price.item(), reference, delta=4 * std_error)
+
+        bump = 0.01 * S0
+        fd_delta = (heston_call(S0 + bump, K, T, r, kappa, theta, sigma, rho, v0)
+                    - heston_call(S0 - bump, K, T, r, kappa, theta, sigma, rho, v0)) / (2 * bump)
+        self.assertAlmostEqual(spot.grad.item(), fd_delta, delta=0.02)
+
+    def test_qe_moments(self):
+        paths = self.simulate(torch.tensor(S0))
+        self.assertTrue(torch.all(paths[:, :, 1] >= 0))
+        # Martingale correction: the discounted spot is a martingale
+        self.assertAlmostEqual((paths[:, -1, 0].mean() * math.exp(-r * T)).item(), S0, delta=0.3)
+        expected_variance = theta + (v0 - theta) * math.exp(-kappa * T)
+        self.assertAlmostEqual(paths[:, -1, 1].mean().item(), expected_variance, delta=0.001)
+
+    def test_qe_beats_euler_on_coarse_grid(self):
+        reference = heston_call(S0, K, T, r, kappa, theta, sigma, rho, v0)
+        qe = self.call_values(self.simulate(torch.tensor(S0), "qe", num_steps=4)).mean().item()
+        euler = self.call_values(self.simulate(torch.tensor(S0), "euler", num_steps=4)).mean().item()
+        self.assertLess(abs(qe - reference), abs(euler - reference))
+
+    def test_monte_carlo_method(self):
+        process = HestonProcess(v0, r, kappa, theta, sigma, rho)
+        mc = MonteCarloMethod(process, process.initial_state(S0), T, num_paths=1000, num_steps=13, seed=3)
+        paths = mc.simulate()
+        self.assertEqual(paths.shape, (1000, 13, 2))
+        self.assertTrue(torch.all(paths[:, 0, 0] == S0))
+        self.assertTrue(torch.allclose(mc.simulate_terminal(), paths[:, -1]))
+
+    def test_invalid_scheme(self):
+        with self.assertRaises(ValueError):
+            HestonProcess(v0, r, kappa, theta, sigma, rho, scheme="milstein")
+
+if __name__ == '__main__':
+    unittest.main()
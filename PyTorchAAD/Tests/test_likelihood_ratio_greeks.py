@@ -0,0 +1,69 @@
+import math
+import unittest
+import torch
+from Engine.stochastic_process import LogNormalProcess, IntensityProcess
+from Methods.monte_carlo import MonteCarloMethod
+
+def normal_pdf(x):
+    return math.exp(-0.5 * x**2) / math.sqrt(2 * math.pi)
+
+def normal_cdf(x):
+    return 0.5 * (1 + math.erf(x / math.sqrt(2)))
+
+class TestLikelihoodRatioGreeks(unittest.TestCase):
+    S0, K, r, sigma = 100.0, 105.0, 0.03, 0.25
+
+    def method(self, num_paths=200000):
+        # 51 grid points: the terminal value sits at T = 1
+        return MonteCarloMethod(LogNormalProcess(self.r, self.sigma), self.S0, 51 / 50, num_paths, 51, seed=11)
+
+    def d1_d2(self, T):
+        d1 = (math.log(self.S0 / self.K) + (self.r + 0.5 * self.sigma**2) * T) / (self.sigma * math.sqrt(T))
+        return d1, d1 - self.sigma * math.sqrt(T)
+
+    def assert_greeks(self, result, expected, num_se=4.0):
+        for name, value in expected.items():
+            self.assertAlmostEqual(result[name], value, delta=num_se * result['std_errors'][name] + 1e-6, msg=name)
+
+    def test_call_greeks(self):
+        d1, d2 = self.d1_d2(1.0)
+        expected = {
+            'price': self.S0 * normal_cdf(d1) - self.K * math.exp(-self.r) * normal_cdf(d2),
+            'delta': normal_cdf(d1),
+            'gamma': normal_pdf(d1) / (self.S0 * self.sigma),
+            'vega': self.S0 * normal_pdf(d1)
+        }
+        call = lambda S_T: math.exp(-self.r) * torch.clamp(S_T - self.K, min=0)
+        for mode in ("likelihood_ratio", "vibrato"):
+            self.assert_greeks(self.method().likelihood_ratio_greeks(call, mode), expected)
+
+    def test_digital_greeks(self):
+        d1, d2 = self.d1_d2(1.0)
+        discount = math.exp(-self.r)
+        expected = {
+            'price': discount * normal_cdf(d2),
+            'delta': discount * normal_pdf(d2) / (self.S0 * self.sigma),
+            'gamma': -discount * normal_pdf(d2) * d1 / (self.S0**2 * self.sigma**2),
+            'vega': -discount * normal_pdf(d2) * d1 / self.sigma
+        }
+        digital = lambda S_T: discount * (S_T > self.K).to(S_T.dtype)
+        results = {mode: self.method().likelihood_ratio_greeks(digital, mode) for mode in ("likelihood_ratio", "vibrato")}
+        for result in results.values():
+            self.assert_greeks(result, expected)
+        # Stable gamma of a digital with 200k paths, relative to its natural scale delta / S0
+        self.assertLess(results['likelihood_ratio']['std_errors']['gamma'], 0.05 * expected['delta'] / self.S0)
+
+        # Pathwise AAD through the indicator has no derivative at all
+        S0 = torch.tensor(self.S0, requires_grad=True)
+        S_T = MonteCarloMethod(LogNormalProcess(self.r, self.sigma), S0, 51 / 50, 1000, 51, seed=11).simulate_terminal()
+        self.assertFalse(digital(S_T).requires_grad)
+
+    def test_invalid_arguments(self):
+        payoff = lambda S_T: S_T
+        with self.assertRaises(ValueError):
+            self.method(10).likelihood_ratio_greeks(payoff, "pathwise")
+        with self.assertRaises(ValueError):
+            MonteCarloMethod(IntensityProcess(1.0, 0.0, 0.5, 0.25), 1.0, 1.0, 10, 10).likelihood_ratio_greeks(payoff)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+import torch
+from Engine.basis import TensorProductBasis
+from Engine.random_sources import PseudoRandomSource
+from Methods.longstaff_schwartz import LongstaffSchwartzMethod
+from Methods.longstaff_schwartz_best_of_two_assets import LongstaffSchwartzMethodBestOf2Assets
+from Methods.longstaff_schwartz_multi_asset import (LongstaffSchwartzMethodMultiAsset, worst_of, best_of, basket,
+                                                    spread)
+
+DATES = [0.25, 0.5, 0.75]
+
+class TestLongstaffSchwartzMultiAsset(unittest.TestCase):
+    def test_payoffs(self):
+        S = torch.tensor([[90.0, 110.0], [120.0, 100.0]])
+        self.assertTrue(torch.equal(worst_of(100.0)(S), torch.tensor([10.0, 0.0])))
+        self.assertTrue(torch.equal(best_of(100.0)(S), torch.tensor([10.0, 20.0])))
+        self.assertTrue(torch.equal(basket(100.0, [0.5, 0.5], 'put')(S), torch.tensor([0.0, 0.0])))
+        self.assertTrue(torch.equal(spread(0.0)(S), torch.tensor([0.0, 20.0])))
+        with self.assertRaises(ValueError):
+            worst_of(100.0, 'straddle')
+
+    def test_matches_the_best_of_two_assets_engine(self):
+        expected = LongstaffSchwartzMethodBestOf2Assets(20000, random_source=PseudoRandomSource(seed=1), exercise_dates=DATES).price_only(
+            100.0, 100.0, 110.0, 0.2, 0.3, 1.0, 0.05, rho=0.3)
+        method = LongstaffSchwartzMethodMultiAsset(20000, random_source=PseudoRandomSource(seed=1), exercise_dates=DATES,
+                                                   basis=TensorProductBasis('monomial', order=3))
+        price = method.price_only([100.0, 100.0], worst_of(110.0), [0.2, 0.3], 1.0, 0.05, correlation=0.3)
+        self.assertAlmostEqual(price, expected, places=4)
+
+    def test_matches_the_single_asset_engine(self):
+        expected = LongstaffSchwartzMethod(20000, random_source=PseudoRandomSource(seed=2), exercise_dates=DATES).price_only(
+            1.0, 1.1, 0.2, 1.0, 0.05)
+        method = LongstaffSchwartzMethodMultiAsset(20000, random_source=PseudoRandomSource(seed=2), exercise_dates=DATES)
+        self.assertAlmostEqual(method.price_only([1.0], basket(1.1, [1.0], 'put'), [0.2], 1.0, 0.05), expected, places=5)
+
+    def test_chunks_do_not_change_the_price(self):
+        args = ([100.0] * 10, basket(100.0, [0.1] * 10, 'put'), [0.2] * 10, 1.0, 0.05)
+        basis = TensorProductBasis('hermite', order=3, interaction=2)
+        whole = LongstaffSchwartzMethodMultiAsset(20000, random_source=PseudoRandomSource(seed=3), exercise_dates=DATES,
+                                                  basis=basis).price_only(*args, correlation=0.5)
+        chunked = LongstaffSchwartzMethodMultiAsset(20000, random_source=PseudoRandomSource(seed=3), exercise_dates=DATES,
+                                                    basis=basis, chunk_size=3000).price_only(*args, correlation=0.5)
+        self.assertAlmostEqual(whole, chunked, places=5)
+
+    def test_greeks(self):
+        method = LongstaffSchwartzMethodMultiAsset(20000, 61, random_source=PseudoRandomSource(seed=4))
+        greeks = method.calculate_greeks([100.0, 100.0, 90.0], best_of(100.0), [0.2, 0.3, 0.25], 1.0, 0.05, M=6,
+                                         correlation=0.4, two_pass=True)
+        self.assertEqual(len(greeks['Delta']), 3)
+        self.assertTrue(all(0.0 < delta < 1.0 for delta in greeks['Delta']))
+        self.assertTrue(all(vega > 0.0 for vega in greeks['Vega']))
+
+if __name__ == '__main__':
+    unittest.main()
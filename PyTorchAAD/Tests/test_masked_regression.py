@@ -0,0 +1,71 @@
+import unittest
+import torch
+from Engine.regression import RegressionWorkspace, masked_regression, normal_equations
+from Engine.basis import HermiteBasis
+from Engine.random_sources import PseudoRandomSource
+from Methods.longstaff_schwartz import LongstaffSchwartzMethod, hermite_basis
+
+class TestMaskedRegression(unittest.TestCase):
+    def test_matches_least_squares_on_the_selected_rows(self):
+        torch.manual_seed(0)
+        X = torch.exp(0.2 * torch.randn(20000))
+        Y = torch.clamp(1.1 - X * torch.exp(0.1 * torch.randn(20000)), min=0)
+        mask = X < 1.1
+        A = hermite_basis(X)
+
+        coeffs = masked_regression(A, Y, mask)
+        expected = torch.linalg.lstsq(A[mask].double(), Y[mask].double()).solution
+        self.assertEqual(coeffs.dtype, torch.float32)
+        self.assertTrue(torch.allclose(coeffs.double(), expected, rtol=1e-4, atol=1e-5))
+
+    def test_empty_selection_gives_zero_coefficients_and_finite_gradients(self):
+        X = torch.linspace(1.0, 2.0, 100, requires_grad=True)
+        A = hermite_basis(X)
+        coeffs = masked_regression(A, X * 2, torch.zeros(100, dtype=torch.bool))
+        self.assertTrue(torch.equal(coeffs, torch.zeros(3)))
+        (A @ coeffs).sum().backward()
+        self.assertTrue(torch.isfinite(X.grad).all())
+
+    def test_gradients_match_the_gathered_regression(self):
+        X = torch.linspace(0.5, 1.5, 200, dtype=torch.float64, requires_grad=True)
+        mask = X.detach() < 1.2
+
+        A = hermite_basis(X)
+        masked = (A @ masked_regression(A, torch.sin(3 * X), mask, ridge=0.0))[mask].sum()
+        grad, = torch.autograd.grad(masked, X)
+        A = hermite_basis(X[mask])
+        gathered = (A @ torch.linalg.lstsq(A, torch.sin(3 * X[mask])).solution).sum()
+        expected, = torch.autograd.grad(gathered, X)
+        self.assertTrue(torch.allclose(grad, expected, atol=1e-8))
+
+    def test_workspace_buffers_are_reused_across_dates(self):
+        torch.manual_seed(1)
+        workspace, basis = RegressionWorkspace(), HermiteBasis(3)
+        pointers = set()
+        for _ in range(3):
+            X = torch.exp(0.2 * torch.randn(5000))
+            Y = torch.clamp(1.1 - X * torch.exp(0.1 * torch.randn(5000)), min=0)
+            mask = X < 1.1
+            A = workspace.design_matrix(basis, X, basis.normalisation(X, mask))
+            gram, rhs = normal_equations(A, Y, mask, workspace)
+            pointers.add((A.data_ptr(), gram.data_ptr(), rhs.data_ptr()))
+
+            self.assertTrue(torch.equal(A, basis.design_matrix(X, basis.normalisation(X, mask))))
+            self.assertTrue(torch.allclose(masked_regression(A, Y, mask, workspace=workspace),
+                                           masked_regression(A, Y, mask), rtol=1e-6))
+        self.assertEqual(len(pointers), 1)
+
+    def test_longstaff_schwartz_aad_and_price_only_agree(self):
+        S0 = torch.tensor(1.0, requires_grad=True)
+        method = LongstaffSchwartzMethod(20000, 61, random_source=PseudoRandomSource(seed=1))
+        price = method.estimate(S0, 1.1, 0.2, 1.0, 0.05, M=3)['price']
+        price.backward()
+
+        reference = LongstaffSchwartzMethod(20000, 61, random_source=PseudoRandomSource(seed=1))
+        self.assertAlmostEqual(price.item(), reference.price_only(1.0, 1.1, 0.2, 1.0, 0.05, M=3), places=5)
+        # American put (K = 1.1) above the intrinsic value, delta away from the immediate-exercise -1
+        self.assertGreater(price.item(), 0.11)
+        self.assertGreater(S0.grad.item(), -0.9)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+import torch
+from Engine.random_sources import MRG32k3aSource
+from Engine.stochastic_process import LogNormalProcess
+from Methods.monte_carlo import MonteCarloMethod
+from Methods.monte_carlo_pricing import MonteCarloPricing
+from Methods.longstaff_schwartz import LongstaffSchwartzMethod
+
+def mrg32k3a_reference(a, b, n):
+    """Plain sequential MRG32k3a, as in CompFinance/mrg32k3a.h."""
+    m1, m2 = 4294967087, 4294944443
+    x, y, out = [a] * 3, [b] * 3, []
+    for _ in range(n):
+        x_new = (1403580 * x[1] - 810728 * x[0]) % m1
+        y_new = (527612 * y[2] - 1370589 * y[0]) % m2
+        x, y = [x[1], x[2], x_new], [y[1], y[2], y_new]
+        out.append((x_new - y_new if x_new > y_new else x_new - y_new + m1) / (m1 + 1))
+    return torch.tensor(out, dtype=torch.float64)
+
+class TestMRG32k3a(unittest.TestCase):
+    def test_matches_sequential_generator(self):
+        source = MRG32k3aSource()
+        expected = mrg32k3a_reference(12345, 12346, 13 * 7).reshape(13, 7)
+        U = torch.cat([source.uniforms(5, 7), source.uniforms(8, 7)])
+        self.assertTrue(torch.allclose(U, expected, rtol=0, atol=1e-15))
+
+    def test_skip_ahead(self):
+        source = MRG32k3aSource()
+        full = source.normals(1000, 12)
+
+        source.skip_to(637)
+        self.assertTrue(torch.equal(source.normals(363, 12), full[637:]))
+
+    def test_rejects_a_change_of_dimension(self):
+        source = MRG32k3aSource()
+        first = source.uniforms(100, 50)
+        # 100 paths of 100 dims would reuse the numbers of paths 50..99 above
+        with self.assertRaises(ValueError):
+            source.uniforms(100, 100)
+
+        source.reset()
+        self.assertTrue(torch.equal(source.uniforms(50, 100), first.reshape(50, 100)))
+
+    def test_fixed_stride_per_path(self):
+        source = MRG32k3aSource(max_dims=100)
+        wide = source.uniforms(100, 100)
+        source.reset()
+        narrow = source.uniforms(100, 50)
+        self.assertTrue(torch.equal(narrow, wide[:, :50]))
+        with self.assertRaises(ValueError):
+            source.uniforms(10, 101)
+
+    def test_path_draws_independent_of_split(self):
+        process = LogNormalProcess(0.05, 0.2)
+        mc = MonteCarloMethod(process, 1.0, 1.0, 1000, 25, random_source=MRG32k3aSource())
+        paths = mc.simulate()
+        chunked = torch.cat(list(mc.simulate_chunks(300)))
+        self.assertTrue(torch.equal(paths, chunked))
+
+    def test_engines_accept_mrg32k3a(self):
+        mc_pricing = MonteCarloPricing(num_paths=200, num_steps=10, random_source=MRG32k3aSource())
+        paths = mc_pricing.simulate_asset_paths(1.0, 1.0, 0.05, 0.2)
+        self.assertEqual(paths.shape, (11, 200))
+
+        method = LongstaffSchwartzMethod(num_paths=1000, num_steps=24, random_source=MRG32k3aSource())
+        first = method.price(1.0, 1.1, 0.2, 1.0, 0.05, M=6)
+        method.random_source.reset()
+        second = method.price(1.0, 1.1, 0.2, 1.0, 0.05, M=6)
+        self.assertEqual(first.item(), second.item())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+import torch
+from Engine.random_sources import PseudoRandomSource, SobolSource
+from Engine.stochastic_process import CorrelatedLogNormalProcess
+from Engine.simulator import simulate_multi_factor
+from Engine.variance_reduction import AntitheticSource
+from Methods.monte_carlo_pricing import MonteCarloPricing
+from Methods.longstaff_schwartz_best_of_two_assets import LongstaffSchwartzMethodBestOf2Assets
+from Models.black_scholes import black_scholes_price, geometric_basket_price
+
+class TestMultiFactor(unittest.TestCase):
+    def correlation(self, n, rho):
+        return torch.eye(n) + rho * (1 - torch.eye(n))
+
+    def test_correlated_increments(self):
+        correlation = torch.tensor([[1.0, 0.6, -0.3], [0.6, 1.0, 0.2], [-0.3, 0.2, 1.0]])
+        process = CorrelatedLogNormalProcess(0.0, torch.tensor([0.2, 0.3, 0.4]), correlation)
+        paths = simulate_multi_factor(process, torch.ones(3), 0.1, 10, 50000, PseudoRandomSource(seed=1))
+
+        self.assertEqual(paths.shape, (50000, 11, 3))
+        self.assertTrue(torch.all(paths[:, 0] == 1.0))
+        log_returns = torch.log(paths[:, -1])
+        self.assertTrue(torch.allclose(torch.corrcoef(log_returns.T), correlation, atol=0.02))
+        # Martingale under zero drift
+        self.assertTrue(torch.allclose(paths[:, -1].mean(dim=0), torch.ones(3), atol=0.01))
+
+    def test_factor_increments_of_sources(self):
+        for source in (SobolSource(seed=3), AntitheticSource(PseudoRandomSource(seed=3))):
+            Z = source.factor_increments(1024, 8, 4)
+            self.assertEqual(Z.shape, (1024, 8, 4))
+            self.assertLess(Z.mean().abs().item(), 0.02)
+            self.assertAlmostEqual(Z.std().item(), 1.0, delta=0.03)
+
+    def test_stepping_fallback_matches_vectorized(self):
+        process = CorrelatedLogNormalProcess(0.05, torch.tensor([0.2, 0.3]), self.correlation(2, 0.5))
+        vectorized = simulate_multi_factor(process, torch.tensor([1.0, 2.0]), 0.05, 20, 100, PseudoRandomSource(seed=2))
+        process.supports_vectorized_simulation = False
+        stepped = simulate_multi_factor(process, torch.tensor([1.0, 2.0]), 0.05, 20, 100, PseudoRandomSource(seed=2))
+        self.assertTrue(torch.allclose(vectorized, stepped, rtol=1e-4))
+
+    def test_basket_option_twenty_assets(self):
+        n = 20
+        S0 = torch.full((n,), 100.0, requires_grad=True)
+        weights = torch.full((n,), 1.0 / n)
+        sigmas = torch.linspace(0.15, 0.35, n)
+        correlation = self.correlation(n, 0.4)
+
+        mc = MonteCarloPricing(num_paths=20000, num_steps=1, random_source=PseudoRandomSource(seed=5))
+        price = mc.price_basket_option(S0, weights, 100.0, 1.0, 0.03, sigmas, correlation, control_variate=True)
+        price.backward()
+
+        plain = MonteCarloPricing(num_paths=200000, num_steps=1, random_source=PseudoRandomSource(seed=1))
+        reference = plain.price_basket_option(S0.detach(), weights, 100.0, 1.0, 0.03, sigmas, correlation)
+        geometric = geometric_basket_price(S0.detach(), weights, sigmas, 1.0, 0.03, 100.0, correlation)
+
+        self.assertAlmostEqual(price.item(), reference.item(), delta=0.15)
+        # The arithmetic basket dominates the geometric one
+        self.assertGreater(price.item(), geometric.item())
+        self.assertAlmostEqual(S0.grad.sum().item(), 0.6, delta=0.1)
+
+    def test_best_of_two_uses_correlation(self):
+        prices = []
+        for rho in (-0.5, 0.9):
+            method = LongstaffSchwartzMethodBestOf2Assets(num_paths=10000, num_steps=24, random_source=PseudoRandomSource(seed=7))
+            prices.append(method.price_only(1.0, 1.0, 1.0, 0.2, 0.2, 1.0, 0.05, M=6, rho=rho))
+        # A put on the worst of two is worth more when the assets are less correlated
+        self.assertGreater(prices[0], prices[1])
+
+        mc = MonteCarloPricing(num_paths=20000, num_steps=10, random_source=PseudoRandomSource(seed=7))
+        one_asset = black_scholes_price(1.0, 0.9, 1.0, 0.05, 0.2).item()
+        # With rho = 1 the best-of call collapses to the single-asset European call (no early exercise for a call)
+        price = mc.price_best_of_two_assets_bermudan_option(1.0, 1.0, 0.9, 1.0, 0.05, 0.2, 0.2, 1.0 - 1e-6, [], is_call=True)
+        self.assertAlmostEqual(price.item(), one_asset, delta=0.01)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import unittest
+import torch
+from Engine.random_sources import CachedSource, NormalCache, PseudoRandomSource, SobolSource, MRG32k3aSource
+from Engine.stochastic_process import LogNormalProcess
+from Methods.monte_carlo import MonteCarloMethod
+from Methods.longstaff_schwartz import LongstaffSchwartzMethod
+
+class TestNormalCache(unittest.TestCase):
+    def test_draws_match_the_wrapped_source(self):
+        for make in (lambda: PseudoRandomSource(seed=1), lambda: SobolSource(seed=1), lambda: MRG32k3aSource(max_dims=8)):
+            cached, plain = CachedSource(make()), make()
+            for source in (cached, plain):
+                source.reset()
+            expected = [plain.normals(100, 3), plain.brownian_increments(100, 8), plain.normals(50, 2)]
+            for run in range(2):
+                cached.reset()
+                draws = [cached.normals(100, 3), cached.brownian_increments(100, 8), cached.normals(50, 2)]
+                for Z, Z_expected in zip(draws, expected):
+                    self.assertTrue(torch.equal(Z, Z_expected))
+            self.assertEqual(cached.cache.hits, 3)
+
+    def test_miss_after_hits_replays_the_stream(self):
+        cache = NormalCache()
+        first = CachedSource(PseudoRandomSource(seed=2), cache)
+        first.normals(10, 4)
+        # A new engine's source hits the first block, then misses on the second
+        second = CachedSource(PseudoRandomSource(seed=2), cache)
+        second.normals(10, 4)
+        Z = second.normals(10, 4)
+
+        plain = PseudoRandomSource(seed=2)
+        plain.normals(10, 4)
+        self.assertTrue(torch.equal(Z, plain.normals(10, 4)))
+
+    def test_keyed_by_seed_and_skip_ahead(self):
+        cache = NormalCache()
+        Z1 = CachedSource(PseudoRandomSource(seed=1), cache).normals(10, 2)
+        Z2 = CachedSource(PseudoRandomSource(seed=2), cache).normals(10, 2)
+        self.assertFalse(torch.equal(Z1, Z2))
+
+        source = CachedSource(MRG32k3aSource(), cache)
+        source.skip_to(10)
+        tail = source.normals(10, 2)
+        source.reset()
+        self.assertTrue(torch.equal(source.normals(20, 2)[10:], tail))
+
+    def test_lru_eviction_and_memory_cap(self):
+        block_bytes = 100 * 10 * 4
+        cache = NormalCache(max_bytes=2 * block_bytes)
+        sources = [CachedSource(PseudoRandomSource(seed=seed), cache) for seed in range(3)]
+        sources[0].normals(100, 10)
+        sources[1].normals(100, 10)
+        sources[0].reset()
+        sources[0].normals(100, 10)  # Seed 0 becomes the most recently used
+        sources[2].normals(100, 10)  # Evicts seed 1
+
+        self.assertEqual(cache.nbytes, 2 * block_bytes)
+        self.assertEqual(len(cache.entries), 2)
+        self.assertTrue(all(key[0][1] != (('seed', 1),) for key in cache.entries))
+
+        sources[0].normals(1000, 10)  # Larger than the cap: returned but not kept
+        self.assertEqual(len(cache.entries), 2)
+
+    def test_callers_may_modify_draws(self):
+        source = CachedSource(PseudoRandomSource(seed=3))
+        with torch.inference_mode():
+            source.normals(5, 5).mul_(0.0)
+        source.reset()
+        Z = source.normals(5, 5)
+        self.assertGreater(Z.abs().sum().item(), 0.0)
+        self.assertTrue(Z.requires_grad_().requires_grad)
+
+    def test_smooth_bump_and_revalue(self):
+        cache = NormalCache()
+        bump = 1e-3
+
+        def bermudan(S0):
+            source = CachedSource(PseudoRandomSource(seed=5), cache)
+            return LongstaffSchwartzMethod(20000, 50, random_source=source).price_only(S0, 1.1, 0.2, 1.0, 0.05, M=5)
+
+        delta = (bermudan(1.0 + bump) - bermudan(1.0 - bump)) / (2 * bump)
+        self.assertEqual(cache.hits, 1)
+        self.assertLess(delta, -0.3)
+        self.assertGreater(delta, -1.0)
+
+        # Terminal payoffs on common random numbers move smoothly with the bump
+        def call(sigma):
+            source = CachedSource(PseudoRandomSource(seed=6), cache)
+            S_T = MonteCarloMethod(LogNormalProcess(0.0, sigma), 1.0, 1.0, 50000, 10, random_source=source).simulate()[:, -1]
+            return torch.clamp(S_T - 1.0, min=0).mean().item()
+
+        vegas = [(call(0.2 + h) - call(0.2 - h)) / (2 * h) for h in (1e-2, 5e-3, 2e-3)]
+        self.assertLess(max(vegas) - min(vegas), 0.01)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+import torch
+from Engine.parallel import parallel_price
+from Engine.random_sources import MRG32k3aSource
+from Engine.stochastic_process import LogNormalProcess
+from Methods.monte_carlo import MonteCarloMethod
+from Methods.longstaff_schwartz import LongstaffSchwartzMethod
+
+class EuropeanCallPricer:
+    def __init__(self, K, T, num_steps):
+        self.K = K
+        self.T = T
+        self.num_steps = num_steps
+
+    def __call__(self, params, start, num_paths):
+        process = LogNormalProcess(params['r'], params['sigma'])
+        mc = MonteCarloMethod(process, params['S0'], self.T, num_paths, self.num_steps, random_source=MRG32k3aSource())
+        paths = mc.simulate_range(start, num_paths)
+        return torch.exp(-params['r'] * self.T) * torch.maximum(paths[:, -1] - self.K, torch.tensor(0.0))
+
+class BermudanPutPricer:
+    def __init__(self, K, T, num_steps, M):
+        self.K = K
+        self.T = T
+        self.num_steps = num_steps
+        self.M = M
+
+    def __call__(self, params, start, num_paths):
+        method = LongstaffSchwartzMethod(num_paths, self.num_steps, random_source=MRG32k3aSource())
+        return method.path_values(params['S0'], self.K, params['sigma'], self.T, params['r'], self.M,
+                                  start=start, num_paths=num_paths)
+
+class TestParallelMonteCarlo(unittest.TestCase):
+    def setUp(self):
+        self.params = {'S0': 100.0, 'r': 0.01, 'sigma': 0.25}
+
+    def test_european_parallel_equals_serial(self):
+        pricer = EuropeanCallPricer(K=90.0, T=2.0, num_steps=20)
+        serial = parallel_price(pricer, self.params, num_paths=4000, batch_size=1000, num_workers=0)
+        parallel = parallel_price(pricer, self.params, num_paths=4000, batch_size=1000, num_workers=2)
+
+        self.assertEqual(parallel['price'], serial['price'])
+        self.assertEqual(parallel['greeks'], serial['greeks'])
+        self.assertEqual(parallel['num_paths'], 4000)
+
+        # Same paths as a single one-shot simulation
+        S0 = torch.tensor(100.0, requires_grad=True)
+        process = LogNormalProcess(0.01, 0.25)
+        paths = MonteCarloMethod(process, S0, 2.0, 4000, 20, random_source=MRG32k3aSource()).simulate()
+        price = (torch.exp(torch.tensor(-0.02)) * torch.maximum(paths[:, -1] - 90.0, torch.tensor(0.0))).mean()
+        price.backward()
+        self.assertAlmostEqual(serial['price'], price.item(), places=3)
+        self.assertAlmostEqual(serial['greeks']['S0'], S0.grad.item(), places=4)
+
+    def test_bermudan_parallel_equals_serial(self):
+        pricer = BermudanPutPricer(K=1.1, T=1.0, num_steps=24, M=6)
+        serial = parallel_price(pricer, self.params | {'S0': 1.0}, num_paths=2000, batch_size=1000, num_workers=0)
+        parallel = parallel_price(pricer, self.params | {'S0': 1.0}, num_paths=2000, batch_size=1000, num_workers=2)
+
+        self.assertEqual(parallel['price'], serial['price'])
+        self.assertEqual(parallel['greeks'], serial['greeks'])
+        self.assertGreater(serial['price'], 0.0)
+        self.assertLess(serial['greeks']['S0'], 0.0)
+
+if __name__ == '__main__':
+    unittest.main()
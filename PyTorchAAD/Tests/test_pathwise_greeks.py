@@ -0,0 +1,77 @@
+import math
+import unittest
+import numpy as np
+import torch
+from Engine.pathwise import pathwise_greeks
+from Engine.random_sources import PseudoRandomSource
+from Engine.stochastic_process import LogNormalProcess, IntensityProcess
+from Models.black_scholes import black_scholes_price
+
+class TestPathwiseGreeks(unittest.TestCase):
+    S0, K, T, r, sigma = 100.0, 110.0, 1.0, 0.05, 0.5
+
+    def call(self, S_T):
+        return math.exp(-self.r * self.T) * torch.clamp(S_T - self.K, min=0)
+
+    def test_gbm_matches_black_scholes(self):
+        process = LogNormalProcess(self.r, self.sigma)
+        result = pathwise_greeks(process, self.S0, self.T / 16, 16, 100000, self.call, params=('sigma',),
+                                 chunk_size=25000, random_source=PseudoRandomSource(seed=1))
+
+        S0 = torch.tensor(self.S0, requires_grad=True)
+        sigma = torch.tensor(self.sigma, requires_grad=True)
+        black_scholes_price(S0, self.K, self.T, self.r, sigma).backward()
+
+        self.assertEqual(result['num_paths'], 100000)
+        self.assertAlmostEqual(result['greeks']['S0'], S0.grad.item(), delta=4 * result['greek_std_errors']['S0'])
+        self.assertAlmostEqual(result['greeks']['sigma'], sigma.grad.item(), delta=4 * result['greek_std_errors']['sigma'])
+
+    def test_gbm_matches_autograd_on_same_draws(self):
+        num_paths, num_steps, dt = 5000, 32, self.T / 32
+        process = LogNormalProcess(self.r, self.sigma)
+        result = pathwise_greeks(process, self.S0, dt, num_steps, num_paths, self.call, params=('sigma', 'mu'),
+                                 chunk_size=num_paths, random_source=PseudoRandomSource(seed=2))
+
+        S0 = torch.tensor(self.S0, requires_grad=True)
+        sigma = torch.tensor(self.sigma, requires_grad=True)
+        mu = torch.tensor(self.r, requires_grad=True)
+        tape_process = LogNormalProcess(mu, sigma)
+        source = PseudoRandomSource(seed=2)
+        S = S0.expand(num_paths)
+        for t in range(num_steps):
+            S = tape_process.step(t * dt, S, dt, source.normals(num_paths, 1)[:, 0] * dt**0.5)
+        price = self.call(S).mean()
+        price.backward()
+
+        self.assertAlmostEqual(result['price'], price.item(), places=3)
+        for name, leaf in (('S0', S0), ('sigma', sigma), ('mu', mu)):
+            self.assertAlmostEqual(result['greeks'][name], leaf.grad.item(), delta=1e-4 * max(1.0, abs(leaf.grad.item())))
+
+    def test_euler_intensity_matches_complex_step(self):
+        lambda_0, k, mu, nu = 1.0, 0.5, 1.0, 0.25
+        num_paths, num_steps, dt, eps = 2000, 50, 2.0 / 50, 1e-20
+        process = IntensityProcess(mu=mu, sigma=0.0, k=k, nu=nu)
+        result = pathwise_greeks(process, lambda_0, dt, num_steps, num_paths, lambda S_T: S_T**2, params=('nu', 'k'),
+                                 chunk_size=num_paths, random_source=PseudoRandomSource(seed=3), precision="float64")
+
+        source = PseudoRandomSource(seed=3)
+        dW = [source.normals(num_paths, 1, dtype=torch.float64)[:, 0].numpy() * math.sqrt(dt) for _ in range(num_steps)]
+
+        def complex_step(S0, nu, k):
+            # Complex-step derivative of E[S_T^2], as in Tutorials/Archive/GBM_CVT.py
+            S = S0 * np.ones(num_paths, dtype=complex)
+            for n in range(num_steps):
+                S = S + k * (mu - S) * dt + nu * np.sqrt(S) * math.sqrt(dt) * dW[n]
+            return np.mean(np.imag(S**2)) / eps
+
+        self.assertAlmostEqual(result['greeks']['S0'], complex_step(lambda_0 + 1j * eps, nu, k), places=8)
+        self.assertAlmostEqual(result['greeks']['nu'], complex_step(lambda_0, nu + 1j * eps, k), places=8)
+        self.assertAlmostEqual(result['greeks']['k'], complex_step(lambda_0, nu, k + 1j * eps), places=8)
+
+    def test_exact_scheme_has_no_step_derivatives(self):
+        process = IntensityProcess(mu=1.0, sigma=0.0, k=0.5, nu=0.25, scheme="exact")
+        with self.assertRaises(NotImplementedError):
+            pathwise_greeks(process, 1.0, 0.1, 10, 100, lambda S_T: S_T)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import unittest
+import torch
+from Engine.precision import get_precision, default_precision, common_dtype, FLOAT32, FLOAT64, MIXED
+from Engine.random_sources import PseudoRandomSource
+from Engine.stochastic_process import LogNormalProcess, CorrelatedLogNormalProcess
+from Engine.simulator import simulate_process
+from Methods.monte_carlo import MonteCarloMethod
+from Methods.longstaff_schwartz import LongstaffSchwartzMethod
+from Methods.binomial_tree import BinomialTreeMethod
+from Methods.longstaff_schwartz_multi_asset import LongstaffSchwartzMethodMultiAsset, worst_of
+from Models.black_scholes import black_scholes_price, geometric_basket_price
+from Models.dynamics import HestonProcess
+
+class MockInstrument:
+    def __init__(self, S0, strike, maturity, rate, volatility):
+        self.S0 = S0
+        self.strike = strike
+        self.maturity = maturity
+        self.rate = rate
+        self.volatility = volatility
+
+class TestPrecision(unittest.TestCase):
+    def test_policies(self):
+        self.assertIs(get_precision('mixed'), MIXED)
+        self.assertIs(get_precision(FLOAT64), FLOAT64)
+        self.assertIs(get_precision(), FLOAT32)
+        self.assertEqual((MIXED.path_dtype, MIXED.accumulator_dtype), (torch.float32, torch.float64))
+        with self.assertRaises(ValueError):
+            get_precision('float16')
+
+    def test_monte_carlo_paths_dtype(self):
+        process = LogNormalProcess(0.01, 0.25)
+        for precision, dtype in (('float32', torch.float32), ('float64', torch.float64), ('mixed', torch.float32)):
+            mc = MonteCarloMethod(process, 100.0, 1.0, 100, 10, seed=1, precision=precision)
+            self.assertEqual(mc.simulate().dtype, dtype)
+            self.assertEqual(mc.simulate_terminal().dtype, dtype)
+        self.assertEqual(simulate_process(process, 1.0, 1.0, 5, 10, precision='float64').dtype, torch.float64)
+
+    def test_default_precision_context(self):
+        with default_precision('float64'):
+            mc = MonteCarloMethod(LogNormalProcess(0.01, 0.25), 100.0, 1.0, 100, 10)
+        self.assertIs(mc.precision, FLOAT64)
+        self.assertIs(get_precision(), FLOAT32)
+
+    def test_longstaff_schwartz_mixed(self):
+        results = {}
+        for precision in ('float32', 'mixed', 'float64'):
+            S0 = torch.tensor(1.0, requires_grad=True)
+            method = LongstaffSchwartzMethod(num_paths=5000, num_steps=24, random_source=PseudoRandomSource(seed=6),
+                                             precision=precision)
+            price = method.price(S0, 1.1, 0.2, 1.0, 0.05, M=6)
+            price.backward()
+            results[precision] = (price, S0.grad.item())
+
+        self.assertEqual(results['float32'][0].dtype, torch.float32)
+        self.assertEqual(results['mixed'][0].dtype, torch.float64)
+        self.assertAlmostEqual(results['mixed'][0].item(), results['float64'][0].item(), places=4)
+        self.assertAlmostEqual(results['mixed'][1], results['float64'][1], places=3)
+
+        price_only = LongstaffSchwartzMethod(num_paths=5000, num_steps=24, random_source=PseudoRandomSource(seed=6),
+                                             precision='mixed').price_only(1.0, 1.1, 0.2, 1.0, 0.05, M=6)
+        self.assertAlmostEqual(price_only, results['mixed'][0].item(), places=4)
+
+    def test_binomial_tree_float64(self):
+        instrument = MockInstrument(S0=1.0, strike=1.1, maturity=1.0, rate=0.05, volatility=0.2)
+        price32 = BinomialTreeMethod(200).price(instrument)
+        price64 = BinomialTreeMethod(200, precision='float64').price(instrument)
+        self.assertEqual(price64.dtype, torch.float64)
+        self.assertAlmostEqual(price32.item(), price64.item(), places=4)
+
+    def test_inputs_keep_their_dtype(self):
+        self.assertEqual(common_dtype(1.0, torch.tensor(0.2, dtype=torch.float64)), torch.float64)
+        self.assertIs(common_dtype(1.0, 0.2), torch.float32)
+        with default_precision('float64'):
+            self.assertIs(common_dtype(1.0, 0.2), torch.float64)
+
+        S0 = torch.tensor(100.0, dtype=torch.float64)
+        self.assertEqual(black_scholes_price(S0, 100.0, 1.0, 0.05, 0.2).dtype, torch.float64)
+        self.assertEqual(geometric_basket_price(torch.full((2,), 100.0, dtype=torch.float64), torch.full((2,), 0.5, dtype=torch.float64),
+                                                torch.full((2,), 0.2, dtype=torch.float64), 1.0, 0.05, 100.0).dtype, torch.float64)
+        process = CorrelatedLogNormalProcess(0.05, torch.tensor([0.2, 0.3], dtype=torch.float64), [[1.0, 0.5], [0.5, 1.0]])
+        self.assertEqual(process.correlation.dtype, torch.float64)
+        self.assertEqual(HestonProcess(0.04, 0.03, 1.5, 0.04, 0.3, -0.7).initial_state(S0).dtype, torch.float64)
+
+    def test_greeks_leaves_follow_the_policy(self):
+        dtypes = []
+
+        class Recording(LongstaffSchwartzMethod):
+            def price(self, S0, *args, **kwargs):
+                dtypes.append(S0.dtype)
+                return super().price(S0, *args, **kwargs)
+
+        Recording(2000, 24, random_source=PseudoRandomSource(seed=7), precision='float64').calculate_greeks(
+            1.0, 1.1, 0.2, 1.0, 0.05, M=6)
+        self.assertEqual(dtypes, [torch.float64])
+
+        method = LongstaffSchwartzMethodMultiAsset(2000, 24, random_source=PseudoRandomSource(seed=7), precision='float64')
+        self.assertEqual(method.simulate_paths([1.0, 1.0], [0.2, 0.3], 1.0, 0.05, M=6, correlation=0.5).dtype, torch.float64)
+        greeks = method.calculate_greeks([1.0, 1.0], worst_of(1.1), [0.2, 0.3], 1.0, 0.05, M=6, correlation=0.5)
+        self.assertTrue(all(delta < 0.0 for delta in greeks['Delta']))
+
+if __name__ == '__main__':
+    unittest.main()
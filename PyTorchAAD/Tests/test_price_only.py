@@ -0,0 +1,42 @@
+import unittest
+import torch
+from Engine.random_sources import PseudoRandomSource
+from Methods.longstaff_schwartz import LongstaffSchwartzMethod
+from Methods.longstaff_schwartz_best_of_two_assets import LongstaffSchwartzMethodBestOf2Assets
+
+class TestPriceOnly(unittest.TestCase):
+    def test_longstaff_schwartz_price_only(self):
+        method = LongstaffSchwartzMethod(num_paths=20000, num_steps=60, random_source=PseudoRandomSource(seed=4))
+        price = method.price_only(1.0, 1.1, 0.2, 1.0, 0.05, M=6)
+
+        reference = LongstaffSchwartzMethod(num_paths=20000, num_steps=60, random_source=PseudoRandomSource(seed=4))
+        expected = reference.price(1.0, 1.1, 0.2, 1.0, 0.05, M=6)
+
+        self.assertIsInstance(price, float)
+        self.assertAlmostEqual(price, expected.item(), places=4)
+
+    def test_inplace_backward_induction(self):
+        # Grid, exercise schedule and a scenario batch of volatilities
+        cases = [(LongstaffSchwartzMethod(5000, 61, random_source=PseudoRandomSource(seed=5)), 0.2),
+                 (LongstaffSchwartzMethod(5000, random_source=PseudoRandomSource(seed=5), exercise_dates=[0.25, 0.5, 0.75]), 0.2),
+                 (LongstaffSchwartzMethod(5000, 61, random_source=PseudoRandomSource(seed=5)), torch.tensor([0.15, 0.2, 0.25]))]
+        for method, sigma in cases:
+            with torch.inference_mode():
+                Sp = method.simulate_paths(1.0, sigma, 1.0, 0.05)
+                expected = method.cash_flows(Sp, 1.1, 1.0, 0.05, M=6)
+                values = method._backward_induction(Sp, 1.1, 1.0, 0.05, M=6, inplace=True)[0]
+            self.assertTrue(torch.allclose(values, expected, rtol=1e-6, atol=1e-7))
+
+    def test_best_of_two_price_only(self):
+        for option_type in ('put', 'call'):
+            method = LongstaffSchwartzMethodBestOf2Assets(num_paths=20000, num_steps=60, random_source=PseudoRandomSource(seed=4))
+            price = method.price_only(1.0, 1.0, 0.9, 0.2, 0.2, 1.0, 0.05, M=6, option_type=option_type)
+
+            reference = LongstaffSchwartzMethodBestOf2Assets(num_paths=20000, num_steps=60, random_source=PseudoRandomSource(seed=4))
+            expected = reference.price(1.0, 1.0, 0.9, 0.2, 0.2, 1.0, 0.05, M=6, option_type=option_type)
+
+            self.assertIsInstance(price, float)
+            self.assertAlmostEqual(price, expected.item(), places=4)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import math
+import unittest
+import torch
+from Engine.random_sources import BrownianBridge, PseudoRandomSource, SobolSource
+from Engine.stochastic_process import LogNormalProcess
+from Engine.simulator import simulate_process
+from Methods.monte_carlo import MonteCarloMethod
+from Methods.longstaff_schwartz import LongstaffSchwartzMethod
+
+class TestRandomSources(unittest.TestCase):
+    def test_brownian_bridge_terminal_point(self):
+        Z = torch.randn(1000, 16, dtype=torch.float64)
+        increments = BrownianBridge(16)(Z)
+        # The first normal alone fixes the terminal value of the path
+        self.assertTrue(torch.allclose(increments.sum(dim=1), 4.0 * Z[:, 0]))
+
+    def test_brownian_bridge_increments_are_independent(self):
+        Z = torch.randn(200000, 8, dtype=torch.float64)
+        increments = BrownianBridge(8)(Z)
+        covariance = increments.T @ increments / Z.shape[0]
+        self.assertTrue(torch.allclose(covariance, torch.eye(8, dtype=torch.float64), atol=0.02))
+
+    def test_sobol_normals_reset(self):
+        source = SobolSource(seed=3)
+        first = source.normals(64, 5)
+        source.reset()
+        self.assertTrue(torch.equal(first, source.normals(64, 5)))
+        self.assertTrue(torch.isfinite(first).all())
+
+    def european_call_estimates(self, make_source, num_runs=8, num_paths=4096):
+        estimates = []
+        for run in range(num_runs):
+            process = LogNormalProcess(0.05, 0.2)
+            mc = MonteCarloMethod(process, 100.0, 1.0, num_paths, 17, random_source=make_source(run))
+            paths = mc.simulate()
+            payoffs = torch.maximum(paths[:, -1] - 100.0, torch.tensor(0.0))
+            estimates.append(math.exp(-0.05) * payoffs.mean().item())
+        return torch.tensor(estimates)
+
+    def test_sobol_brownian_bridge_reduces_error(self):
+        pseudo = self.european_call_estimates(lambda run: PseudoRandomSource(seed=run))
+        sobol = self.european_call_estimates(lambda run: SobolSource(seed=run))
+        self.assertLess(sobol.std().item(), pseudo.std().item() / 3)
+        self.assertAlmostEqual(sobol.mean().item(), pseudo.mean().item(), delta=0.2)
+
+    def test_engines_accept_random_source(self):
+        paths = simulate_process(LogNormalProcess(0.05, 0.2), 1.0, 1.0, 12, 256, random_source=SobolSource(seed=1))
+        self.assertEqual(paths.shape, (256, 12))
+
+        method = LongstaffSchwartzMethod(num_paths=1024, num_steps=24, random_source=SobolSource(seed=1))
+        price = method.price(1.0, 1.1, 0.2, 1.0, 0.05, M=6)
+        self.assertGreater(price.item(), 0.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+import torch
+from Engine.basis import (HermiteBasis, LaguerreBasis, ChebyshevBasis, TensorProductBasis,
+                          CallableBasis, get_basis)
+from Engine.regression import masked_regression
+from Engine.random_sources import PseudoRandomSource
+from Methods.longstaff_schwartz import LongstaffSchwartzMethod, hermite_basis
+from Methods.longstaff_schwartz_best_of_two_assets import LongstaffSchwartzMethodBestOf2Assets
+
+class TestRegressionBasis(unittest.TestCase):
+    def test_bases_of_one_order_span_the_same_polynomials(self):
+        torch.manual_seed(0)
+        X = 100 * torch.exp(0.2 * torch.randn(20000, dtype=torch.float64))
+        Y = torch.clamp(110 - X * torch.exp(0.1 * torch.randn(20000, dtype=torch.float64)), min=0)
+        mask = X < 110
+
+        fitted = []
+        for name in ('monomial', 'hermite', 'laguerre', 'chebyshev'):
+            basis = get_basis(name, order=3)
+            A = basis.design_matrix(X, basis.normalisation(X, mask))
+            fitted.append(A @ masked_regression(A, Y, mask))
+        for values in fitted[1:]:
+            self.assertTrue(torch.allclose(values[mask], fitted[0][mask], atol=1e-8))
+
+    def test_normalisation_maps_onto_the_domain_of_the_basis(self):
+        X = torch.linspace(80.0, 120.0, 1001)
+        mask = X < 100
+        center, scale = ChebyshevBasis().normalisation(X, mask)
+        z = (X - center) / scale
+        self.assertAlmostEqual(z[mask].min().item(), -1.0, places=5)
+        self.assertAlmostEqual(z[mask].max().item(), 1.0, places=5)
+
+        center, scale = HermiteBasis().normalisation(X, mask)
+        self.assertAlmostEqual(center.item(), 90.0, delta=0.05)
+        center, scale = LaguerreBasis().normalisation(X, mask)
+        self.assertEqual(center.item(), 80.0)
+        self.assertAlmostEqual(scale.item(), 20 / 12**0.5, delta=0.05)
+        # No selected path: identity map
+        self.assertEqual(tuple(float(x) for x in HermiteBasis().normalisation(X, X < 0)), (0.0, 1.0))
+
+    def test_unnormalised_hermite_matches_hermite_basis(self):
+        X = torch.linspace(0.5, 1.5, 11)
+        self.assertTrue(torch.equal(HermiteBasis(3).design_matrix(X), hermite_basis(X, order=3)))
+
+    def test_tensor_product_degrees(self):
+        self.assertEqual(len(TensorProductBasis('monomial', order=3).degrees(2)), 10)
+        # Constant, 12 degrees of one asset up to 3, and the pairs of total degree 2 and 3
+        basis = TensorProductBasis('hermite', order=3, interaction=2)
+        self.assertEqual(len(basis.degrees(12)), 1 + 12 * 3 + 66 * (1 + 2))
+        X = torch.rand(100, 12) + 0.5
+        self.assertEqual(basis.design_matrix(X, basis.normalisation(X)).shape, (100, 235))
+
+    def test_registry(self):
+        self.assertIsInstance(get_basis(), HermiteBasis)
+        self.assertIsInstance(get_basis(lambda z: torch.stack([z, z**2], dim=1)), CallableBasis)
+        with self.assertRaises(ValueError):
+            get_basis('legendre')
+
+    def test_lsm_price_does_not_depend_on_the_units(self):
+        for basis in ('hermite', 'laguerre', ChebyshevBasis(4), lambda z: torch.stack([torch.ones_like(z), z, z.clamp(min=0)], dim=1)):
+            unit = LongstaffSchwartzMethod(50000, 61, random_source=PseudoRandomSource(seed=1), basis=basis)
+            hundred = LongstaffSchwartzMethod(50000, 61, random_source=PseudoRandomSource(seed=1), basis=basis)
+            self.assertAlmostEqual(unit.price_only(1.0, 1.1, 0.2, 1.0, 0.05),
+                                   hundred.price_only(100.0, 110.0, 0.2, 1.0, 0.05) / 100, places=4)
+
+    def test_strategy_keeps_the_basis_and_normalisation(self):
+        basis = ChebyshevBasis(3)
+        strategy = LongstaffSchwartzMethod(20000, 61, random_source=PseudoRandomSource(seed=2), basis=basis).fit_strategy(
+            100.0, 110.0, 0.2, 1.0, 0.05)
+        self.assertIs(strategy.basis, basis)
+        frozen = LongstaffSchwartzMethod(20000, 61, random_source=PseudoRandomSource(seed=2)).estimate(
+            100.0, 110.0, 0.2, 1.0, 0.05, strategy=strategy)['price']
+        regressed = LongstaffSchwartzMethod(20000, 61, random_source=PseudoRandomSource(seed=2), basis=basis).estimate(
+            100.0, 110.0, 0.2, 1.0, 0.05)['price']
+        self.assertAlmostEqual(frozen.item(), regressed.item(), delta=1e-3)
+
+    def test_best_of_two_assets_basis(self):
+        args = (100.0, 100.0, 110.0, 0.2, 0.3, 1.0, 0.05)
+        cubic = LongstaffSchwartzMethodBestOf2Assets(20000, 61, random_source=PseudoRandomSource(seed=3)).price_only(*args, M=6, rho=0.3)
+        chebyshev = LongstaffSchwartzMethodBestOf2Assets(20000, 61, random_source=PseudoRandomSource(seed=3),
+                                                         basis=TensorProductBasis('chebyshev', order=3)).price_only(*args, M=6, rho=0.3)
+        self.assertAlmostEqual(cubic, chebyshev, places=3)
+
+if __name__ == '__main__':
+    unittest.main()
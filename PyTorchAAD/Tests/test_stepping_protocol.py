@@ -0,0 +1,64 @@
+import unittest
+import torch
+from Engine.stochastic_process import LogNormalProcess, IntensityProcess, CIRPlusPlusProcess
+from Engine.simulator import simulate_process, compiled_loop, compiled_paths
+from Methods.monte_carlo import MonteCarloMethod
+
+class TestSteppingProtocol(unittest.TestCase):
+    def test_step_matches_evolve(self):
+        S = torch.full((5,), 1.2)
+        dW = torch.randn(5) * 0.1
+
+        lognormal = LogNormalProcess(mu=0.05, sigma=0.2)
+        self.assertTrue(torch.equal(lognormal.step(0.5, S, 0.01, dW), lognormal.evolve(S, 0.01, dW, 0.5)))
+
+        intensity = IntensityProcess(mu=1.0, sigma=0.0, k=0.5, nu=0.25)
+        self.assertTrue(torch.equal(intensity.step(0.5, S, 0.01, dW), intensity.evolve(S, 0.01, dW)))
+
+    def test_time_dependent_step_receives_time(self):
+        times = []
+        phi = lambda t: times.append(float(t)) or 0.0
+        process = CIRPlusPlusProcess(mu=1.0, sigma=0.0, k=0.5, theta=0.0, nu=0.25, phi=phi)
+        paths = simulate_process(process, 1.0, 1.0, 5, 10)
+
+        self.assertEqual(paths.shape, (10, 5))
+        self.assertEqual(len(times), 4)
+        for t, expected in zip(times, [0.0, 0.2, 0.4, 0.6]):
+            self.assertAlmostEqual(t, expected)
+
+    def test_compiled_loop_matches_eager(self):
+        results = []
+        for compiled in (False, True):
+            S0 = torch.tensor(1.0, requires_grad=True)
+            nu = torch.tensor(0.25, requires_grad=True)
+            process = IntensityProcess(mu=1.0, sigma=0.0, k=0.5, nu=nu)
+            mc = MonteCarloMethod(process, S0, 1.0, num_paths=500, num_steps=40, seed=3, vectorized=False, compiled=compiled)
+            paths = mc.simulate()
+            self.assertEqual(paths.shape, (500, 40))
+            value = paths[:, -1].mean()
+            value.backward()
+            results.append((value.item(), S0.grad.item(), nu.grad.item()))
+
+        for eager, compiled in zip(*results):
+            self.assertAlmostEqual(eager, compiled, places=5)
+        # Kernels are cached per process type and state shape
+        self.assertIs(compiled_loop(process, (500,)), compiled_loop(IntensityProcess(0.5, 0.0, 1.0, 0.1), (500,)))
+
+    def test_new_parameters_reuse_the_compiled_loop(self):
+        graphs = []
+
+        def counting_backend(graph_module, example_inputs):
+            # Called by torch.compile once per compiled graph; runs the traced graph as is
+            graphs.append(graph_module)
+            return graph_module.forward
+
+        dW = torch.randn(1000, 99) * 0.1
+        compiled_paths(IntensityProcess(mu=1.0, sigma=0.0, k=0.5, nu=0.25), 1.0, 0.01, dW, backend=counting_backend)
+        self.assertGreater(len(graphs), 0)
+        compiled = len(graphs)
+        for nu in (0.2, 0.3):
+            compiled_paths(IntensityProcess(mu=1.0, sigma=0.0, k=0.5, nu=nu), 1.0, 0.01, dW, backend=counting_backend)
+        self.assertEqual(len(graphs), compiled)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+import torch
+from Engine.stochastic_process import LogNormalProcess
+from Engine.statistics import RunningStatistics
+from Methods.monte_carlo import MonteCarloMethod
+from Methods.monte_carlo_pricing import MonteCarloPricing
+
+class TestStreamingMonteCarlo(unittest.TestCase):
+    def setUp(self):
+        self.S0 = torch.tensor(100.0, requires_grad=True)
+        self.r = torch.tensor(0.01, requires_grad=True)
+        self.sigma = torch.tensor(0.25, requires_grad=True)
+        self.T = torch.tensor(2.0, requires_grad=True)
+        self.K = 90.0
+
+    def make_method(self, num_paths=3000, num_steps=20):
+        process = LogNormalProcess(self.r, self.sigma)
+        return MonteCarloMethod(process, self.S0, self.T, num_paths, num_steps, seed=42)
+
+    def payoff(self, paths):
+        return torch.exp(-self.r * self.T) * torch.maximum(paths[:, -1] - self.K, torch.tensor(0.0))
+
+    def test_running_statistics_matches_torch(self):
+        samples = torch.randn(1000, dtype=torch.float64) * 3.0 + 1.0
+        stats = RunningStatistics()
+        for block in torch.split(samples, 137):
+            stats.update(block)
+
+        self.assertEqual(stats.count, 1000)
+        self.assertAlmostEqual(stats.mean, samples.mean().item(), places=10)
+        self.assertAlmostEqual(stats.variance, samples.var().item(), places=10)
+        self.assertAlmostEqual(stats.total, samples.sum().item(), places=8)
+
+    def test_chunks_reproduce_one_shot_paths(self):
+        mc = self.make_method()
+        with torch.no_grad():
+            paths = mc.simulate()
+            chunked = torch.cat(list(mc.simulate_chunks(777)))
+        self.assertTrue(torch.equal(paths, chunked))
+
+    def test_streaming_price_and_greeks_match_one_shot(self):
+        params = {'delta': self.S0, 'rho': self.r, 'vega': self.sigma, 'theta': self.T}
+
+        mc = self.make_method()
+        price = self.payoff(mc.simulate()).mean()
+        greeks = torch.autograd.grad(price, list(params.values()))
+
+        result = self.make_method().price_streaming(self.payoff, chunk_size=500, params=params)
+
+        self.assertEqual(result['num_paths'], 3000)
+        self.assertAlmostEqual(result['price'], price.item(), places=3)
+        self.assertGreater(result['std_error'], 0.0)
+        for name, grad in zip(params, greeks):
+            self.assertAlmostEqual(result['greeks'][name], grad.item(), delta=1e-4 * max(1.0, abs(grad.item())))
+
+    def test_streaming_price_only(self):
+        result = self.make_method().price_streaming(self.payoff, chunk_size=1024)
+        self.assertGreater(result['price'], 0.0)
+        self.assertEqual(result['greeks'], {})
+
+    def test_monte_carlo_pricing_chunks(self):
+        mc_pricing = MonteCarloPricing(num_paths=250, num_steps=10)
+        chunks = list(mc_pricing.simulate_asset_path_chunks(1.0, 1.0, 0.05, 0.2, chunk_size=100))
+        self.assertEqual([chunk.shape[1] for chunk in chunks], [100, 100, 50])
+        self.assertEqual(chunks[0].shape[0], 11)
+
+if __name__ == '__main__':
+    unittest.main()
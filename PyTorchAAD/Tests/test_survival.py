@@ -0,0 +1,66 @@
+import unittest
+import torch
+from Engine.random_sources import PseudoRandomSource
+from Engine.simulator import simulate_dates
+from Engine.stochastic_process import IntensityProcess, CIRPlusPlusProcess
+from Methods.longstaff_schwartz import LongstaffSchwartzMethod
+from Models.survival import (cir_affine_coefficients, cir_survival_probability, phi_integral,
+                             cir_plus_plus_survival_probability, survival_probability)
+
+class TestSurvival(unittest.TestCase):
+    k, mu, nu = 0.5, 1.0, 0.25
+
+    def monte_carlo_survival(self, process, lambda_0, T, shift=None, num_dates=24, num_paths=100000):
+        dates = torch.linspace(0.0, T, num_dates + 1)
+        lambdas = simulate_dates(process, lambda_0, dates[1:].tolist(), num_paths, PseudoRandomSource(seed=1))
+        if shift is not None:
+            lambdas = lambdas + shift(dates)
+        return torch.exp(-torch.trapezoid(lambdas, dates, dim=1)).mean().item()
+
+    def test_cir_matches_simulation(self):
+        process = IntensityProcess(mu=self.mu, sigma=0.0, k=self.k, nu=self.nu, scheme="exact", seed=2)
+        expected = self.monte_carlo_survival(process, 1.0, 2.0)
+        self.assertAlmostEqual(cir_survival_probability(1.0, self.k, self.mu, self.nu, 2.0).item(), expected, delta=0.002)
+        self.assertTrue(torch.equal(survival_probability(process, 1.0, 2.0),
+                                    cir_survival_probability(1.0, self.k, self.mu, self.nu, 2.0)))
+
+    def test_cir_plus_plus_matches_simulation(self):
+        phi = lambda t: 0.005 * torch.exp(-0.1 * t)
+        process = CIRPlusPlusProcess(mu=self.mu, sigma=0.0, k=self.k, theta=0.0, nu=self.nu, phi=phi, scheme="exact", seed=2)
+        expected = self.monte_carlo_survival(process, 1.0, 2.0, shift=phi)
+        self.assertAlmostEqual(survival_probability(process, 1.0, 2.0).item(), expected, delta=0.002)
+        self.assertAlmostEqual(phi_integral(phi, 2.0).item(), 0.05 * (1 - torch.exp(torch.tensor(-0.2)).item()), places=6)
+
+    def test_vectorized_curve(self):
+        maturities = torch.linspace(0.0, 5.0, 11)
+        A, B = cir_affine_coefficients(self.k, self.mu, self.nu, maturities)
+        self.assertEqual(A.shape, (11,))
+        self.assertAlmostEqual(A[0].item(), 1.0, places=6)
+        self.assertAlmostEqual(B[0].item(), 0.0, places=6)
+        curve = cir_plus_plus_survival_probability(1.0, self.k, self.mu, self.nu, lambda t: 0.01, maturities)
+        self.assertTrue(torch.all(curve[1:] < curve[:-1]))
+        for T, P in zip(maturities[1:].tolist(), curve[1:].tolist()):
+            single = cir_plus_plus_survival_probability(1.0, self.k, self.mu, self.nu, lambda t: 0.01, T)
+            self.assertAlmostEqual(single.item(), P, places=6)
+
+    def test_gradients_match_finite_differences(self):
+        params = [torch.tensor(x, dtype=torch.float64, requires_grad=True) for x in (1.0, self.k, self.mu, self.nu)]
+        cir_survival_probability(*params, 2.0).backward()
+        bump = 1e-6
+        for i, param in enumerate(params):
+            up = [p.detach().clone() for p in params]
+            down = [p.detach().clone() for p in params]
+            up[i] += bump
+            down[i] -= bump
+            fd = (cir_survival_probability(*up, 2.0) - cir_survival_probability(*down, 2.0)).item() / (2 * bump)
+            self.assertAlmostEqual(param.grad.item(), fd, places=6)
+
+    def test_longstaff_schwartz_cva_uses_closed_form(self):
+        lsm = lambda: LongstaffSchwartzMethod(num_paths=2000, num_steps=50, random_source=PseudoRandomSource(seed=3))
+        plain = lsm().price(100.0, 100.0, 0.2, 1.0, 0.05, M=5)
+        with_cva = lsm().price(100.0, 100.0, 0.2, 1.0, 0.05, M=5, use_cir=True, cir_params=(self.mu, self.k, self.nu))
+        expected = cir_survival_probability(1.0, self.k, self.mu, self.nu, 1.0)
+        self.assertAlmostEqual(with_cva.item(), plain.item() * expected.item(), places=4)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import math
+import unittest
+import torch
+from Engine.stochastic_process import LogNormalProcess, IntensityProcess
+from Engine.random_sources import MRG32k3aSource
+from Methods.monte_carlo import MonteCarloMethod
+
+def black_scholes_call(S0, K, T, r, sigma):
+    d1 = (math.log(S0 / K) + (r + 0.5 * sigma**2) * T) / (sigma * math.sqrt(T))
+    d2 = d1 - sigma * math.sqrt(T)
+    N = lambda x: 0.5 * (1 + math.erf(x / math.sqrt(2)))
+    return S0 * N(d1) - K * math.exp(-r * T) * N(d2), N(d1)
+
+class TestTerminalSimulation(unittest.TestCase):
+    def test_lognormal_terminal_price_and_delta(self):
+        S0 = torch.tensor(100.0, requires_grad=True)
+        K, r, sigma = 90.0, 0.01, 0.25
+        num_steps = 1000
+
+        process = LogNormalProcess(r, sigma)
+        mc = MonteCarloMethod(process, S0, 2.0, num_paths=200000, num_steps=num_steps, seed=7)
+        S_T = mc.simulate_terminal()
+        self.assertEqual(S_T.shape, (200000,))
+
+        # The last grid point of simulate() sits at (num_steps - 1) * dt
+        horizon = 2.0 * (num_steps - 1) / num_steps
+        payoffs = torch.maximum(S_T - K, torch.tensor(0.0))
+        option_price = torch.mean(math.exp(-r * horizon) * payoffs)
+        option_price.backward()
+
+        expected_price, expected_delta = black_scholes_call(100.0, K, horizon, r, sigma)
+        self.assertAlmostEqual(option_price.item(), expected_price, delta=0.15)
+        self.assertAlmostEqual(S0.grad.item(), expected_delta, delta=0.01)
+
+    def test_terminal_matches_path_distribution(self):
+        process = LogNormalProcess(0.05, 0.2)
+        paths = MonteCarloMethod(process, 1.0, 1.0, 50000, 50).simulate()
+        S_T = MonteCarloMethod(process, 1.0, 1.0, 50000, 50).simulate_terminal()
+        self.assertAlmostEqual(S_T.mean().item(), paths[:, -1].mean().item(), delta=0.005)
+        self.assertAlmostEqual(S_T.std().item(), paths[:, -1].std().item(), delta=0.005)
+
+    def test_incremental_terminal_for_intensity(self):
+        lambda_0 = torch.tensor(1.0, requires_grad=True)
+        process = IntensityProcess(mu=1.0, sigma=0.0, k=0.5, nu=0.25)
+        mc = MonteCarloMethod(process, lambda_0, 2.0, 5000, 50)
+        lambda_T = mc.simulate_terminal()
+        self.assertEqual(lambda_T.shape, (5000,))
+
+        lambda_T.mean().backward()
+        self.assertGreater(lambda_0.grad.item(), 0.0)
+
+    def test_euler_intensity_keeps_the_euler_law(self):
+        # Only the exact scheme samples the noncentral chi-square law at maturity
+        process = IntensityProcess(mu=1.0, sigma=0.0, k=0.5, nu=0.25)
+        self.assertFalse(process.supports_exact_transition)
+        self.assertTrue(IntensityProcess(mu=1.0, sigma=0.0, k=0.5, nu=0.25, scheme="exact").supports_exact_transition)
+        paths = MonteCarloMethod(process, 1.0, 2.0, 2000, 50, random_source=MRG32k3aSource()).simulate()
+        lambda_T = MonteCarloMethod(process, 1.0, 2.0, 2000, 50, random_source=MRG32k3aSource()).simulate_terminal()
+        self.assertTrue(torch.allclose(lambda_T, paths[:, -1]))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import math
+import unittest
+import torch
+from Engine.random_sources import PseudoRandomSource
+from Engine.stochastic_process import LogNormalProcess
+from Engine.variance_reduction import AntitheticSource, MomentMatchingSource, with_variance_reduction, monte_carlo_estimate
+from Methods.monte_carlo import MonteCarloMethod
+from Methods.longstaff_schwartz import LongstaffSchwartzMethod
+from Methods.longstaff_schwartz_best_of_two_assets import LongstaffSchwartzMethodBestOf2Assets
+from Methods.monte_carlo_pricing import MonteCarloPricing
+from Models.black_scholes import black_scholes_price, geometric_basket_price
+
+class TestVarianceReduction(unittest.TestCase):
+    def setUp(self):
+        self.S0 = torch.tensor(100.0, requires_grad=True)
+        self.r, self.sigma, self.K = 0.01, 0.25, 90.0
+        self.num_steps = 10
+        self.horizon = 2.0 * (self.num_steps - 1) / self.num_steps
+
+    def make_method(self, random_source):
+        process = LogNormalProcess(self.r, self.sigma)
+        return MonteCarloMethod(process, self.S0, 2.0, 20000, self.num_steps, random_source=random_source)
+
+    def payoff(self, paths):
+        return math.exp(-self.r * self.horizon) * torch.maximum(paths[:, -1] - self.K, torch.tensor(0.0))
+
+    def test_antithetic_pairs(self):
+        source = AntitheticSource(PseudoRandomSource(seed=3))
+        Z = source.normals(6, 4)
+        self.assertEqual(source.group_size, 2)
+        self.assertTrue(torch.equal(Z[1::2], -Z[0::2]))
+        with self.assertRaises(ValueError):
+            source.normals(5, 4)
+
+    def test_moment_matching(self):
+        Z = MomentMatchingSource(PseudoRandomSource(seed=3)).brownian_increments(500, 8)
+        self.assertTrue(torch.allclose(Z.mean(dim=0), torch.zeros(8), atol=1e-6))
+        self.assertTrue(torch.allclose(Z.std(dim=0), torch.ones(8), atol=1e-5))
+
+    def test_antithetic_streaming(self):
+        plain = self.make_method(PseudoRandomSource(seed=11)).price_streaming(self.payoff, chunk_size=4000)
+        source = with_variance_reduction(PseudoRandomSource(seed=11), antithetic=True)
+        result = self.make_method(source).price_streaming(self.payoff, chunk_size=4000)
+
+        expected = black_scholes_price(100.0, self.K, self.horizon, self.r, self.sigma).item()
+        self.assertAlmostEqual(plain['variance_reduction_factor'], 1.0, places=6)
+        self.assertGreater(result['variance_reduction_factor'], 1.5)
+        self.assertLess(abs(result['price'] - expected), 4 * result['std_error'])
+
+    def test_control_variate_price_and_greeks(self):
+        # Discounted terminal asset value, whose expectation is S0
+        control = lambda paths: math.exp(-self.r * self.horizon) * paths[:, -1]
+        source = PseudoRandomSource(seed=5)
+        result = self.make_method(source).price_streaming(self.payoff, chunk_size=3000, params={'delta': self.S0},
+                                                          control_variate=(control, self.S0))
+
+        S0 = torch.tensor(100.0, requires_grad=True)
+        expected = black_scholes_price(S0, self.K, self.horizon, self.r, self.sigma)
+        expected.backward()
+
+        self.assertGreater(result['variance_reduction_factor'], 3.0)
+        self.assertGreater(result['beta'], 0.0)
+        self.assertLess(abs(result['price'] - expected.item()), 4 * result['std_error'])
+        self.assertAlmostEqual(result['greeks']['delta'], S0.grad.item(), delta=0.02)
+
+        # The one-shot estimator gives the same price on the same paths
+        paths = self.make_method(source).simulate()
+        one_shot = monte_carlo_estimate(self.payoff(paths), control(paths), self.S0)
+        self.assertAlmostEqual(one_shot['price'].item(), result['price'], places=3)
+        self.assertAlmostEqual(one_shot['variance_reduction_factor'], result['variance_reduction_factor'], places=3)
+
+    def test_longstaff_schwartz_control_variate(self):
+        method = LongstaffSchwartzMethod(num_paths=4000, num_steps=24, random_source=PseudoRandomSource(seed=2))
+        plain = method.estimate(1.0, 1.1, 0.2, 1.0, 0.05, M=6)
+        controlled = method.estimate(1.0, 1.1, 0.2, 1.0, 0.05, M=6, control_variate=True)
+
+        self.assertGreater(controlled['variance_reduction_factor'], 1.5)
+        self.assertLess(controlled['std_error'], plain['std_error'])
+        self.assertLess(abs(controlled['price'].item() - plain['price'].item()), 4 * plain['std_error'])
+
+    def test_best_of_two_control_variate(self):
+        for option_type in ('put', 'call'):
+            method = LongstaffSchwartzMethodBestOf2Assets(20000, 61, random_source=PseudoRandomSource(seed=8))
+            plain = method.estimate(100.0, 100.0, 100.0, 0.2, 0.3, 1.0, 0.05, M=6, option_type=option_type, rho=0.5)
+            controlled = method.estimate(100.0, 100.0, 100.0, 0.2, 0.3, 1.0, 0.05, M=6, option_type=option_type, rho=0.5,
+                                         control_variate=True)
+
+            self.assertAlmostEqual(plain['variance_reduction_factor'], 1.0, places=6)
+            self.assertGreater(controlled['variance_reduction_factor'], 1.5)
+            self.assertLess(controlled['std_error'], plain['std_error'])
+            self.assertLess(abs(controlled['price'].item() - plain['price'].item()), 4 * plain['std_error'])
+
+    def test_basket_option_statistics(self):
+        S0, weights, sigmas = torch.full((5,), 100.0), torch.full((5,), 0.2), torch.linspace(0.15, 0.35, 5)
+        correlation = torch.eye(5) + 0.5 * (1 - torch.eye(5))
+        mc = MonteCarloPricing(num_paths=20000, num_steps=1, random_source=PseudoRandomSource(seed=9))
+        result = mc.estimate_basket_option(S0, weights, 100.0, 1.0, 0.03, sigmas, correlation, control_variate=True)
+
+        self.assertGreater(result['variance_reduction_factor'], 10.0)
+        self.assertAlmostEqual(mc.price_basket_option(S0, weights, 100.0, 1.0, 0.03, sigmas, correlation,
+                                                      control_variate=True).item(), result['price'].item(), delta=0.2)
+
+    def test_closed_forms(self):
+        call = black_scholes_price(100.0, 95.0, 1.0, 0.03, 0.2)
+        put = black_scholes_price(100.0, 95.0, 1.0, 0.03, 0.2, option_type="put")
+        self.assertAlmostEqual(call.item() - put.item(), 100.0 - 95.0 * math.exp(-0.03), places=3)
+
+        single = geometric_basket_price(torch.tensor([100.0]), torch.tensor([1.0]), torch.tensor([0.2]), 1.0, 0.03, 95.0)
+        self.assertAlmostEqual(single.item(), call.item(), places=3)
+
+if __name__ == '__main__':
+    unittest.main()
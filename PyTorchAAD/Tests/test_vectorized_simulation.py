@@ -0,0 +1,57 @@
+import unittest
+import torch
+from Engine.stochastic_process import LogNormalProcess, NormalProcess, IntensityProcess
+from Engine.simulator import simulate_process
+from Methods.monte_carlo import MonteCarloMethod
+
+class TestVectorizedSimulation(unittest.TestCase):
+    def price_and_greeks(self, vectorized):
+        S0 = torch.tensor(100.0, requires_grad=True)
+        r = torch.tensor(0.01, requires_grad=True)
+        sigma = torch.tensor(0.25, requires_grad=True)
+        T = torch.tensor(2.0, requires_grad=True)
+        K = 90.0
+
+        torch.manual_seed(1234)
+        process = LogNormalProcess(r, sigma)
+        mc = MonteCarloMethod(process, S0, T, num_paths=2000, num_steps=50, vectorized=vectorized)
+        paths = mc.simulate()
+
+        payoffs = torch.maximum(paths[:, -1] - K, torch.tensor(0.0))
+        option_price = torch.mean(torch.exp(-r * T) * payoffs)
+        option_price.backward()
+        return paths.detach(), option_price.item(), [S0.grad.item(), r.grad.item(), sigma.grad.item(), T.grad.item()]
+
+    def test_lognormal_matches_time_loop(self):
+        paths_loop, price_loop, greeks_loop = self.price_and_greeks(vectorized=False)
+        paths_vec, price_vec, greeks_vec = self.price_and_greeks(vectorized=True)
+
+        self.assertEqual(paths_vec.shape, (2000, 50))
+        self.assertTrue(torch.allclose(paths_vec, paths_loop, rtol=1e-4))
+        self.assertAlmostEqual(price_vec, price_loop, places=3)
+        for greek_vec, greek_loop in zip(greeks_vec, greeks_loop):
+            self.assertAlmostEqual(greek_vec, greek_loop, delta=1e-3 * max(1.0, abs(greek_loop)))
+
+    def test_normal_process_paths(self):
+        process = NormalProcess(mu=0.1, sigma=0.3)
+        dW = torch.randn(10, 4)
+        paths = process.simulate_paths(1.0, 0.01, dW)
+
+        expected = torch.zeros(10, 5)
+        expected[:, 0] = 1.0
+        for t in range(1, 5):
+            expected[:, t] = process.evolve(expected[:, t - 1], 0.01, dW[:, t - 1])
+        self.assertTrue(torch.allclose(paths, expected, atol=1e-6))
+
+    def test_simulate_process_lognormal(self):
+        process = LogNormalProcess(mu=0.05, sigma=0.2)
+        paths = simulate_process(process, 1.0, 1.0, 12, 100)
+        self.assertEqual(paths.shape, (100, 12))
+        self.assertTrue(torch.all(paths[:, 0] == 1.0))
+
+    def test_intensity_process_is_not_vectorized(self):
+        process = IntensityProcess(mu=1.0, sigma=0.0, k=0.5, nu=0.25)
+        self.assertFalse(process.supports_vectorized_simulation)
+
+if __name__ == '__main__':
+    unittest.main()